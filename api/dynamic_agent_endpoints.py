@@ -183,7 +183,7 @@ async def execute_by_keywords(
 @router.get("/agents", response_model=List[str])
 async def get_agent_names(loader = Depends(get_loader)):
     """Get list of all loaded agent names"""
-    return loader.get_agent_names()
+    return list(loader.get_agent_names())
 
 @router.get("/agents/{agent_name}", response_model=AgentInfoResponse)
 async def get_agent_info(
@@ -217,7 +217,7 @@ async def add_agent(
 ):
     """Add new agent dynamically"""
     try:
-        config_dict = agent_config.dict()
+        config_dict = agent_config.model_dump()
         success = loader.add_agent_dynamically(config_dict)
         
         if success:
@@ -299,7 +299,7 @@ async def get_execution_log(
 ):
     """Get execution log"""
     try:
-        log = loader.get_execution_log()
+        log = loader.get_execution_log(snapshot=True)
         return {
             "total_entries": len(log),
             "entries": log[-limit:] if limit > 0 else log
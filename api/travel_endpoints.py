@@ -3,18 +3,33 @@ Travel Assistant API Endpoints
 Implements /travel/chat, /travel/batch, and /travel/profile endpoints
 """
 
-from fastapi import APIRouter, HTTPException, Depends, Body
+from fastapi import APIRouter, HTTPException, Depends, Body, status
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, Any, List, Optional
+import asyncio
+import json
 import logging
 import time
 from datetime import datetime
 
 from core.travel_memory_manager import travel_memory_manager
+from core.travel_orchestrator import get_travel_orchestrator
+from agents.trip_summary_synth import TripSummarySynthAgent
 from auth.auth_endpoints import get_current_user
 
 logger = logging.getLogger(__name__)
 
+# How long a request waits for another worker to rebuild a profile before reading it itself
+PROFILE_REBUILD_WAIT = 0.5
+PROFILE_REBUILD_POLL = 0.05
+
+# Shared by the profile endpoints, which only use its UTP read/write helpers
+_synth_agent = TripSummarySynthAgent(travel_memory_manager)
+
+# Running batch jobs; holding the task references keeps them from being garbage collected
+_batch_tasks = set()
+
 # Request/Response models
 class ChatRequest(BaseModel):
     user_id: int
@@ -32,6 +47,10 @@ class TravelResponse(BaseModel):
     session_id: str
     mode: str
 
+class BatchJobResponse(BaseModel):
+    job_id: str
+    status: str
+
 class UserTravelProfile(BaseModel):
     user_id: int
     destinations_of_interest: List[str]
@@ -66,19 +85,18 @@ async def travel_chat(
         
         logger.info(f"Processing chat request for user {user_id}: {text[:50]}...")
         
-        # Get session context (last 7 days + UTP)
-        session_context = travel_memory_manager.get_session_context(user_id, turn_limit=10)
-        utp = travel_memory_manager.get_user_travel_profile(user_id)
-        weekly_digest = travel_memory_manager.get_weekly_digest(user_id)
+        # Get session context (last 7 days + UTP); the three reads are independent
+        session_context, utp, weekly_digest = await asyncio.gather(
+            asyncio.to_thread(travel_memory_manager.get_session_context, user_id, 10),
+            asyncio.to_thread(travel_memory_manager.get_user_travel_profile, user_id),
+            asyncio.to_thread(travel_memory_manager.get_weekly_digest, user_id)
+        )
         
         # Add user turn to session
         travel_memory_manager.add_turn(user_id, "user", text)
         
-        # Import and use the travel orchestrator
-        from core.travel_orchestrator import travel_orchestrator
-        
         # Process through travel orchestrator
-        result = travel_orchestrator.process_chat_request(
+        result = await get_travel_orchestrator().aprocess_chat_request(
             user_id=user_id,
             text=text,
             session_context=session_context,
@@ -116,48 +134,150 @@ async def travel_chat(
         logger.error(f"Chat processing error: {e}")
         raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
 
-@router.post("/batch", response_model=TravelResponse)
+@router.post("/chat/stream")
+async def travel_chat_stream(
+    request: ChatRequest,
+    current_user: Dict = Depends(get_current_user) if get_current_user else None
+):
+    """
+    Chat Mode over Server-Sent Events
+    
+    Sends each agent's guidance as soon as it is ready instead of waiting for the
+    slowest agent. Events are {"type": "chunk", "text": ...} followed by one
+    {"type": "done", ...} carrying the session id and processing time.
+    """
+    start_time = time.time()
+    user_id = request.user_id
+    text = request.text
+    
+    logger.info(f"Streaming chat request for user {user_id}: {text[:50]}...")
+    
+    try:
+        session_context, utp, weekly_digest = await asyncio.gather(
+            asyncio.to_thread(travel_memory_manager.get_session_context, user_id, 10),
+            asyncio.to_thread(travel_memory_manager.get_user_travel_profile, user_id),
+            asyncio.to_thread(travel_memory_manager.get_weekly_digest, user_id)
+        )
+        travel_memory_manager.add_turn(user_id, "user", text)
+    except Exception as e:
+        logger.error(f"Chat processing error: {e}")
+        raise HTTPException(status_code=500, detail=f"Chat processing failed: {str(e)}")
+    
+    async def events():
+        chunks = []
+        async for chunk in get_travel_orchestrator().astream_chat_request(
+            user_id=user_id,
+            text=text,
+            session_context=session_context,
+            user_travel_profile=utp,
+            weekly_digest=weekly_digest
+        ):
+            chunks.append(chunk)
+            yield f"data: {json.dumps({'type': 'chunk', 'text': chunk})}\n\n"
+        
+        processing_time = time.time() - start_time
+        
+        # The assistant turn is written once, with the full streamed text
+        await asyncio.to_thread(
+            travel_memory_manager.add_turn,
+            user_id,
+            "assistant",
+            "".join(chunks),
+            {"processing_time": processing_time, "streamed": True}
+        )
+        
+        done = {
+            "type": "done",
+            "user_id": user_id,
+            "session_id": session_context.get("session_id", ""),
+            "processing_time": processing_time,
+            "mode": "chat"
+        }
+        yield f"data: {json.dumps(done)}\n\n"
+    
+    return StreamingResponse(events(), media_type="text/event-stream")
+
+@router.post("/batch", response_model=BatchJobResponse, status_code=status.HTTP_202_ACCEPTED)
 async def travel_batch(
     request: BatchRequest,
     current_user: Dict = Depends(get_current_user) if get_current_user else None
 ):
     """
     Recording Mode: Analyze whole trip-planning conversation
-    SLA: < 60s end-to-end
+    
+    Queues the analysis and returns a job id at once; poll GET /travel/batch/{job_id}
+    for the result. SLA: < 60s end-to-end
+    """
+    # The job belongs to the authenticated caller, not the user_id in the request body
+    owner_id = current_user["id"] if current_user else request.user_id
+    
+    try:
+        job_id = await asyncio.to_thread(travel_memory_manager.create_batch_job, owner_id)
+    except Exception as e:
+        logger.error(f"Error queuing batch job: {e}")
+        raise HTTPException(status_code=500, detail=f"Batch processing failed: {str(e)}")
+    
+    task = asyncio.create_task(_run_batch_job(job_id, request.user_id, request.transcript))
+    _batch_tasks.add(task)
+    task.add_done_callback(_batch_tasks.discard)
+    
+    logger.info(f"Queued batch job {job_id} for user {request.user_id}: {len(request.transcript)} characters")
+    return BatchJobResponse(job_id=job_id, status="queued")
+
+@router.get("/batch/{job_id}")
+async def get_batch_job(
+    job_id: str,
+    current_user: Dict = Depends(get_current_user) if get_current_user else None
+):
+    """Get the status of a batch job, with its result once done"""
+    job = await asyncio.to_thread(travel_memory_manager.get_batch_job, job_id)
+    # Another user's job is reported as missing rather than forbidden, so job ids can't be probed
+    if job is None or (current_user and job.get("user_id") != str(current_user["id"])):
+        raise HTTPException(status_code=404, detail="Batch job not found or expired")
+    
+    return {"job_id": job_id, **job}
+
+async def _run_batch_job(job_id: str, user_id: int, transcript: str):
+    """
+    Run a queued batch analysis and record its outcome in the job table
+    
+    Args:
+        job_id: Job id returned to the client
+        user_id: User who submitted the transcript
+        transcript: Conversation transcript to analyze
     """
     start_time = time.time()
     
     try:
-        user_id = request.user_id
-        transcript = request.transcript
-        
-        logger.info(f"Processing batch request for user {user_id}: {len(transcript)} characters")
-        
-        # Start new recording session
-        session_id = travel_memory_manager.start_new_session(
-            user_id, 
-            mode="recording",
-            title=f"Trip Recording - {datetime.now().strftime('%Y-%m-%d %H:%M')}"
+        logger.info(f"Processing batch job {job_id} for user {user_id}")
+        await asyncio.to_thread(travel_memory_manager.update_batch_job, job_id, "running")
+        
+        # Start new recording session while reading the current UTP for context
+        session_id, current_utp = await asyncio.gather(
+            asyncio.to_thread(
+                travel_memory_manager.start_new_session,
+                user_id,
+                mode="recording",
+                title=f"Trip Recording - {time.strftime('%Y-%m-%d %H:%M', time.localtime())}"
+            ),
+            asyncio.to_thread(travel_memory_manager.get_user_travel_profile, user_id)
         )
         
         # Add transcript as single user turn
-        travel_memory_manager.add_turn(user_id, "user", transcript, metadata={"type": "transcript"})
-        
-        # Get current UTP for context
-        current_utp = travel_memory_manager.get_user_travel_profile(user_id)
-        
-        # Import and use the travel orchestrator
-        from core.travel_orchestrator import travel_orchestrator
+        await asyncio.to_thread(
+            travel_memory_manager.add_turn, user_id, "user", transcript, metadata={"type": "transcript"}
+        )
         
         # Process through travel orchestrator (batch mode)
-        result = travel_orchestrator.process_batch_request(
+        result = await get_travel_orchestrator().aprocess_batch_request(
             user_id=user_id,
             transcript=transcript,
             current_utp=current_utp
         )
         
         # Add synthesized response as assistant turn
-        travel_memory_manager.add_turn(
+        await asyncio.to_thread(
+            travel_memory_manager.add_turn,
             user_id,
             "assistant", 
             result["response"],
@@ -169,7 +289,10 @@ async def travel_batch(
         )
         
         # End the recording session
-        travel_memory_manager.end_session(user_id, session_id)
+        await asyncio.to_thread(travel_memory_manager.end_session, user_id, session_id)
+        
+        if result.get("utp_updated"):
+            await asyncio.to_thread(travel_memory_manager.invalidate_profile_response, user_id)
         
         processing_time = time.time() - start_time
         
@@ -177,7 +300,7 @@ async def travel_batch(
         if processing_time > 60.0:
             logger.warning(f"Batch SLA exceeded: {processing_time:.2f}s > 60s")
         
-        return TravelResponse(
+        response = TravelResponse(
             user_id=user_id,
             response=result["response"],
             agents_involved=result["agents_involved"],
@@ -185,10 +308,13 @@ async def travel_batch(
             session_id=session_id,
             mode="recording"
         )
+        await asyncio.to_thread(travel_memory_manager.update_batch_job, job_id, "done", result=response.model_dump())
         
     except Exception as e:
         logger.error(f"Batch processing error: {e}")
-        raise HTTPException(status_code=500, detail=f"Batch processing failed: {str(e)}")
+        await asyncio.to_thread(
+            travel_memory_manager.update_batch_job, job_id, "failed", error=f"Batch processing failed: {str(e)}"
+        )
 
 @router.get("/profile/{user_id}", response_model=UserTravelProfile)
 async def get_travel_profile(
@@ -197,14 +323,9 @@ async def get_travel_profile(
 ):
     """Get current User Travel Profile"""
     try:
-        # Get UTP from cache or LTM
-        utp = travel_memory_manager.get_user_travel_profile(user_id)
-        
-        if not utp:
-            # Get from LTM if not cached
-            from agents.trip_summary_synth import TripSummarySynthAgent
-            synth_agent = TripSummarySynthAgent(travel_memory_manager)
-            utp = synth_agent._get_user_travel_profile(user_id)
+        utp = await asyncio.to_thread(travel_memory_manager.get_cached_profile_response, user_id)
+        if utp is None:
+            utp = await _load_travel_profile(user_id)
         
         return UserTravelProfile(
             user_id=user_id,
@@ -217,7 +338,7 @@ async def get_travel_profile(
             group_preferences=utp.get("group_preferences", {}),
             activity_preferences=utp.get("activity_preferences", []),
             accommodation_preferences=utp.get("accommodation_preferences", []),
-            last_updated=utp.get("last_updated", datetime.now().isoformat()),
+            last_updated=utp["last_updated"] if "last_updated" in utp else datetime.now().isoformat(),
             profile_version=utp.get("profile_version", "1.0")
         )
         
@@ -225,6 +346,42 @@ async def get_travel_profile(
         logger.error(f"Error getting travel profile: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to get travel profile: {str(e)}")
 
+async def _load_travel_profile(user_id: int) -> Dict[str, Any]:
+    """
+    Resolve a UTP from STM or LTM and fill the profile response cache
+    
+    Only the caller holding the rebuild lock reads LTM; concurrent callers
+    wait briefly for it to populate the cache before reading themselves.
+    
+    Args:
+        user_id: User whose profile to load
+        
+    Returns:
+        The resolved User Travel Profile
+    """
+    locked = await asyncio.to_thread(travel_memory_manager.acquire_profile_lock, user_id)
+    if not locked:
+        deadline = time.monotonic() + PROFILE_REBUILD_WAIT
+        while time.monotonic() < deadline:
+            await asyncio.sleep(PROFILE_REBUILD_POLL)
+            utp = await asyncio.to_thread(travel_memory_manager.get_cached_profile_response, user_id)
+            if utp is not None:
+                return utp
+    
+    try:
+        # Get UTP from cache or LTM
+        utp = await asyncio.to_thread(travel_memory_manager.get_user_travel_profile, user_id)
+        
+        if not utp:
+            # Get from LTM if not cached
+            utp = await asyncio.to_thread(_synth_agent._get_user_travel_profile, user_id)
+        
+        await asyncio.to_thread(travel_memory_manager.cache_profile_response, user_id, utp, True)
+        return utp
+    finally:
+        if locked:
+            await asyncio.to_thread(travel_memory_manager.release_profile_lock, user_id)
+
 @router.put("/profile/{user_id}")
 async def update_travel_profile(
     user_id: int,
@@ -234,25 +391,23 @@ async def update_travel_profile(
     """Update User Travel Profile"""
     try:
         # Get current profile
-        current_utp = travel_memory_manager.get_user_travel_profile(user_id)
-        
-        if not current_utp:
-            from agents.trip_summary_synth import TripSummarySynthAgent
-            synth_agent = TripSummarySynthAgent(travel_memory_manager)
-            current_utp = synth_agent._get_default_travel_profile()
+        current_utp = (
+            await asyncio.to_thread(travel_memory_manager.get_user_travel_profile, user_id)
+            or _synth_agent._get_default_travel_profile()
+        )
         
         # Update profile with new data
-        updated_utp = current_utp.copy()
-        updated_utp.update(profile_updates)
-        updated_utp["last_updated"] = datetime.now().isoformat()
+        updated_utp = {**current_utp, **profile_updates, "last_updated": datetime.now().isoformat()}
         
-        # Store updated profile
-        travel_memory_manager.cache_user_travel_profile(user_id, updated_utp)
+        # Store updated profile in the STM cache and LTM; the two writes are independent
+        await asyncio.gather(
+            asyncio.to_thread(travel_memory_manager.cache_user_travel_profile, user_id, updated_utp),
+            asyncio.to_thread(_synth_agent._store_user_travel_profile, user_id, updated_utp)
+        )
         
-        # Also store in LTM
-        from agents.trip_summary_synth import TripSummarySynthAgent
-        synth_agent = TripSummarySynthAgent(travel_memory_manager)
-        synth_agent._store_user_travel_profile(user_id, updated_utp)
+        # Refresh the response cache last, so a loader that read the old profile
+        # before the writes landed cannot leave it cached
+        await asyncio.to_thread(travel_memory_manager.cache_profile_response, user_id, updated_utp)
         
         return {"message": "Profile updated successfully", "profile": updated_utp}
         
@@ -268,35 +423,10 @@ async def get_user_sessions(
 ):
     """Get user's recent travel planning sessions"""
     try:
-        # Get recent session IDs from Redis
-        recent_turns = travel_memory_manager.redis_conn.zrevrange(f"stm:recent:{user_id}", 0, limit-1, withscores=True)
-        
-        sessions = []
-        seen_sessions = set()
-        
-        for turn_id, timestamp in recent_turns:
-            # Extract session info from turn
-            turn_data = travel_memory_manager.redis_conn.hgetall(f"stm:turn:{user_id}:{turn_id}")
-            if turn_data:
-                # Find session this turn belongs to
-                session_keys = travel_memory_manager.redis_conn.keys(f"stm:sess:{user_id}:*:turns")
-                for session_key in session_keys:
-                    if travel_memory_manager.redis_conn.lpos(session_key, turn_id) is not None:
-                        session_id = session_key.split(":")[3]
-                        if session_id not in seen_sessions:
-                            session_data = travel_memory_manager.get_session_metadata(user_id, session_id)
-                            if session_data:
-                                sessions.append({
-                                    "session_id": session_id,
-                                    "title": session_data.get("title", "Travel Planning"),
-                                    "mode": session_data.get("mode", "chat"),
-                                    "started_at": session_data.get("started_at"),
-                                    "turn_count": int(session_data.get("turn_count", 0))
-                                })
-                                seen_sessions.add(session_id)
-                        break
-        
-        return {"sessions": sessions[:limit]}
+        # Sessions are indexed by last activity, so this is one ZREVRANGE plus one pipelined read
+        sessions = await asyncio.to_thread(travel_memory_manager.list_sessions, user_id, limit)
+        
+        return {"sessions": sessions}
         
     except Exception as e:
         logger.error(f"Error getting user sessions: {e}")
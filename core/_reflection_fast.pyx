@@ -0,0 +1,39 @@
+# cython: language_level=3
+"""
+Compiled fast path for ReflectionUtils class discovery
+Build in place with `cythonize -i core/_reflection_fast.pyx`; reflection_utils falls back
+to the pure-Python loop when this extension is not built
+"""
+
+from cpython.object cimport PyObject_Dir, PyObject_GetAttr
+from cpython.type cimport PyType_Check
+
+
+cpdef list find_classes_fast(object module, object base_class=None):
+    """Return (name, class) tuples for public classes defined in module"""
+    cdef list classes = []
+    cdef object module_name = module.__name__
+    cdef str name
+    cdef object obj
+
+    for name in PyObject_Dir(module):
+        if name.startswith('_'):
+            continue
+
+        try:
+            obj = PyObject_GetAttr(module, name)
+        except AttributeError:
+            continue
+
+        if not PyType_Check(obj):
+            continue
+
+        if obj.__module__ != module_name:
+            continue
+
+        if base_class is not None and not issubclass(obj, base_class):
+            continue
+
+        classes.append((name, obj))
+
+    return classes
@@ -3,22 +3,65 @@ Dynamic Agent Loader using Reflection and JSON Configuration
 Dynamically loads and executes .py agent files based on JSON configuration
 """
 
+import atexit
 import json
 import importlib
 import importlib.util
-import inspect
 import logging
 import os
 import sys
-from typing import Dict, Any, List, Optional, Type, Callable
+import threading
+import time
+import types
+import weakref
+from collections import defaultdict, deque
+from types import MappingProxyType
+from typing import Dict, Any, List, Optional, Type, Callable, Iterable, Mapping, Union, Tuple
 from pathlib import Path
-from datetime import datetime
+from datetime import datetime, timedelta
 
 from core.base_agent import BaseAgent, GraphState
 from core.memory import MemoryManager
+from core.reflection_utils import ReflectionUtils
 
 logger = logging.getLogger(__name__)
 
+# Number of recent executions retained for tailing; aggregate statistics cover all executions
+MAX_EXECUTION_LOG_ENTRIES = 10000
+
+# Per-thread scratch state reused across execute_agent calls (GraphState is a plain dict)
+_tls = threading.local()
+
+# Key layout of execution records; dict.fromkeys gives a pre-sized record to fill in
+_EXECUTION_RECORD_KEYS = ("agent", "query", "user_id", "success", "processing_time", "timestamp", "response_length")
+
+
+def _new_agent_stats() -> Dict[str, Any]:
+    """Create an empty per-agent execution statistics record"""
+    return {"count": 0, "success": 0, "time": 0.0}
+
+
+# Loaders with journaled changes to flush at exit; weak so the atexit hook doesn't keep them alive
+_live_loaders: "weakref.WeakSet[DynamicAgentLoader]" = weakref.WeakSet()
+
+
+def _flush_live_loaders():
+    """Persist journaled mutations of every loader still alive at interpreter exit"""
+    for loader in list(_live_loaders):
+        loader.flush()
+
+atexit.register(_flush_live_loaders)
+
+
+def _get_scratch_state() -> GraphState:
+    """Get the cleared scratch GraphState for the current thread"""
+    state = getattr(_tls, "state", None)
+    if state is None:
+        state = _tls.state = {}
+    else:
+        state.clear()
+    return state
+
 
 class DynamicAgentLoader:
     """
@@ -35,14 +78,25 @@ class DynamicAgentLoader:
             memory_manager: Shared memory manager instance
         """
         self.config_file = config_file
+        self.journal_file = str(Path(config_file).with_suffix(".jsonl"))
         self.memory_manager = memory_manager
         self.loaded_agents: Dict[str, BaseAgent] = {}
         self.agent_modules: Dict[str, Any] = {}
-        self.execution_log: List[Dict[str, Any]] = []
+        self._fn_cache: Dict[Tuple[str, str], Callable] = {}
+        self.execution_log: deque = deque(maxlen=MAX_EXECUTION_LOG_ENTRIES)
         
-        # Load configuration
+        # Running execution statistics, updated inline as executions are logged
+        self._stats_total = 0
+        self._stats_success = 0
+        self.agent_stats: Dict[str, Dict[str, Any]] = defaultdict(_new_agent_stats)
+        
+        # Load configuration (replaying any journaled mutations)
+        self._dirty = False
         self.config = self._load_config()
         
+        # Persist journaled mutations into the consolidated config on shutdown
+        _live_loaders.add(self)
+        
         # Initialize agents from configuration
         self._initialize_agents()
         
@@ -59,12 +113,52 @@ class DynamicAgentLoader:
             with open(config_path, 'r', encoding='utf-8') as f:
                 config = json.load(f)
             
+            self._replay_journal(config)
+            
+            for agent_config in config.get("agents", []):
+                self._index_agent_config(agent_config)
+            self._flatten_settings(config)
+            
             logger.info(f"Loaded configuration from {self.config_file}")
             return config
             
         except Exception as e:
             logger.error(f"Failed to load configuration: {e}")
-            return self._get_default_config()
+            config = self._get_default_config()
+            for agent_config in config["agents"]:
+                self._index_agent_config(agent_config)
+            self._flatten_settings(config)
+            return config
+    
+    def _flatten_settings(self, config: Dict[str, Any]):
+        """Cache routing and execution settings as attributes for hot-path access"""
+        routing_rules = config.get("routing_rules") or {}
+        execution_settings = config.get("execution_settings") or {}
+        
+        self._default_agent = routing_rules.get("default_agent")
+        self._fallback_agent = routing_rules.get("fallback_agent")
+        self._max_concurrent = execution_settings.get("max_concurrent_agents", 3)
+        self._timeout_s = execution_settings.get("timeout_seconds", 30)
+    
+    @staticmethod
+    def _index_agent_config(agent_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Precompute derived fields (prefixed with '_') for an agent configuration"""
+        if "name" in agent_config:
+            # Interned names make dict lookups and log comparisons pointer-equal
+            agent_config["name"] = sys.intern(agent_config["name"])
+        
+        file_path = agent_config.get("file_path", "")
+        if file_path.endswith(".py"):
+            file_path = file_path[:-3]
+        agent_config["_module_path"] = file_path.replace("\\", ".").replace("/", ".")
+        return agent_config
+    
+    def _get_module_path(self, agent_config: Dict[str, Any]) -> str:
+        """Get the precomputed dotted module path for an agent configuration"""
+        module_path = agent_config.get("_module_path")
+        if module_path is None:
+            module_path = self._index_agent_config(agent_config)["_module_path"]
+        return module_path
     
     def _create_default_config(self):
         """Create default configuration file"""
@@ -204,7 +298,7 @@ class DynamicAgentLoader:
         
         try:
             # Method 1: Try module import first
-            module_path = file_path.replace("/", ".").replace(".py", "")
+            module_path = self._get_module_path(agent_config)
             try:
                 module = importlib.import_module(module_path)
                 logger.debug(f"Imported module {module_path} for agent {agent_name}")
@@ -226,22 +320,22 @@ class DynamicAgentLoader:
             
             # Store module reference
             self.agent_modules[agent_name] = module
+            self._invalidate_function_cache(agent_name)
             
             # Get agent class using reflection
-            if hasattr(module, class_name):
-                agent_class = getattr(module, class_name)
+            agent_class = getattr(module, class_name, None)
+            if agent_class is not None:
+                # Validate that it's a BaseAgent subclass (result cached per class)
+                if not ReflectionUtils.validate_class_inheritance(agent_class, BaseAgent):
+                    logger.error(f"Class {class_name} in {file_path} does not inherit from BaseAgent")
+                    return None
             else:
-                # Try to find any class that inherits from BaseAgent
+                # Try to find any class that inherits from BaseAgent; discovery already validates it
                 agent_class = self._find_agent_class_in_module(module)
                 if not agent_class:
                     logger.error(f"No suitable agent class found in {file_path}")
                     return None
             
-            # Validate that it's a BaseAgent subclass
-            if not (inspect.isclass(agent_class) and issubclass(agent_class, BaseAgent)):
-                logger.error(f"Class {class_name} in {file_path} does not inherit from BaseAgent")
-                return None
-            
             # Create agent instance
             agent_instance = agent_class(memory_manager=self.memory_manager)
             
@@ -249,6 +343,11 @@ class DynamicAgentLoader:
             agent_instance._config = agent_config
             agent_instance._loaded_at = datetime.now()
             
+            # Capture static descriptors once so info lookups don't re-call them
+            agent_instance._cached_description = agent_instance.get_description()
+            agent_instance._cached_capabilities = tuple(agent_instance.get_capabilities())
+            agent_instance._cached_keywords = tuple(getattr(agent_instance, 'keywords', ()))
+            
             return agent_instance
             
         except Exception as e:
@@ -265,14 +364,21 @@ class DynamicAgentLoader:
         Returns:
             Agent class if found, None otherwise
         """
-        for name, obj in inspect.getmembers(module, inspect.isclass):
-            if (issubclass(obj, BaseAgent) and 
-                obj != BaseAgent and 
-                obj.__module__ == module.__name__):
+        module_name = module.__name__
+        for name in dir(module):
+            if name.startswith('_'):
+                continue
+            obj = getattr(module, name, None)
+            # Cheap type and origin checks before the issubclass MRO walk
+            if (isinstance(obj, type) and
+                obj.__module__ == module_name and
+                obj is not BaseAgent and
+                ReflectionUtils.validate_class_inheritance(obj, BaseAgent)):
                 return obj
         return None
     
-    def execute_agent(self, agent_name: str, query: str, user_id: int = 0) -> Dict[str, Any]:
+    def execute_agent(self, agent_name: str, query: str, user_id: int = 0,
+                      include_state: bool = True) -> Dict[str, Any]:
         """
         Execute specific agent with query
         
@@ -280,10 +386,12 @@ class DynamicAgentLoader:
             agent_name: Name of agent to execute
             query: Query to process
             user_id: User identifier
+            include_state: Whether to return the agent's full result state
             
         Returns:
             Execution result
         """
+        agent_name = sys.intern(agent_name)
         if agent_name not in self.loaded_agents:
             return {
                 "success": False,
@@ -294,8 +402,9 @@ class DynamicAgentLoader:
         try:
             agent = self.loaded_agents[agent_name]
             
-            # Create state for agent
-            state = GraphState(
+            # Reuse this thread's scratch state for the agent
+            state = _get_scratch_state()
+            state.update(
                 user=f"user_{user_id}",
                 user_id=user_id,
                 question=query,
@@ -305,31 +414,42 @@ class DynamicAgentLoader:
             
             # Execute agent
             start_time = datetime.now()
+            start = time.perf_counter()
             result_state = agent.process(state)
-            end_time = datetime.now()
+            processing_time = time.perf_counter() - start
+            response = result_state.get("response", "")
             
-            processing_time = (end_time - start_time).total_seconds()
+            # Agents normally return a copy; never hand the scratch dict to callers
+            if result_state is state:
+                result_state = dict(state)
             
             # Log execution
-            execution_record = {
-                "agent": agent_name,
-                "query": query,
-                "user_id": user_id,
-                "success": not result_state.get("error", False),
-                "processing_time": processing_time,
-                "timestamp": start_time.isoformat(),
-                "response_length": len(result_state.get("response", ""))
-            }
+            execution_record = dict.fromkeys(_EXECUTION_RECORD_KEYS)
+            execution_record["agent"] = agent_name
+            execution_record["query"] = query
+            execution_record["user_id"] = user_id
+            execution_record["success"] = not result_state.get("error", False)
+            execution_record["processing_time"] = processing_time
+            execution_record["timestamp"] = start_time.isoformat()
+            execution_record["response_length"] = len(response)
             self.execution_log.append(execution_record)
+            self._stats_total += 1
+            self._stats_success += execution_record["success"]
+            agent_stats = self.agent_stats[agent_name]
+            agent_stats["count"] += 1
+            agent_stats["success"] += execution_record["success"]
+            agent_stats["time"] += processing_time
             
-            return {
+            result = {
                 "success": True,
                 "agent": agent_name,
-                "response": result_state.get("response", ""),
+                "response": response,
                 "processing_time": processing_time,
-                "state": result_state,
                 "execution_record": execution_record
             }
+            if include_state:
+                result["state"] = result_state
+            return result
             
         except Exception as e:
             logger.error(f"Error executing agent {agent_name}: {e}")
@@ -339,7 +459,8 @@ class DynamicAgentLoader:
                 "agent": agent_name
             }
     
-    def execute_multiple_agents(self, agent_names: List[str], query: str, user_id: int = 0) -> Dict[str, Any]:
+    def execute_multiple_agents(self, agent_names: List[str], query: str, user_id: int = 0,
+                                return_individual: bool = True) -> Dict[str, Any]:
         """
         Execute multiple agents with the same query
         
@@ -347,6 +468,8 @@ class DynamicAgentLoader:
             agent_names: List of agent names to execute
             query: Query to process
             user_id: User identifier
+            return_individual: Whether to collect per-agent results; when False only
+                aggregate counters are returned and agent states are not copied up
             
         Returns:
             Combined execution results
@@ -356,8 +479,9 @@ class DynamicAgentLoader:
         total_processing_time = 0
         
         for agent_name in agent_names:
-            result = self.execute_agent(agent_name, query, user_id)
-            results.append(result)
+            result = self.execute_agent(agent_name, query, user_id, include_state=return_individual)
+            if return_individual:
+                results.append(result)
             
             if result["success"]:
                 successful_executions += 1
@@ -431,7 +555,7 @@ class DynamicAgentLoader:
         # Select top scoring agents
         if not agent_scores:
             # Fallback to default agent
-            default_agent = self.config.get("routing_rules", {}).get("default_agent")
+            default_agent = self._default_agent
             if default_agent and default_agent in self.loaded_agents:
                 agent_scores[default_agent] = 1
         
@@ -499,6 +623,7 @@ class DynamicAgentLoader:
                 del self.loaded_agents[agent_name]
             if agent_name in self.agent_modules:
                 del self.agent_modules[agent_name]
+            self._invalidate_function_cache(agent_name)
             
             # Reload agent
             agent_instance = self._load_agent_from_config(agent_config)
@@ -529,6 +654,7 @@ class DynamicAgentLoader:
         # Clear existing agents
         self.loaded_agents.clear()
         self.agent_modules.clear()
+        self._invalidate_function_cache()
         
         # Reload all agents
         reload_results = {}
@@ -565,7 +691,7 @@ class DynamicAgentLoader:
         Returns:
             True if successful, False otherwise
         """
-        agent_name = agent_config["name"]
+        agent_name = self._index_agent_config(agent_config)["name"]
         
         try:
             # Load agent from configuration
@@ -581,8 +707,8 @@ class DynamicAgentLoader:
             current_agents.append(agent_config)
             self.config["agents"] = current_agents
             
-            # Save updated configuration
-            self._save_config()
+            # Journal the mutation; the consolidated config is written on flush()
+            self._journal({"op": "add", "agent": self._public_agent_config(agent_config)})
             
             logger.info(f"Successfully added agent dynamically: {agent_name}")
             return True
@@ -608,14 +734,15 @@ class DynamicAgentLoader:
             
             if agent_name in self.agent_modules:
                 del self.agent_modules[agent_name]
+            self._invalidate_function_cache(agent_name)
             
             # Update configuration
             current_agents = self.config.get("agents", [])
             updated_agents = [a for a in current_agents if a["name"] != agent_name]
             self.config["agents"] = updated_agents
             
-            # Save updated configuration
-            self._save_config()
+            # Journal the mutation; the consolidated config is written on flush()
+            self._journal({"op": "remove", "name": agent_name})
             
             logger.info(f"Successfully removed agent: {agent_name}")
             return True
@@ -628,13 +755,17 @@ class DynamicAgentLoader:
         """Get loaded agent instance"""
         return self.loaded_agents.get(agent_name)
     
-    def get_all_agents(self) -> Dict[str, BaseAgent]:
-        """Get all loaded agent instances"""
+    def get_all_agents(self) -> Mapping[str, BaseAgent]:
+        """Get a read-only live view of all loaded agent instances"""
+        return MappingProxyType(self.loaded_agents)
+    
+    def get_all_agents_copy(self) -> Dict[str, BaseAgent]:
+        """Get a mutable copy of all loaded agent instances"""
         return self.loaded_agents.copy()
     
-    def get_agent_names(self) -> List[str]:
-        """Get list of all loaded agent names"""
-        return list(self.loaded_agents.keys())
+    def get_agent_names(self) -> Iterable[str]:
+        """Get a live view of all loaded agent names"""
+        return self.loaded_agents.keys()
     
     def get_agents_by_capability(self, capability: str) -> List[str]:
         """Get agents that have specific capability"""
@@ -646,31 +777,67 @@ class DynamicAgentLoader:
         
         return matching_agents
     
-    def get_execution_log(self) -> List[Dict[str, Any]]:
-        """Get execution log"""
-        return self.execution_log.copy()
+    def get_execution_log(self, snapshot: bool = False) -> Union[deque, Tuple[Dict[str, Any], ...]]:
+        """
+        Get execution log
+        
+        Args:
+            snapshot: Return an immutable point-in-time copy instead of the live log
+            
+        Returns:
+            The live execution log for iteration, or a tuple snapshot
+        """
+        if snapshot:
+            return tuple(self.execution_log)
+        return self.execution_log
     
     def clear_execution_log(self):
         """Clear execution log"""
         self.execution_log.clear()
+        self._stats_total = 0
+        self._stats_success = 0
+        self.agent_stats.clear()
         logger.info("Execution log cleared")
     
-    def get_agent_statistics(self) -> Dict[str, Any]:
-        """Get statistics about loaded agents and executions"""
-        total_executions = len(self.execution_log)
-        successful_executions = sum(1 for log in self.execution_log if log["success"])
+    def prune_execution_log(self, max_age_seconds: float) -> int:
+        """
+        Drop execution log entries older than max_age_seconds
+        
+        Aggregate statistics are unaffected; they keep counting all executions.
         
-        agent_execution_counts = {}
+        Returns:
+            Number of entries removed
+        """
+        cutoff = (datetime.now() - timedelta(seconds=max_age_seconds)).isoformat()
+        removed = 0
+        # Entries are appended in time order and ISO timestamps sort lexically
+        while self.execution_log and self.execution_log[0]["timestamp"] < cutoff:
+            self.execution_log.popleft()
+            removed += 1
+        return removed
+    
+    def recompute_statistics(self):
+        """Rebuild the running execution statistics from the retained execution log in one pass"""
+        self._stats_total = len(self.execution_log)
+        self._stats_success = sum(log["success"] for log in self.execution_log)
+        self.agent_stats.clear()
         for log in self.execution_log:
-            agent = log["agent"]
-            agent_execution_counts[agent] = agent_execution_counts.get(agent, 0) + 1
+            agent_stats = self.agent_stats[log["agent"]]
+            agent_stats["count"] += 1
+            agent_stats["success"] += log["success"]
+            agent_stats["time"] += log["processing_time"]
+    
+    def get_agent_statistics(self) -> Dict[str, Any]:
+        """Get statistics about loaded agents and executions"""
+        total_executions = self._stats_total
+        successful_executions = self._stats_success
         
         return {
             "total_agents_loaded": len(self.loaded_agents),
             "total_executions": total_executions,
             "successful_executions": successful_executions,
             "success_rate": successful_executions / total_executions if total_executions > 0 else 0,
-            "agent_execution_counts": agent_execution_counts,
+            "agent_execution_counts": {name: stats["count"] for name, stats in self.agent_stats.items()},
             "loaded_agents": list(self.loaded_agents.keys()),
             "config_file": self.config_file
         }
@@ -689,14 +856,94 @@ class DynamicAgentLoader:
                 return agent_config
         return None
     
-    def _save_config(self):
+    @staticmethod
+    def _public_agent_config(agent_config: Dict[str, Any]) -> Dict[str, Any]:
+        """Strip derived (underscore-prefixed) fields from an agent configuration"""
+        return {key: value for key, value in agent_config.items() if not key.startswith("_")}
+    
+    def _save_config(self) -> bool:
         """Save current configuration to file"""
         try:
+            config = dict(self.config)
+            config["agents"] = [self._public_agent_config(a) for a in self.config.get("agents", [])]
             with open(self.config_file, 'w', encoding='utf-8') as f:
-                json.dump(self.config, f, indent=2)
+                json.dump(config, f, indent=2)
             logger.info(f"Configuration saved to {self.config_file}")
+            return True
         except Exception as e:
             logger.error(f"Failed to save configuration: {e}")
+            return False
+    
+    def _journal(self, entry: Dict[str, Any]):
+        """Append a single config mutation to the journal file"""
+        self._dirty = True
+        try:
+            with open(self.journal_file, 'a', encoding='utf-8') as f:
+                f.write(json.dumps(entry) + "\n")
+        except Exception as e:
+            logger.error(f"Failed to journal configuration change: {e}")
+    
+    def _replay_journal(self, config: Dict[str, Any]):
+        """Apply journaled add/remove mutations on top of a freshly loaded config"""
+        journal_path = Path(self.journal_file)
+        if not journal_path.exists():
+            return
+        
+        replayed = 0
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    logger.warning(f"Skipping malformed journal entry in {self.journal_file}")
+                    continue
+                
+                if not isinstance(entry, dict):
+                    logger.warning(f"Skipping malformed journal entry in {self.journal_file}")
+                    continue
+                
+                agents = config.setdefault("agents", [])
+                if entry.get("op") == "add":
+                    agent = entry.get("agent")
+                    if not isinstance(agent, dict) or "name" not in agent:
+                        logger.warning(f"Skipping journal add without an agent in {self.journal_file}")
+                        continue
+                    # Replace rather than append: the journal may outlive a flush that already saved it
+                    config["agents"] = [a for a in agents if a.get("name") != agent["name"]] + [agent]
+                elif entry.get("op") == "remove":
+                    config["agents"] = [a for a in agents if a.get("name") != entry.get("name")]
+                else:
+                    logger.warning(f"Skipping journal entry with unknown op {entry.get('op')!r}")
+                    continue
+                replayed += 1
+        
+        if replayed:
+            self._dirty = True
+            logger.info(f"Replayed {replayed} journaled configuration changes")
+    
+    def flush(self) -> bool:
+        """
+        Write pending configuration changes to the config file and truncate the journal
+        
+        Returns:
+            True if nothing was pending or the write succeeded, False otherwise
+        """
+        if not self._dirty:
+            return True
+        
+        if not self._save_config():
+            return False
+        
+        try:
+            Path(self.journal_file).unlink(missing_ok=True)
+        except Exception as e:
+            logger.error(f"Failed to truncate configuration journal: {e}")
+        
+        self._dirty = False
+        return True
     
     def validate_configuration(self) -> Dict[str, Any]:
         """
@@ -730,8 +977,11 @@ class DynamicAgentLoader:
                 
                 # Check class exists and inheritance
                 try:
+                    module_path = self._get_module_path(agent_config)
                     if agent_name in self.agent_modules:
                         module = self.agent_modules[agent_name]
+                    elif module_path in sys.modules:
+                        module = sys.modules[module_path]
                     else:
                         # Load module temporarily for validation
                         spec = importlib.util.spec_from_file_location(agent_name, file_path)
@@ -743,12 +993,18 @@ class DynamicAgentLoader:
                     
                     if module:
                         class_name = agent_config["class_name"]
-                        if hasattr(module, class_name):
+                        agent_class = getattr(module, class_name, None)
+                        if agent_class is not None:
                             agent_validation["class_exists"] = True
                             
-                            agent_class = getattr(module, class_name)
-                            if inspect.isclass(agent_class) and issubclass(agent_class, BaseAgent):
+                            # Reuses the inheritance result computed when the agent was loaded
+                            loaded_agent = self.loaded_agents.get(agent_name)
+                            if loaded_agent is not None and type(loaded_agent) is agent_class:
                                 agent_validation["inherits_base_agent"] = True
+                            else:
+                                agent_validation["inherits_base_agent"] = ReflectionUtils.validate_class_inheritance(
+                                    agent_class, BaseAgent
+                                )
                         
                         # Check entry point
                         entry_point = agent_config.get("entry_point", "main")
@@ -780,6 +1036,7 @@ class DynamicAgentLoader:
         Returns:
             Agent information dictionary
         """
+        agent_name = sys.intern(agent_name)
         if agent_name not in self.loaded_agents:
             return None
         
@@ -787,19 +1044,20 @@ class DynamicAgentLoader:
         agent_config = self._get_agent_config(agent_name)
         
         # Get execution statistics for this agent
-        agent_executions = [log for log in self.execution_log if log["agent"] == agent_name]
+        stats = self.agent_stats.get(agent_name)
+        execution_count = stats["count"] if stats else 0
         
         return {
             "name": agent_name,
             "class_name": agent.__class__.__name__,
-            "description": agent.get_description(),
-            "capabilities": agent.get_capabilities(),
-            "keywords": getattr(agent, 'keywords', []),
+            "description": agent._cached_description,
+            "capabilities": agent._cached_capabilities,
+            "keywords": agent._cached_keywords,
             "file_path": agent_config.get("file_path") if agent_config else None,
             "loaded_at": getattr(agent, '_loaded_at', None),
-            "execution_count": len(agent_executions),
-            "success_rate": sum(1 for ex in agent_executions if ex["success"]) / len(agent_executions) if agent_executions else 0,
-            "avg_processing_time": sum(ex["processing_time"] for ex in agent_executions) / len(agent_executions) if agent_executions else 0,
+            "execution_count": execution_count,
+            "success_rate": stats["success"] / execution_count if execution_count else 0,
+            "avg_processing_time": stats["time"] / execution_count if execution_count else 0,
             "enabled": agent_config.get("enabled", True) if agent_config else True,
             "priority": agent_config.get("priority", 99) if agent_config else 99
         }
@@ -820,8 +1078,10 @@ class DynamicAgentLoader:
         module = self.agent_modules[agent_name]
         functions = []
         
-        for name, obj in inspect.getmembers(module):
-            if inspect.isfunction(obj) and not name.startswith('_'):
+        for name in dir(module):
+            if name.startswith('_'):
+                continue
+            if isinstance(getattr(module, name, None), types.FunctionType):
                 functions.append(name)
         
         return functions
@@ -839,28 +1099,40 @@ class DynamicAgentLoader:
         Returns:
             Function execution result
         """
-        if agent_name not in self.agent_modules:
-            logger.error(f"Agent module {agent_name} not loaded")
-            return None
+        key = (agent_name, function_name)
+        function = self._fn_cache.get(key)
         
-        module = self.agent_modules[agent_name]
+        if function is None:
+            module = self.agent_modules.get(agent_name)
+            if module is None:
+                logger.error(f"Agent module {agent_name} not loaded")
+                return None
+            
+            function = getattr(module, function_name, None)
+            if function is None:
+                logger.error(f"Function {function_name} not found in {agent_name}")
+                return None
+            if not callable(function):
+                logger.error(f"{function_name} in {agent_name} is not callable")
+                return None
+            
+            self._fn_cache[key] = function
         
         try:
-            if hasattr(module, function_name):
-                function = getattr(module, function_name)
-                if callable(function):
-                    logger.info(f"Executing {function_name}() in {agent_name}")
-                    return function(*args, **kwargs)
-                else:
-                    logger.error(f"{function_name} in {agent_name} is not callable")
-            else:
-                logger.error(f"Function {function_name} not found in {agent_name}")
-                
+            logger.info(f"Executing {function_name}() in {agent_name}")
+            return function(*args, **kwargs)
         except Exception as e:
             logger.error(f"Error executing {function_name} in {agent_name}: {e}")
         
         return None
-
+    
+    def _invalidate_function_cache(self, agent_name: str = None):
+        """Drop resolved module functions for one agent, or for all agents"""
+        if agent_name is None:
+            self._fn_cache.clear()
+        else:
+            for key in [key for key in self._fn_cache if key[0] == agent_name]:
+                del self._fn_cache[key]
 
 # Global dynamic agent loader instance
 dynamic_agent_loader = None
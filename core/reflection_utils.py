@@ -3,15 +3,212 @@ Reflection Utilities for Dynamic Agent Management
 Provides helper functions for inspecting and manipulating Python modules at runtime
 """
 
+import fnmatch
+import functools
 import inspect
 import importlib
 import importlib.util
 import logging
-from typing import Dict, Any, List, Optional, Type, Callable, Tuple
+import os
+import re
+import time
+import types
+import weakref
+from typing import Dict, Any, List, Optional, Type, Callable, Tuple, Hashable, Iterator
 from pathlib import Path
+from datetime import datetime
+from dataclasses import dataclass, field, asdict
 
 logger = logging.getLogger(__name__)
 
+@dataclass(slots=True)
+class ClassInfo:
+    """Reflection result for a class"""
+    name: str
+    module: str = ""
+    file: str = ""
+    doc: Optional[str] = None
+    methods: Tuple[Dict[str, Any], ...] = ()
+    properties: Tuple[Dict[str, Any], ...] = ()
+    class_variables: Tuple[Dict[str, Any], ...] = ()
+    inheritance: Tuple[str, ...] = ()
+    is_abstract: bool = False
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary for JSON serialization"""
+        return asdict(self)
+
+
+@dataclass(slots=True)
+class FunctionSignature:
+    """Reflection result for a function signature; signature forms are formatted on first access"""
+    name: str
+    doc: Optional[str] = None
+    details: Optional["_SignatureDetails"] = field(default=None, repr=False)
+    error: Optional[str] = None
+    
+    @property
+    def signature(self) -> str:
+        """Formatted signature, e.g. '(self, a, b=2)'"""
+        return self.details.text if self.details is not None else ""
+    
+    @property
+    def parameters(self) -> List[Dict[str, Any]]:
+        """Per-parameter name/kind/default/annotation records"""
+        return self.details.parameters if self.details is not None else []
+    
+    @property
+    def return_annotation(self) -> Optional[str]:
+        """Formatted return annotation, or None if unannotated"""
+        return self.details.return_annotation if self.details is not None else None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary for JSON serialization"""
+        return {
+            "name": self.name,
+            "doc": self.doc,
+            "signature": self.signature,
+            "parameters": [dict(param) for param in self.parameters],
+            "return_annotation": self.return_annotation,
+            "error": self.error
+        }
+
+
+@dataclass(slots=True)
+class ModuleInfo:
+    """Reflection result for a module"""
+    name: str
+    file: str = "Unknown"
+    doc: Optional[str] = None
+    classes: List[str] = field(default_factory=list)
+    functions: List[str] = field(default_factory=list)
+    variables: List[Dict[str, Any]] = field(default_factory=list)
+    imports: List[str] = field(default_factory=list)
+    error: Optional[str] = None
+    
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert to a plain dictionary for JSON serialization"""
+        return asdict(self)
+
+
+# Optional compiled discovery loop (core/_reflection_fast.pyx)
+try:
+    from core._reflection_fast import find_classes_fast as _find_classes_fast
+except ImportError:
+    _find_classes_fast = None
+
+# Reflection result caches: key -> (weakref to inspected object, result).
+# Entries are dropped when the inspected class/function/module is garbage collected.
+_class_info_cache: Dict[Hashable, Tuple[weakref.ref, Any]] = {}
+_function_info_cache: Dict[Hashable, Tuple[weakref.ref, Any]] = {}
+_signature_cache: Dict[Hashable, Tuple[weakref.ref, Any]] = {}
+_module_info_cache: Dict[Hashable, Tuple[weakref.ref, Any]] = {}
+_module_members_cache: Dict[Hashable, Tuple[weakref.ref, Any]] = {}
+_inheritance_cache: Dict[Hashable, Tuple[weakref.ref, Any]] = {}
+
+# Modules loaded from files: (resolved path, module name) -> (st_mtime_ns, module)
+_loaded_module_cache: Dict[Tuple[str, str], Tuple[int, Any]] = {}
+
+
+def _cache_lookup(cache: Dict[Hashable, Tuple[weakref.ref, Any]], key: Hashable, obj: Any) -> Any:
+    """Return the cached result for obj under key, or None on a miss"""
+    entry = cache.get(key)
+    if entry is not None and entry[0]() is obj:
+        return entry[1]
+    return None
+
+
+def _cache_store(cache: Dict[Hashable, Tuple[weakref.ref, Any]], key: Hashable, obj: Any, value: Any) -> Any:
+    """Cache value for obj under key, evicting it when obj is garbage collected"""
+    def _evict(ref, key=key):
+        entry = cache.get(key)
+        if entry is not None and entry[0] is ref:
+            del cache[key]
+    
+    try:
+        cache[key] = (weakref.ref(obj, _evict), value)
+    except TypeError:
+        # Object does not support weak references; skip caching
+        pass
+    return value
+
+
+class _SignatureDetails:
+    """inspect.Signature wrapper whose string and parameter forms are built on first use"""
+    
+    __slots__ = ("sig", "_text", "_parameters")
+    
+    def __init__(self, sig: inspect.Signature):
+        self.sig = sig
+        self._text = None
+        self._parameters = None
+    
+    @property
+    def text(self) -> str:
+        """Formatted signature, e.g. '(self, a, b=2)'"""
+        if self._text is None:
+            self._text = str(self.sig)
+        return self._text
+    
+    @property
+    def parameters(self) -> List[Dict[str, Any]]:
+        """Per-parameter name/kind/default/annotation information"""
+        if self._parameters is None:
+            self._parameters = [
+                {
+                    "name": param_name,
+                    "kind": str(param.kind),
+                    "default": str(param.default) if param.default != inspect.Parameter.empty else None,
+                    "annotation": str(param.annotation) if param.annotation != inspect.Parameter.empty else None
+                }
+                for param_name, param in self.sig.parameters.items()
+            ]
+        return self._parameters
+    
+    @property
+    def return_annotation(self) -> Optional[str]:
+        """Formatted return annotation, or None if unannotated"""
+        annotation = self.sig.return_annotation
+        return str(annotation) if annotation != inspect.Signature.empty else None
+
+
+def _cached_signature(func: Callable) -> _SignatureDetails:
+    """
+    Get the lazily formatted signature details for a callable
+    
+    Results are cached per function; bound methods are keyed on their underlying
+    function since a new bound-method object is created on every attribute access.
+    """
+    target = func.__func__ if isinstance(func, types.MethodType) else func
+    key = (id(target), isinstance(func, types.MethodType))
+    cached = _cache_lookup(_signature_cache, key, target)
+    if cached is not None:
+        return cached
+    
+    return _cache_store(_signature_cache, key, target, _SignatureDetails(inspect.signature(func)))
+
+
+@functools.lru_cache(maxsize=128)
+def _compile_file_pattern(pattern: str) -> Callable[[str], Any]:
+    """Translate a glob pattern to a compiled regex matcher (case rules follow os.path.normcase)"""
+    return re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+
+
+def _iter_public_members(module: Any) -> Iterator[Tuple[str, Any]]:
+    """Yield (name, value) for public attributes of module without building a member list"""
+    for name in dir(module):
+        if not name.startswith('_'):
+            yield name, getattr(module, name, None)
+
+
+def _module_mtime(module: Any) -> int:
+    """Get modification time of a module's source file (0 if unavailable)"""
+    try:
+        return os.stat(module.__file__).st_mtime_ns
+    except (AttributeError, TypeError, OSError):
+        return 0
+
 
 class ReflectionUtils:
     """Utility class for reflection-based operations"""
@@ -30,13 +227,22 @@ class ReflectionUtils:
         """
         try:
             path = Path(file_path)
-            if not path.exists():
+            try:
+                path = path.resolve()
+                mtime_ns = path.stat().st_mtime_ns
+            except FileNotFoundError:
                 logger.error(f"File not found: {file_path}")
                 return None
             
             if not module_name:
                 module_name = path.stem
             
+            # Unchanged files return the already-executed module
+            cache_key = (str(path), module_name)
+            cached = _loaded_module_cache.get(cache_key)
+            if cached is not None and cached[0] == mtime_ns:
+                return cached[1]
+            
             spec = importlib.util.spec_from_file_location(module_name, path)
             if spec is None or spec.loader is None:
                 logger.error(f"Could not create spec for {file_path}")
@@ -45,6 +251,9 @@ class ReflectionUtils:
             module = importlib.util.module_from_spec(spec)
             spec.loader.exec_module(module)
             
+            # Replaces any entry for an older mtime of the same file
+            _loaded_module_cache[cache_key] = (mtime_ns, module)
+            
             logger.debug(f"Successfully loaded module {module_name} from {file_path}")
             return module
             
@@ -64,26 +273,41 @@ class ReflectionUtils:
         Returns:
             List of (class_name, class_type) tuples
         """
-        classes = []
+        cache_key = ("classes", module.__name__, base_class)
+        cached = _cache_lookup(_module_members_cache, cache_key, module)
+        if cached is not None:
+            return cached
         
         try:
-            for name, obj in inspect.getmembers(module, inspect.isclass):
+            if _find_classes_fast is not None:
+                classes = _find_classes_fast(module, base_class)
+                logger.debug(f"Found {len(classes)} classes in module {module.__name__}")
+                return _cache_store(_module_members_cache, cache_key, module, classes)
+            
+            # Cheapest filters first: name, type, defining module, then the MRO walk
+            classes = []
+            module_name = module.__name__
+            for name in dir(module):
                 # Skip private classes
                 if name.startswith('_'):
                     continue
                 
+                obj = getattr(module, name, None)
+                if not isinstance(obj, type):
+                    continue
+                
                 # Skip classes not defined in this module
-                if obj.__module__ != module.__name__:
+                if obj.__module__ != module_name:
                     continue
                 
                 # Filter by base class if specified
-                if base_class and not issubclass(obj, base_class):
+                if base_class is not None and not issubclass(obj, base_class):
                     continue
                 
                 classes.append((name, obj))
             
             logger.debug(f"Found {len(classes)} classes in module {module.__name__}")
-            return classes
+            return _cache_store(_module_members_cache, cache_key, module, classes)
             
         except Exception as e:
             logger.error(f"Error finding classes in module: {e}")
@@ -101,14 +325,23 @@ class ReflectionUtils:
         Returns:
             List of (function_name, function) tuples
         """
+        cache_key = ("functions", module.__name__, pattern)
+        cached = _cache_lookup(_module_members_cache, cache_key, module)
+        if cached is not None:
+            return cached
+        
         functions = []
         
         try:
-            for name, obj in inspect.getmembers(module, inspect.isfunction):
+            for name in dir(module):
                 # Skip private functions
                 if name.startswith('_'):
                     continue
                 
+                obj = getattr(module, name, None)
+                if not isinstance(obj, types.FunctionType):
+                    continue
+                
                 # Skip functions not defined in this module
                 if obj.__module__ != module.__name__:
                     continue
@@ -120,72 +353,83 @@ class ReflectionUtils:
                 functions.append((name, obj))
             
             logger.debug(f"Found {len(functions)} functions in module {module.__name__}")
-            return functions
+            return _cache_store(_module_members_cache, cache_key, module, functions)
             
         except Exception as e:
             logger.error(f"Error finding functions in module: {e}")
             return []
     
     @staticmethod
-    def get_class_info(cls: Type) -> Dict[str, Any]:
+    def get_class_info(cls: Type) -> ClassInfo:
         """
         Get detailed information about a class using reflection
         
+        Results are cached per class object; treat the returned record as read-only.
+        
         Args:
             cls: Class to inspect
             
         Returns:
-            Dictionary with class information
+            ClassInfo record (use .to_dict() for JSON)
         """
+        cached = _cache_lookup(_class_info_cache, id(cls), cls)
+        if cached is not None:
+            return cached
+        
         try:
-            info = {
-                "name": cls.__name__,
-                "module": cls.__module__,
-                "file": inspect.getfile(cls),
-                "doc": inspect.getdoc(cls),
-                "methods": [],
-                "properties": [],
-                "class_variables": [],
-                "inheritance": [base.__name__ for base in cls.__mro__[1:]],  # Skip self
-                "is_abstract": inspect.isabstract(cls)
-            }
+            methods = []
+            properties = []
+            class_variables = []
             
-            # Get methods
-            for name, method in inspect.getmembers(cls, inspect.ismethod):
-                if not name.startswith('_'):
-                    info["methods"].append({
+            # Classify public members into methods, properties and class variables in one pass
+            for name in dir(cls):
+                if name.startswith('_'):
+                    continue
+                
+                try:
+                    value = getattr(cls, name)
+                except AttributeError:
+                    continue
+                
+                if isinstance(value, property):
+                    properties.append({
                         "name": name,
-                        "doc": inspect.getdoc(method),
-                        "signature": str(inspect.signature(method))
+                        "doc": inspect.getdoc(value)
                     })
-            
-            # Get properties
-            for name, prop in inspect.getmembers(cls, lambda x: isinstance(x, property)):
-                info["properties"].append({
-                    "name": name,
-                    "doc": inspect.getdoc(prop)
-                })
-            
-            # Get class variables
-            for name, value in inspect.getmembers(cls):
-                if (not name.startswith('_') and 
-                    not inspect.ismethod(value) and 
-                    not inspect.isfunction(value) and
-                    not isinstance(value, property)):
-                    info["class_variables"].append({
+                elif isinstance(value, (types.FunctionType, types.MethodType)):
+                    methods.append({
+                        "name": name,
+                        "doc": inspect.getdoc(value),
+                        "signature": _cached_signature(value).text
+                    })
+                else:
+                    class_variables.append({
                         "name": name,
                         "type": type(value).__name__,
                         "value": str(value)[:100]  # Truncate long values
                     })
             
-            return info
+            # Cached entries are shared, so sequences are stored as tuples
+            info = ClassInfo(
+                name=cls.__name__,
+                module=cls.__module__,
+                file=inspect.getfile(cls),
+                doc=inspect.getdoc(cls),
+                methods=tuple(methods),
+                properties=tuple(properties),
+                class_variables=tuple(class_variables),
+                inheritance=tuple(base.__name__ for base in cls.__mro__[1:]),  # Skip self
+                is_abstract=inspect.isabstract(cls)
+            )
+            
+            return _cache_store(_class_info_cache, id(cls), cls, info)
             
         except Exception as e:
             logger.error(f"Error getting class info: {e}")
-            return {"name": cls.__name__, "error": str(e)}
+            return ClassInfo(name=cls.__name__, error=str(e))
     
     @staticmethod
-    def get_function_signature(func: Callable) -> Dict[str, Any]:
+    def get_function_signature(func: Callable) -> FunctionSignature:
         """
         Get function signature information using reflection
         
@@ -193,34 +437,24 @@ class ReflectionUtils:
             func: Function to inspect
             
         Returns:
-            Dictionary with function signature information
+            FunctionSignature record (use .to_dict() for JSON)
         """
+        cached = _cache_lookup(_function_info_cache, id(func), func)
+        if cached is not None:
+            return cached
+        
         try:
-            sig = inspect.signature(func)
-            
-            info = {
-                "name": func.__name__,
-                "doc": inspect.getdoc(func),
-                "signature": str(sig),
-                "parameters": [],
-                "return_annotation": str(sig.return_annotation) if sig.return_annotation != inspect.Signature.empty else None
-            }
+            info = FunctionSignature(
+                name=func.__name__,
+                doc=inspect.getdoc(func),
+                details=_cached_signature(func)
+            )
             
-            # Get parameter information
-            for param_name, param in sig.parameters.items():
-                param_info = {
-                    "name": param_name,
-                    "kind": str(param.kind),
-                    "default": str(param.default) if param.default != inspect.Parameter.empty else None,
-                    "annotation": str(param.annotation) if param.annotation != inspect.Parameter.empty else None
-                }
-                info["parameters"].append(param_info)
-            
-            return info
+            return _cache_store(_function_info_cache, id(func), func, info)
             
         except Exception as e:
             logger.error(f"Error getting function signature: {e}")
-            return {"name": func.__name__, "error": str(e)}
+            return FunctionSignature(name=func.__name__, error=str(e))
     
     @staticmethod
     def validate_class_inheritance(cls: Type, required_base: Type) -> bool:
@@ -234,55 +468,81 @@ class ReflectionUtils:
         Returns:
             True if inheritance is valid, False otherwise
         """
+        if not isinstance(cls, type):
+            return False
+        
+        key = (id(cls), id(required_base))
+        cached = _cache_lookup(_inheritance_cache, key, cls)
+        if cached is not None:
+            return cached
+        
         try:
-            return inspect.isclass(cls) and issubclass(cls, required_base)
+            # Direct MRO membership avoids the __subclasscheck__ protocol; agents must
+            # really inherit from the base, so ABC virtual subclasses are not accepted
+            return _cache_store(_inheritance_cache, key, cls, required_base in cls.__mro__)
         except Exception as e:
             logger.error(f"Error validating inheritance: {e}")
             return False
     
     @staticmethod
-    def get_module_info(module: Any) -> Dict[str, Any]:
+    def iter_classes(module: Any) -> Iterator[str]:
+        """Lazily yield names of public classes defined in module"""
+        module_name = module.__name__
+        for name, obj in _iter_public_members(module):
+            if isinstance(obj, type) and obj.__module__ == module_name:
+                yield name
+    
+    @staticmethod
+    def iter_functions(module: Any) -> Iterator[str]:
+        """Lazily yield names of public functions defined in module"""
+        module_name = module.__name__
+        for name, obj in _iter_public_members(module):
+            if isinstance(obj, types.FunctionType) and obj.__module__ == module_name:
+                yield name
+    
+    @staticmethod
+    def iter_variables(module: Any) -> Iterator[Dict[str, Any]]:
+        """Lazily yield public non-callable, non-module attributes of module with truncated values"""
+        for name, obj in _iter_public_members(module):
+            if not callable(obj) and not isinstance(obj, types.ModuleType):
+                yield {
+                    "name": name,
+                    "type": type(obj).__name__,
+                    "value": str(obj)[:50]  # Truncate long values
+                }
+    
+    @staticmethod
+    def get_module_info(module: Any, include_vars: bool = True) -> ModuleInfo:
         """
         Get comprehensive information about a module
         
         Args:
             module: Module to inspect
+            include_vars: Collect module-level variables; pass False to skip stringifying every value
             
         Returns:
-            Dictionary with module information
+            ModuleInfo record (use .to_dict() for JSON)
         """
+        cache_key = (getattr(module, "__name__", None), _module_mtime(module), include_vars)
+        cached = _cache_lookup(_module_info_cache, cache_key, module)
+        if cached is not None:
+            return cached
+        
         try:
-            info = {
-                "name": module.__name__,
-                "file": getattr(module, "__file__", "Unknown"),
-                "doc": inspect.getdoc(module),
-                "classes": [],
-                "functions": [],
-                "variables": [],
-                "imports": []
-            }
-            
-            # Get all members
-            for name, obj in inspect.getmembers(module):
-                if name.startswith('_'):
-                    continue
-                
-                if inspect.isclass(obj) and obj.__module__ == module.__name__:
-                    info["classes"].append(name)
-                elif inspect.isfunction(obj) and obj.__module__ == module.__name__:
-                    info["functions"].append(name)
-                elif not callable(obj) and not inspect.ismodule(obj):
-                    info["variables"].append({
-                        "name": name,
-                        "type": type(obj).__name__,
-                        "value": str(obj)[:50]  # Truncate long values
-                    })
+            info = ModuleInfo(
+                name=module.__name__,
+                file=getattr(module, "__file__", "Unknown"),
+                doc=inspect.getdoc(module),
+                classes=list(ReflectionUtils.iter_classes(module)),
+                functions=list(ReflectionUtils.iter_functions(module)),
+                variables=list(ReflectionUtils.iter_variables(module)) if include_vars else []
+            )
             
-            return info
+            return _cache_store(_module_info_cache, cache_key, module, info)
             
         except Exception as e:
             logger.error(f"Error getting module info: {e}")
-            return {"name": getattr(module, "__name__", "Unknown"), "error": str(e)}
+            return ModuleInfo(name=getattr(module, "__name__", "Unknown"), error=str(e))
     
     @staticmethod
     def execute_function_safely(func: Callable, *args, **kwargs) -> Dict[str, Any]:
@@ -297,36 +557,56 @@ class ReflectionUtils:
         Returns:
             Execution result dictionary
         """
-        start_time = datetime.now()
+        timestamp = datetime.now().isoformat()
+        start = time.perf_counter()
         
         try:
             result = func(*args, **kwargs)
-            end_time = datetime.now()
             
             return {
                 "success": True,
                 "result": result,
-                "execution_time": (end_time - start_time).total_seconds(),
+                "execution_time": time.perf_counter() - start,
                 "function_name": func.__name__,
-                "timestamp": start_time.isoformat()
+                "timestamp": timestamp
             }
             
         except Exception as e:
-            end_time = datetime.now()
-            
             return {
                 "success": False,
                 "error": str(e),
-                "execution_time": (end_time - start_time).total_seconds(),
+                "execution_time": time.perf_counter() - start,
                 "function_name": func.__name__,
-                "timestamp": start_time.isoformat()
+                "timestamp": timestamp
             }
     
+    @staticmethod
+    def iter_agent_files(directory: str, pattern: str = "*agent*.py") -> Iterator[str]:
+        """
+        Lazily yield agent files in directory matching pattern
+        
+        Args:
+            directory: Directory to search
+            pattern: File pattern to match
+            
+        Yields:
+            Discovered file paths
+        """
+        match = _compile_file_pattern(pattern)
+        with os.scandir(directory) as entries:
+            for entry in entries:
+                if (entry.name.endswith('.py') and
+                        match(os.path.normcase(entry.name)) and
+                        entry.is_file()):
+                    yield entry.path
+    
     @staticmethod
     def discover_agent_files(directory: str, pattern: str = "*agent*.py") -> List[str]:
         """
         Discover agent files in directory using pattern matching
         
+        Listings are cached until the directory's modification time changes.
+        
         Args:
             directory: Directory to search
             pattern: File pattern to match
@@ -335,15 +615,13 @@ class ReflectionUtils:
             List of discovered file paths
         """
         try:
-            directory_path = Path(directory)
-            if not directory_path.exists():
+            try:
+                mtime_ns = os.stat(directory).st_mtime_ns
+            except FileNotFoundError:
                 logger.warning(f"Directory not found: {directory}")
                 return []
             
-            discovered_files = []
-            for file_path in directory_path.glob(pattern):
-                if file_path.is_file() and file_path.suffix == '.py':
-                    discovered_files.append(str(file_path))
+            discovered_files = list(_cached_discover(directory, pattern, mtime_ns))
             
             logger.info(f"Discovered {len(discovered_files)} agent files in {directory}")
             return discovered_files
@@ -352,6 +630,11 @@ class ReflectionUtils:
             logger.error(f"Error discovering agent files: {e}")
             return []
 
+@functools.lru_cache(maxsize=64)
+def _cached_discover(directory: str, pattern: str, mtime_ns: int) -> Tuple[str, ...]:
+    """Directory listing cache keyed by (directory, pattern, directory mtime)"""
+    return tuple(ReflectionUtils.iter_agent_files(directory, pattern))
+
 
 # Global reflection utils instance
 reflection_utils = ReflectionUtils()
@@ -4,12 +4,165 @@ Extracts goals, constraints, destinations from text input
 """
 
 from typing import Dict, Any, List
+import copy
+import functools
 import logging
 import re
 from core.base_agent import BaseAgent, GraphState
 
+# Optional imports with fallbacks
+try:
+    import ahocorasick
+except ImportError:
+    ahocorasick = None
+
 logger = logging.getLogger(__name__)
 
+# Destination patterns, each scanned separately so overlapping matches are all kept
+_DEST_PATTERNS = (
+    re.compile(r"(?:go to|visit|traveling to|trip to|vacation in)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)"),
+    re.compile(r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:trip|vacation|travel)"),
+    re.compile(r"in\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)"),
+)
+
+# Budget patterns, applied to the lowercased text in order
+_BUDGET_PATTERNS = (
+    re.compile(r"\$(\d+(?:,\d+)*)"),
+    re.compile(r"(\d+)\s*(?:dollars?|USD|euros?|EUR)"),
+    re.compile(r"budget.*?(\d+)"),
+    re.compile(r"spend.*?(\d+)"),
+)
+
+_GOAL_KEYWORDS = {
+    "relaxation": ("relax", "peaceful", "calm", "rest", "unwind"),
+    "adventure": ("adventure", "exciting", "thrill", "active", "hiking"),
+    "culture": ("culture", "history", "museum", "art", "heritage"),
+    "food": ("food", "cuisine", "restaurant", "dining", "culinary"),
+    "nature": ("nature", "outdoor", "wildlife", "park", "scenic"),
+    "photography": ("photo", "photography", "instagram", "pictures"),
+}
+
+_CONSTRAINT_KEYWORDS = {
+    "budget": ("cheap", "budget", "affordable", "expensive", "cost"),
+    "time": ("limited time", "short", "quick", "rushed", "tight schedule"),
+    "accessibility": ("accessible", "disability", "mobility", "wheelchair"),
+    "dietary": ("vegetarian", "vegan", "gluten", "allergy", "dietary"),
+}
+
+
+
+def _build_keyword_automaton():
+    """Build one Aho-Corasick automaton over all goal and constraint keywords"""
+    if ahocorasick is None:
+        return None
+    
+    labels: Dict[str, list] = {}
+    for kind, table in (("goals", _GOAL_KEYWORDS), ("constraints", _CONSTRAINT_KEYWORDS)):
+        for label, keywords in table.items():
+            for keyword in keywords:
+                labels.setdefault(keyword, []).append((kind, label))
+    
+    automaton = ahocorasick.Automaton()
+    for keyword, hits in labels.items():
+        automaton.add_word(keyword, tuple(hits))
+    automaton.make_automaton()
+    return automaton
+
+_KEYWORD_AUTOMATON = _build_keyword_automaton()
+
+# Chat-sized texts are memoized; longer ones (batch transcripts) are analyzed uncached
+ANALYSIS_CACHE_SIZE = 128
+ANALYSIS_CACHE_MAX_CHARS = 2000
+
+
+def analyze_trip_text(text: str) -> Dict[str, Any]:
+    """
+    Extract structured trip information from text
+    
+    Args:
+        text: Text to analyze
+        
+    Returns:
+        A fresh analysis dict the caller may modify
+    """
+    if len(text) > ANALYSIS_CACHE_MAX_CHARS:
+        return _extract_trip_info(text)
+    return copy.deepcopy(_cached_trip_info(text))
+
+
+@functools.lru_cache(maxsize=ANALYSIS_CACHE_SIZE)
+def _cached_trip_info(text: str) -> Dict[str, Any]:
+    """Memoized _extract_trip_info; the shared result must never be handed out directly"""
+    return _extract_trip_info(text)
+
+
+def _extract_trip_info(text: str) -> Dict[str, Any]:
+    """Extract destinations, budget, timing, group, goals and constraints from text"""
+    analysis = {
+        "destinations": [],
+        "goals": [],
+        "constraints": [],
+        "preferences": {},
+        "budget_info": {},
+        "timing": {},
+        "group_info": {}
+    }
+    
+    text_lower = text.lower()
+    
+    # Extract destinations using common patterns (insertion-ordered dedup)
+    destinations: Dict[str, None] = {}
+    for pattern in _DEST_PATTERNS:
+        for match in pattern.findall(text):
+            if len(match) > 2:
+                destinations.setdefault(match, None)
+    analysis["destinations"] = list(destinations)
+
+    # Extract budget information
+    for pattern in _BUDGET_PATTERNS:
+        matches = pattern.findall(text_lower)
+        if matches:
+            analysis["budget_info"]["mentioned_amounts"] = matches
+    
+    # Extract timing information
+    if any(word in text_lower for word in ["week", "weeks"]):
+        analysis["timing"]["duration_type"] = "weeks"
+    elif any(word in text_lower for word in ["day", "days"]):
+        analysis["timing"]["duration_type"] = "days"
+    elif any(word in text_lower for word in ["month", "months"]):
+        analysis["timing"]["duration_type"] = "months"
+    
+    # Extract group information
+    if any(word in text_lower for word in ["family", "kids", "children"]):
+        analysis["group_info"]["type"] = "family"
+    elif any(word in text_lower for word in ["couple", "partner", "spouse"]):
+        analysis["group_info"]["type"] = "couple"
+    elif any(word in text_lower for word in ["solo", "alone", "myself"]):
+        analysis["group_info"]["type"] = "solo"
+    elif any(word in text_lower for word in ["friends", "group"]):
+        analysis["group_info"]["type"] = "friends"
+    
+    if _KEYWORD_AUTOMATON is not None:
+        # Extract goals and constraints in a single pass over the text
+        hits = {"goals": set(), "constraints": set()}
+        for _, matches in _KEYWORD_AUTOMATON.iter(text_lower):
+            for kind, label in matches:
+                hits[kind].add(label)
+        analysis["goals"] = [goal for goal in _GOAL_KEYWORDS if goal in hits["goals"]]
+        analysis["constraints"] = [c for c in _CONSTRAINT_KEYWORDS if c in hits["constraints"]]
+    else:
+        # Extract goals and preferences
+        for goal, keywords in _GOAL_KEYWORDS.items():
+            if any(keyword in text_lower for keyword in keywords):
+                analysis["goals"].append(goal)
+
+        # Extract constraints
+        for constraint, keywords in _CONSTRAINT_KEYWORDS.items():
+            if any(keyword in text_lower for keyword in keywords):
+                analysis["constraints"].append(constraint)
+    
+    return analysis
+
 
 class TextTripAnalyzerAgent(BaseAgent):
     """Agent specialized in analyzing trip planning text to extract goals, constraints, and destinations"""
@@ -68,8 +221,12 @@ class TextTripAnalyzerAgent(BaseAgent):
         try:
             self.log_processing(query, user_id)
             
-            # Extract trip information from text
-            trip_analysis = self._analyze_trip_text(query)
+            # Extract trip information from text, reusing the request-scoped parse when available
+            request_ctx = state.get("request_ctx")
+            if request_ctx is not None and request_ctx.text == query:
+                trip_analysis = request_ctx.trip_analysis
+            else:
+                trip_analysis = self._analyze_trip_text(query)
             
             # Search for similar trip planning queries
             search_results = self.search_similar_content(query, user_id, limit=3)
@@ -103,28 +260,19 @@ class TextTripAnalyzerAgent(BaseAgent):
             # Enhance response with extracted data
             enhanced_response = self._format_analysis_response(response, trip_analysis)
             
-            # Store interaction with trip analysis metadata
-            self.store_interaction(
+            # Store interaction and vector embedding for future trip analysis in one write
+            self.store_interaction_with_embedding(
                 user_id=user_id,
                 query=query,
                 response=enhanced_response,
                 interaction_type="trip_analysis",
-                metadata={
-                    "analysis_type": "text_trip_analysis",
-                    "extracted_data": trip_analysis,
-                    "destinations_found": len(trip_analysis.get("destinations", [])),
-                    "constraints_found": len(trip_analysis.get("constraints", []))
-                }
-            )
-            
-            # Store vector embedding for future trip analysis
-            self.store_vector_embedding(
-                user_id=user_id,
-                content=f"Trip Analysis: {query}\nExtracted: {trip_analysis}",
-                metadata={
+                embedding_content=f"Trip Analysis: {query}\nExtracted: {trip_analysis}",
+                embedding_metadata={
                     "agent": self.name,
                     "domain": "trip_planning",
-                    "analysis_type": "text_extraction"
+                    "analysis_type": "text_extraction",
+                    "destinations_found": len(trip_analysis.get("destinations", [])),
+                    "constraints_found": len(trip_analysis.get("constraints", []))
                 }
             )
             
@@ -146,89 +294,7 @@ class TextTripAnalyzerAgent(BaseAgent):
     
     def _analyze_trip_text(self, text: str) -> Dict[str, Any]:
         """Extract structured trip information from text"""
-        analysis = {
-            "destinations": [],
-            "goals": [],
-            "constraints": [],
-            "preferences": {},
-            "budget_info": {},
-            "timing": {},
-            "group_info": {}
-        }
-        
-        text_lower = text.lower()
-        
-        # Extract destinations using common patterns
-        destination_patterns = [
-            r"(?:go to|visit|traveling to|trip to|vacation in)\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-            r"([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)\s+(?:trip|vacation|travel)",
-            r"in\s+([A-Z][a-z]+(?:\s+[A-Z][a-z]+)*)",
-        ]
-        
-        for pattern in destination_patterns:
-            matches = re.findall(pattern, text)
-            for match in matches:
-                if len(match) > 2 and match not in analysis["destinations"]:
-                    analysis["destinations"].append(match)
-        
-        # Extract budget information
-        budget_patterns = [
-            r"\$(\d+(?:,\d+)*)",
-            r"(\d+)\s*(?:dollars?|USD|euros?|EUR)",
-            r"budget.*?(\d+)",
-            r"spend.*?(\d+)"
-        ]
-        
-        for pattern in budget_patterns:
-            matches = re.findall(pattern, text_lower)
-            if matches:
-                analysis["budget_info"]["mentioned_amounts"] = matches
-        
-        # Extract timing information
-        if any(word in text_lower for word in ["week", "weeks"]):
-            analysis["timing"]["duration_type"] = "weeks"
-        elif any(word in text_lower for word in ["day", "days"]):
-            analysis["timing"]["duration_type"] = "days"
-        elif any(word in text_lower for word in ["month", "months"]):
-            analysis["timing"]["duration_type"] = "months"
-        
-        # Extract group information
-        if any(word in text_lower for word in ["family", "kids", "children"]):
-            analysis["group_info"]["type"] = "family"
-        elif any(word in text_lower for word in ["couple", "partner", "spouse"]):
-            analysis["group_info"]["type"] = "couple"
-        elif any(word in text_lower for word in ["solo", "alone", "myself"]):
-            analysis["group_info"]["type"] = "solo"
-        elif any(word in text_lower for word in ["friends", "group"]):
-            analysis["group_info"]["type"] = "friends"
-        
-        # Extract goals and preferences
-        goal_keywords = {
-            "relaxation": ["relax", "peaceful", "calm", "rest", "unwind"],
-            "adventure": ["adventure", "exciting", "thrill", "active", "hiking"],
-            "culture": ["culture", "history", "museum", "art", "heritage"],
-            "food": ["food", "cuisine", "restaurant", "dining", "culinary"],
-            "nature": ["nature", "outdoor", "wildlife", "park", "scenic"],
-            "photography": ["photo", "photography", "instagram", "pictures"]
-        }
-        
-        for goal, keywords in goal_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                analysis["goals"].append(goal)
-        
-        # Extract constraints
-        constraint_keywords = {
-            "budget": ["cheap", "budget", "affordable", "expensive", "cost"],
-            "time": ["limited time", "short", "quick", "rushed", "tight schedule"],
-            "accessibility": ["accessible", "disability", "mobility", "wheelchair"],
-            "dietary": ["vegetarian", "vegan", "gluten", "allergy", "dietary"]
-        }
-        
-        for constraint, keywords in constraint_keywords.items():
-            if any(keyword in text_lower for keyword in keywords):
-                analysis["constraints"].append(constraint)
-        
-        return analysis
+        return analyze_trip_text(text)
     
     def _format_analysis_response(self, response: str, analysis: Dict[str, Any]) -> str:
         """Format the analysis response with extracted data"""
@@ -5,26 +5,43 @@ import os
 # Add the parent directory to Python path to enable imports from core, auth, database modules
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from fastapi import FastAPI, Request, HTTPException, Body, Depends
+from fastapi import FastAPI, Request, HTTPException, Body, Depends, BackgroundTasks
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
-from fastapi.responses import HTMLResponse
-from pydantic import BaseModel
-from typing import List, Dict
+from fastapi.responses import HTMLResponse, JSONResponse, ORJSONResponse, StreamingResponse
+from pydantic import BaseModel, ConfigDict
+from typing import Any, List, Dict, Optional
+import asyncio
+import hashlib
 import json, os
 import logging
-from datetime import datetime
+import threading
+import time
 
 # Import required modules for vector search
 try:
-    from langchain.schema import Document
-    from langchain_community.embeddings import HuggingFaceEmbeddings
+    import numpy as np
 except ImportError:
-    # Fallback if langchain modules are not available
-    Document = None
-    HuggingFaceEmbeddings = None
+    np = None
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+from config import Config
 from core.memory import MemoryManager
+from core.onnx_embeddings import OnnxSentenceEmbeddings, onnx_embeddings_available
 from core.orchestrator import run_dynamic_graph
 from core.ollama_client import ollama_client
 
@@ -55,11 +72,36 @@ except ImportError:
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# Multiagent system is loaded with the app so no request pays its import and graph setup
+try:
+    from core.langgraph_multiagent_system import langgraph_multiagent_system
+except Exception as e:
+    # Construction reads core/agents.json and may fail with more than ImportError
+    logger.warning(f"LangGraph multiagent system unavailable: {e}")
+    langgraph_multiagent_system = None
+
+# Recent /run_graph results per (user, normalized question); repeats skip the agent pipeline
+RUN_GRAPH_CACHE_TTL_SECONDS = 300
+_run_graph_cache = TTLCache(maxsize=2048, ttl=RUN_GRAPH_CACHE_TTL_SECONDS) if TTLCache else None
+
+def _run_graph_cache_key(user_id, question: str) -> tuple:
+    return (user_id, hashlib.blake2b(question.strip().lower().encode(), digest_size=16).digest())
+
+def _temporary_user_id() -> int:
+    # Seconds since the epoch, as before: user_id columns are 32-bit INT
+    return time.time_ns() // 1_000_000_000
+
+def _require_multiagent_system():
+    if langgraph_multiagent_system is None:
+        raise HTTPException(status_code=503, detail="Travel assistant system is not available")
+
 # ✅ FastAPI Setup
 app = FastAPI(
     title="Travel Assistant - LangGraph Multi-Agent System",
     description="Intelligent travel planning assistant with specialized agents",
-    version="1.0.0"
+    version="1.0.0",
+    # orjson is several times faster on large agent responses and skips ASCII escaping
+    default_response_class=ORJSONResponse if orjson else JSONResponse
 )
 
 # Mount static files and templates
@@ -74,16 +116,100 @@ if auth_router:
 if travel_router:
     app.include_router(travel_router)
 
+# ✅ Startup warmup
+@app.on_event("startup")
+async def warm_up_travel_services():
+    """Build the travel agents and intent index and open the pooled LLM connection before the first request"""
+    try:
+        await asyncio.to_thread(get_vector_embedder)
+        from core.travel_orchestrator import get_travel_orchestrator
+        orchestrator = await asyncio.to_thread(get_travel_orchestrator)
+        await asyncio.to_thread(orchestrator.warm_up)
+        await asyncio.to_thread(ollama_client.warmup)
+    except Exception as e:
+        logger.warning(f"Travel services warmup failed: {e}")
+
+@app.on_event("shutdown")
+async def close_travel_services():
+    """Release the shared async LLM client"""
+    await ollama_client.aclose()
+
 # ✅ Globalsh
 memory_manager = MemoryManager()
 AGENT_FILE = os.path.abspath(os.path.join(os.path.dirname(__file__), "../core/agents.json"))
 
-# ✅ Schemas
+# ✅ Shared embedder for /search_vector (loaded once, at startup or on first search)
+_vector_embedder = None
+_vector_embedder_lock = threading.Lock()
+
+def _use_onnx_embedder() -> bool:
+    return bool(Config.ONNX_EMBEDDING_MODEL_DIR) and onnx_embeddings_available()
+
+def get_vector_embedder():
+    """
+    Return the process-wide sentence embedder, or None when no backend is available
+    
+    Prefers the int8 ONNX export when ONNX_EMBEDDING_MODEL_DIR is set, otherwise reuses the
+    MemoryManager's already-loaded SentenceTransformer (same MiniLM model)
+    """
+    global _vector_embedder
+    if _vector_embedder is None and _use_onnx_embedder():
+        with _vector_embedder_lock:
+            if _vector_embedder is None:
+                try:
+                    _vector_embedder = OnnxSentenceEmbeddings(Config.ONNX_EMBEDDING_MODEL_DIR)
+                except Exception as e:
+                    logger.warning(f"ONNX embedder unavailable, using SentenceTransformer: {e}")
+                    _vector_embedder = memory_manager.embedding_model
+    return _vector_embedder if _vector_embedder is not None else memory_manager.embedding_model
+
+def _embed_and_search(texts: List[str], query: str, k: int = 5) -> List[str]:
+    """
+    Rank texts by cosine similarity to query
+    
+    Args:
+        texts: Candidate texts
+        query: Search query
+        k: Number of results to return
+        
+    Returns:
+        Up to k texts, most similar first
+    """
+    embedder = get_vector_embedder()
+    
+    # Query and documents go through the model together as one batch
+    batch = [query] + texts
+    if isinstance(embedder, OnnxSentenceEmbeddings):
+        matrix = embedder.encode(batch)
+    else:
+        matrix = embedder.encode(
+            batch,
+            batch_size=min(64, len(batch)),
+            show_progress_bar=False,
+            convert_to_numpy=True,
+            normalize_embeddings=True
+        )
+    matrix = np.asarray(matrix, dtype=np.float32)
+    query_vector, vectors = matrix[0], matrix[1:]
+    
+    # Embeddings are normalized, so the dot product is the cosine similarity; for the
+    # dozens of STM/LTM texts a search sees, brute force beats building any index
+    scores = vectors @ query_vector
+    k = min(k, len(texts))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [texts[i] for i in top]
+
+# ✅ Schemas (flat request bodies; unknown fields are rejected instead of carried along)
 class GraphInput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     user: str
     question: str
 
 class STMRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     user_id: str
     agent_id: str
     value: str
@@ -109,38 +235,87 @@ def get_agents():
     except Exception as e:
         return {"agents": {}, "edges": {}}
 
-@app.post("/register_agents")
-def register_agents(payload: dict = Body(...)):
+# Parsed agents.json and the mtime it was read at; re-read whenever another worker has written it
+_agents_cache = None
+_agents_cache_mtime = None
+_agents_lock = asyncio.Lock()
+
+def _load_agent_file() -> dict:
+    """Read agents.json, or an empty registry if it does not exist yet"""
+    data = {"agents": [], "edges": {}, "entry_point": ""}
+    if os.path.exists(AGENT_FILE):
+        with open(AGENT_FILE, "rb") as f:
+            data = orjson.loads(f.read()) if orjson else json.load(f)
+    return data
+
+def _write_agent_file(data: dict):
+    """Write agents.json atomically so readers never see a partial file"""
+    tmp = AGENT_FILE + ".tmp"
+    with open(tmp, "wb") as f:
+        if orjson:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2))
+        else:
+            f.write(json.dumps(data, indent=2).encode())
+    os.replace(tmp, AGENT_FILE)
+
+def _agent_file_mtime():
+    """agents.json modification time in ns, or None if it does not exist yet"""
     try:
-        data = {"agents": [], "edges": {}, "entry_point": ""}
-        if os.path.exists(AGENT_FILE):
-            with open(AGENT_FILE, "r") as f:
-                data = json.load(f)
-
-        existing_agents = {a["id"]: a for a in data.get("agents", [])}
-        existing_edges = data.get("edges", {})
-        entry_point = payload.get("entry_point", data.get("entry_point", ""))
-
-        for agent in payload.get("agents", []):
-            if agent["id"] not in existing_agents:
-                existing_agents[agent["id"]] = agent
-
-        for src, targets in payload.get("edges", {}).items():
-            existing_edges[src] = list(set(existing_edges.get(src, []) + targets))
-
-        updated = {
-            "agents": list(existing_agents.values()),
-            "edges": existing_edges,
-            "entry_point": entry_point
-        }
+        return os.stat(AGENT_FILE).st_mtime_ns
+    except FileNotFoundError:
+        return None
 
-        with open(AGENT_FILE, "w") as f:
-            json.dump(updated, f, indent=2)
+def _update_agent_file(payload: dict) -> dict:
+    """
+    Merge a registration into agents.json under an exclusive file lock
+    
+    The lock serializes workers; the cached copy is only reused while the file
+    is unchanged since this worker last read or wrote it.
+    """
+    global _agents_cache, _agents_cache_mtime
+    with open(AGENT_FILE + ".lock", "a") as lock_file:
+        if fcntl:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        try:
+            if _agents_cache is None or _agent_file_mtime() != _agents_cache_mtime:
+                _agents_cache = _load_agent_file()
+            updated = _merge_agent_registration(_agents_cache, payload)
+            _write_agent_file(updated)
+            _agents_cache, _agents_cache_mtime = updated, _agent_file_mtime()
+            return updated
+        finally:
+            if fcntl:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+@app.post("/register_agents")
+async def register_agents(payload: dict = Body(...)):
+    try:
+        async with _agents_lock:
+            updated = await asyncio.to_thread(_update_agent_file, payload)
 
         return {"message": "Updated", "data": updated}
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+def _merge_agent_registration(data: dict, payload: dict) -> dict:
+    """Merge registered agents and edges into the current agents.json contents"""
+    existing_agents = {a["id"]: a for a in data.get("agents", [])}
+    existing_edges = dict(data.get("edges", {}))
+    entry_point = payload.get("entry_point", data.get("entry_point", ""))
+
+    for agent in payload.get("agents", []):
+        if agent["id"] not in existing_agents:
+            existing_agents[agent["id"]] = agent
+
+    for src, targets in payload.get("edges", {}).items():
+        existing_edges[src] = list(set(existing_edges.get(src, []) + targets))
+
+    return {
+        "agents": list(existing_agents.values()),
+        "edges": existing_edges,
+        "entry_point": entry_point
+    }
+
 # ✅ STM & LTM APIs
 @app.post("/set_stm")
 def set_stm(req: STMRequest):
@@ -162,33 +337,32 @@ def get_ltm(user_id: str, agent_id: str):
 
 # ✅ Vector Search (Semantic)
 @app.get("/search_vector")
-def search_vector(query: str, user_id: str, agent_id: str = None, hours: int = 1, days: int = 1):
+async def search_vector(query: str, user_id: str, agent_id: str = None, hours: int = 1, days: int = 1):
     try:
-        stm_texts = memory_manager.get_recent_stm(user_id, agent_id, hours)
-        ltm_entries = memory_manager.get_recent_ltm(user_id, agent_id, days)
+        # STM (Redis) and LTM (MySQL) reads overlap instead of running back to back
+        stm_texts, ltm_entries = await asyncio.gather(
+            asyncio.to_thread(memory_manager.get_recent_stm, user_id, agent_id, hours),
+            asyncio.to_thread(memory_manager.get_recent_ltm, user_id, agent_id, days)
+        )
         ltm_texts = [e["value"] for e in ltm_entries if "value" in e]
         all_texts = stm_texts + ltm_texts
 
         result_texts = []
         
-        # Check if langchain dependencies are available
-        if Document and HuggingFaceEmbeddings:
+        # Check if an embedding backend is available
+        if np is not None and get_vector_embedder() is not None:
             try:
-                docs = [Document(page_content=text) for text in all_texts if isinstance(text, str)]
+                texts = [text for text in all_texts if isinstance(text, str)]
                 
-                if docs:
-                    embeddings = HuggingFaceEmbeddings(model_name="sentence-transformers/all-MiniLM-L6-v2")
-                    from langchain_community.vectorstores import FAISS
-                    vector_db = FAISS.from_documents(docs, embedding=embeddings)
-                    results = vector_db.similarity_search(query, k=5)
-                    result_texts = [doc.page_content for doc in results]
+                if texts:
+                    result_texts = await asyncio.to_thread(_embed_and_search, texts, query, 5)
             except Exception as vector_error:
                 logger.warning(f"Vector search failed, using text matching fallback: {vector_error}")
                 # Simple text matching fallback
                 query_lower = query.lower()
                 result_texts = [text for text in all_texts if query_lower in text.lower()][:5]
         else:
-            # Simple text matching fallback when langchain is not available
+            # Simple text matching fallback when no embedding backend is available
             query_lower = query.lower()
             result_texts = [text for text in all_texts if query_lower in text.lower()][:5]
 
@@ -203,6 +377,8 @@ def search_vector(query: str, user_id: str, agent_id: str = None, hours: int = 1
 
 # ✅ New Chat Input Schema
 class ChatInput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
     user: str
     user_id: int
     question: str
@@ -227,47 +403,36 @@ async def legacy_interface(request: Request):
 @app.post("/run_graph")
 async def run_graph_authenticated(payload: GraphInput, current_user: dict = Depends(get_current_user) if get_current_user else None):
     """Run Travel Assistant with specialized travel agents"""
+    _require_multiagent_system()
     try:
-        # Import the travel-enhanced multiagent system
-        from core.langgraph_multiagent_system import langgraph_multiagent_system
-        
         # Use authenticated user ID if available, otherwise generate temporary ID
         if current_user:
             user_id = current_user['id']
             username = current_user['username']
         else:
-            user_id = int(datetime.now().timestamp())
+            user_id = _temporary_user_id()
             username = payload.user
         
-        start_time = datetime.now()
+        start_ns = time.monotonic_ns()
         
-        # Process request through Travel Assistant System
-        result = langgraph_multiagent_system.process_request(
-            user=username,
-            user_id=user_id,
-            question=payload.question
-        )
+        cache_key = _run_graph_cache_key(user_id, payload.question)
+        result = _run_graph_cache.get(cache_key) if _run_graph_cache is not None else None
         
-        end_time = datetime.now()
-        processing_time = (end_time - start_time).total_seconds()
+        if result is None:
+            # Process request through Travel Assistant System
+            result = langgraph_multiagent_system.process_request(
+                user=username,
+                user_id=user_id,
+                question=payload.question
+            )
+            if _run_graph_cache is not None and not result.get("error"):
+                _run_graph_cache[cache_key] = result
         
-        # Log query for authenticated users
+        processing_time = (time.monotonic_ns() - start_ns) / 1e9
+        
+        # Log query for authenticated users; the MySQL write can wait on the pool, so keep it off the loop
         if current_user:
-            try:
-                from auth.auth_service import auth_service
-                logger.info(f"🔄 Processing query for user {current_user['id']} ({current_user['username']}): {payload.question[:50]}...")
-                auth_service.log_user_query(
-                    user_id=current_user['id'],
-                    session_id="web_session",  # In real app, track session properly
-                    question=payload.question,
-                    agent_used=result.get('agent', 'Unknown'),
-                    response_text=result.get('response', ''),
-                    edges_traversed=result.get('edges_traversed', []),
-                    processing_time=processing_time
-                )
-                logger.info(f"✅ Query logged for user {current_user['id']}")
-            except Exception as log_error:
-                logger.warning(f"Failed to log query: {log_error}")
+            await asyncio.to_thread(_log_graph_query, current_user, payload.question, result, processing_time)
         
         return result
         
@@ -275,16 +440,69 @@ async def run_graph_authenticated(payload: GraphInput, current_user: dict = Depe
         logger.error(f"Travel assistant execution error: {e}")
         raise HTTPException(status_code=500, detail=f"Travel assistant execution failed: {str(e)}")
 
+# ✅ Streaming run_graph: server-sent events per agent, then the full result
+@app.post("/run_graph/stream")
+async def run_graph_stream(payload: GraphInput, background_tasks: BackgroundTasks,
+                           current_user: dict = Depends(get_current_user) if get_current_user else None):
+    """Run Travel Assistant and stream each agent's response as soon as it is ready"""
+    _require_multiagent_system()
+    
+    if current_user:
+        user_id = current_user['id']
+        username = current_user['username']
+    else:
+        user_id = _temporary_user_id()
+        username = payload.user
+    
+    start_ns = time.monotonic_ns()
+    final = {}
+    
+    def events():
+        for event in langgraph_multiagent_system.stream_request(
+            user=username,
+            user_id=user_id,
+            question=payload.question
+        ):
+            if event["type"] == "final":
+                final["result"] = event["result"]
+            yield f"data: {json.dumps(event, default=str)}\n\n"
+    
+    def log_after_stream():
+        if current_user and "result" in final:
+            processing_time = (time.monotonic_ns() - start_ns) / 1e9
+            _log_graph_query(current_user, payload.question, final["result"], processing_time)
+    
+    # Logging runs once the stream has been fully sent
+    background_tasks.add_task(log_after_stream)
+    return StreamingResponse(events(), media_type="text/event-stream", background=background_tasks)
+
+def _log_graph_query(current_user: dict, question: str, result: dict, processing_time: float):
+    """Record a run_graph query in the authenticated user's history"""
+    try:
+        from auth.auth_service import auth_service
+        logger.info(f"🔄 Processing query for user {current_user['id']} ({current_user['username']}): {question[:50]}...")
+        auth_service.log_user_query(
+            user_id=current_user['id'],
+            session_id="web_session",  # In real app, track session properly
+            question=question,
+            agent_used=result.get('agent', 'Unknown'),
+            response_text=result.get('response', ''),
+            edges_traversed=result.get('edges_traversed', []),
+            processing_time=processing_time
+        )
+        logger.info(f"✅ Query logged for user {current_user['id']}")
+    except Exception as log_error:
+        logger.warning(f"Failed to log query: {log_error}")
+
 # ✅ Legacy run_graph endpoint without authentication (for backward compatibility)
 @app.post("/run_graph_legacy")
 async def run_graph_legacy(payload: GraphInput):
     """Legacy run_graph endpoint using travel assistant system"""
+    _require_multiagent_system()
     try:
-        from core.langgraph_multiagent_system import langgraph_multiagent_system
-        
         result = langgraph_multiagent_system.process_request(
             user=payload.user,
-            user_id=int(datetime.now().timestamp()),
+            user_id=_temporary_user_id(),
             question=payload.question
         )
         
@@ -294,6 +512,108 @@ async def run_graph_legacy(payload: GraphInput):
         logger.error(f"Travel assistant execution error: {e}")
         raise HTTPException(status_code=500, detail=f"Travel assistant execution failed: {str(e)}")
 
+# ✅ JSON batch endpoint: several API calls in one round-trip
+BATCH_MAX_REQUESTS = 20
+# Credentials are taken from the batch request itself
+BATCH_FORWARDED_HEADERS = (b"authorization", b"cookie")
+
+class BatchSubRequest(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    id: str
+    method: str = "GET"
+    path: str
+    body: Optional[Any] = None
+
+class BatchInput(BaseModel):
+    model_config = ConfigDict(extra="forbid")
+
+    requests: List[BatchSubRequest]
+
+@app.post("/batch")
+async def batch_requests(payload: BatchInput, request: Request):
+    """
+    Run several API requests concurrently and return their responses together
+    
+    Each sub-request goes through the full app (routing, dependencies, auth) with
+    the batch request's credentials. Response order matches request order.
+    """
+    if len(payload.requests) > BATCH_MAX_REQUESTS:
+        raise HTTPException(status_code=400, detail=f"At most {BATCH_MAX_REQUESTS} requests per batch")
+    
+    responses = await asyncio.gather(*(_dispatch_sub_request(request, sub) for sub in payload.requests))
+    return {"responses": responses}
+
+async def _dispatch_sub_request(request: Request, sub: BatchSubRequest) -> dict:
+    """
+    Run one batch sub-request through the ASGI app in-process
+    
+    Args:
+        request: The enclosing batch request, for credentials and connection info
+        sub: Sub-request to run
+        
+    Returns:
+        {"id", "status", "body"} with a JSON body decoded when possible
+    """
+    path, _, query = sub.path.partition("?")
+    if not path.startswith("/") or path.rstrip("/") == "/batch":
+        return {"id": sub.id, "status": 400, "body": {"detail": f"Invalid batch path: {sub.path}"}}
+    
+    body = b"" if sub.body is None else json.dumps(sub.body).encode()
+    headers = [(name, value) for name, value in request.scope["headers"] if name in BATCH_FORWARDED_HEADERS]
+    if sub.body is not None:
+        headers.append((b"content-type", b"application/json"))
+    headers.append((b"content-length", str(len(body)).encode()))
+    
+    scope = {
+        "type": "http",
+        "asgi": request.scope.get("asgi", {"version": "3.0"}),
+        "http_version": request.scope.get("http_version", "1.1"),
+        "method": sub.method.upper(),
+        "scheme": request.url.scheme,
+        "path": path,
+        "raw_path": path.encode(),
+        "root_path": request.scope.get("root_path", ""),
+        "query_string": query.encode(),
+        "headers": headers,
+        "client": request.scope.get("client"),
+        "server": request.scope.get("server"),
+    }
+    
+    body_sent = False
+    async def receive():
+        nonlocal body_sent
+        if not body_sent:
+            body_sent = True
+            return {"type": "http.request", "body": body, "more_body": False}
+        # Never report a disconnect; the app cancels this wait once it has responded
+        await asyncio.Future()
+    
+    status = 500
+    content_type = b""
+    chunks = []
+    async def send(message):
+        nonlocal status, content_type
+        if message["type"] == "http.response.start":
+            status = message["status"]
+            content_type = dict(message.get("headers", [])).get(b"content-type", b"")
+        elif message["type"] == "http.response.body":
+            chunks.append(message.get("body", b""))
+    
+    try:
+        await app(scope, receive, send)
+    except Exception as e:
+        logger.error(f"Batch sub-request {sub.id} ({sub.method} {sub.path}) failed: {e}")
+        return {"id": sub.id, "status": 500, "body": {"detail": str(e)}}
+    
+    raw = b"".join(chunks)
+    if content_type.startswith(b"application/json"):
+        try:
+            return {"id": sub.id, "status": status, "body": json.loads(raw) if raw else None}
+        except ValueError:
+            pass
+    return {"id": sub.id, "status": status, "body": raw.decode("utf-8", errors="replace")}
+
 # async def ai_chat(
 #     input_data: ChatInput,
 #     current_user: dict = Depends(get_current_user)
@@ -320,8 +640,8 @@ async def run_graph_legacy(payload: GraphInput):
 async def ollama_status():
     """Check Ollama server status"""
     try:
-        available = ollama_client.is_available()
-        models = ollama_client.list_models() if available else []
+        available = await ollama_client.ais_available(force=True)
+        models = await ollama_client.alist_models() if available else []
         
         return {
             "available": available,
@@ -432,13 +752,26 @@ if __name__ == "__main__":
     print("\n" + "="*50)
     
     try:
-        uvicorn.run(
-            "api.main:app",
-            host="0.0.0.0",
-            port=8000,
-            reload=True,
-            log_level="info"
-        )
+        if Config.DEBUG:
+            uvicorn.run(
+                "api.main:app",
+                host="0.0.0.0",
+                port=8000,
+                reload=True,
+                log_level="info"
+            )
+        else:
+            # uvloop/httptools ship with uvicorn[standard] (not on Windows); one worker per core
+            import importlib.util
+            uvicorn.run(
+                "api.main:app",
+                host="0.0.0.0",
+                port=8000,
+                loop="uvloop" if importlib.util.find_spec("uvloop") else "asyncio",
+                http="httptools" if importlib.util.find_spec("httptools") else "h11",
+                workers=int(os.environ.get("WORKERS", os.cpu_count() or 1)),
+                log_level="info"
+            )
     except KeyboardInterrupt:
         print("\n🛑 Server stopped by user")
     except Exception as e:
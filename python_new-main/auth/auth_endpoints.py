@@ -3,10 +3,14 @@
 🔐 Authentication API Endpoints
 FastAPI endpoints for user authentication and activity management
 """
-from fastapi import APIRouter, HTTPException, Depends, Request
+from fastapi import APIRouter, HTTPException, Depends, Request, Response
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from pydantic import BaseModel, EmailStr
 from typing import Optional, List, Dict, Any
+from concurrent.futures import ThreadPoolExecutor
+import asyncio
+import functools
+import hashlib
 import logging
 
 try:
@@ -16,6 +20,30 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Blocking auth DB calls run here, sized to what the auth database can serve at once,
+# so dashboard bursts queue on this pool instead of exhausting the shared default executor
+_AUTH_EXECUTOR = ThreadPoolExecutor(
+    max_workers=getattr(auth_service, "max_concurrency", 1),
+    thread_name_prefix="auth-db"
+)
+
+async def _run_auth(func, *args, **kwargs):
+    """Run a blocking auth_service call on the auth DB pool"""
+    return await asyncio.get_running_loop().run_in_executor(
+        _AUTH_EXECUTOR, functools.partial(func, *args, **kwargs)
+    )
+
+def _etag(*parts) -> str:
+    """Strong ETag over the values a response is derived from"""
+    digest = hashlib.blake2b(":".join(map(str, parts)).encode(), digest_size=8).hexdigest()
+    return f'"{digest}"'
+
+def _not_modified(request: Request, etag: str) -> Optional[Response]:
+    """Return a 304 response when the client already holds this ETag"""
+    if request.headers.get("if-none-match") == etag:
+        return Response(status_code=304, headers={"ETag": etag})
+    return None
+
 # Security scheme
 security = HTTPBearer(auto_error=False)
 
@@ -63,11 +91,16 @@ class QueryResponse(BaseModel):
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 def get_client_ip(request: Request) -> str:
-    """Extract client IP address from request"""
-    forwarded = request.headers.get("X-Forwarded-For")
-    if forwarded:
-        return forwarded.split(",")[0].strip()
-    return request.client.host if request.client else "unknown"
+    """Extract client IP address from request, parsing headers at most once per request"""
+    client_ip = getattr(request.state, "client_ip", None)
+    if client_ip is None:
+        forwarded = request.headers.get("X-Forwarded-For")
+        if forwarded:
+            client_ip = forwarded.split(",")[0].strip()
+        else:
+            client_ip = request.client.host if request.client else "unknown"
+        request.state.client_ip = client_ip
+    return client_ip
 
 async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] = Depends(security)):
     """Dependency to get current authenticated user"""
@@ -77,7 +110,7 @@ async def get_current_user(credentials: Optional[HTTPAuthorizationCredentials] =
     if not credentials:
         raise HTTPException(status_code=401, detail="Authentication required")
     
-    user = auth_service.get_current_user(credentials.credentials)
+    user = await _run_auth(auth_service.get_current_user, credentials.credentials)
     if not user:
         raise HTTPException(status_code=401, detail="Invalid or expired token")
     
@@ -93,7 +126,8 @@ async def register(request: RegisterRequest, req: Request):
     ip_address = get_client_ip(req)
     
     # Register user
-    result = auth_service.register_user(
+    result = await _run_auth(
+        auth_service.register_user,
         username=request.username,
         email=request.email,
         password=request.password,
@@ -127,7 +161,8 @@ async def login(request: LoginRequest, req: Request):
     ip_address = get_client_ip(req)
     
     # Login user
-    result = auth_service.login_user(
+    result = await _run_auth(
+        auth_service.login_user,
         username=request.username,
         password=request.password,
         ip_address=ip_address
@@ -165,13 +200,15 @@ async def logout(req: Request, credentials: Optional[HTTPAuthorizationCredential
     # Optional: Could implement token blacklisting here if needed
     
     if credentials:
+        auth_service.invalidate_token(credentials.credentials)
         try:
             # Verify the token is valid before logout
             token_data = auth_service._verify_session_token(credentials.credentials)
             if token_data:
                 # Log the logout activity
                 if hasattr(auth_service, 'log_user_activity'):
-                    auth_service.log_user_activity(
+                    await _run_auth(
+                        auth_service.log_user_activity,
                         user_id=token_data.get('user_id'),
                         activity_type='logout',
                         ip_address=ip_address
@@ -184,8 +221,15 @@ async def logout(req: Request, credentials: Optional[HTTPAuthorizationCredential
     return {"success": True, "message": "Logged out successfully"}
 
 @router.get("/me", response_model=UserResponse)
-async def get_me(current_user: Dict = Depends(get_current_user)):
+async def get_me(request: Request, response: Response, current_user: Dict = Depends(get_current_user)):
     """Get current user information"""
+    etag = _etag(current_user['id'], current_user['username'], current_user['email'],
+                 current_user['created_at'], current_user['last_login'])
+    not_modified = _not_modified(request, etag)
+    if not_modified:
+        return not_modified
+    response.headers["ETag"] = etag
+    
     return UserResponse(
         user_id=current_user['id'],
         username=current_user['username'],
@@ -194,7 +238,9 @@ async def get_me(current_user: Dict = Depends(get_current_user)):
         last_login=current_user['last_login'].isoformat() if current_user['last_login'] else None
     )
 
-@router.get("/activity", response_model=List[ActivityResponse])
+# The list endpoints return plain dicts and document their schema via `responses`,
+# so FastAPI serializes them directly instead of re-validating every row
+@router.get("/activity", responses={200: {"model": List[ActivityResponse]}})
 async def get_activity(
     limit: int = 50,
     current_user: Dict = Depends(get_current_user)
@@ -203,19 +249,19 @@ async def get_activity(
     if not auth_service:
         raise HTTPException(status_code=503, detail="Authentication service unavailable")
     
-    activities = auth_service.get_user_activity(current_user['id'], limit)
+    activities = await _run_auth(auth_service.get_user_activity, current_user['id'], limit)
     
     return [
-        ActivityResponse(
-            activity_type=activity['activity_type'],
-            activity_data=activity.get('activity_data', {}),
-            created_at=activity['created_at'].isoformat() if activity['created_at'] else None,
-            ip_address=activity.get('ip_address')
-        )
+        {
+            "activity_type": activity['activity_type'],
+            "activity_data": activity.get('activity_data', {}),
+            "created_at": activity['created_at'],
+            "ip_address": activity.get('ip_address')
+        }
         for activity in activities
     ]
 
-@router.get("/queries", response_model=List[QueryResponse])
+@router.get("/queries", responses={200: {"model": List[QueryResponse]}})
 async def get_queries(
     limit: int = 50,
     current_user: Dict = Depends(get_current_user)
@@ -227,55 +273,55 @@ async def get_queries(
     # Add debug logging to ensure user isolation
     logger.info(f"📊 Loading queries for user {current_user['id']} ({current_user['username']})")
     
-    queries = auth_service.get_user_queries(current_user['id'], limit)
+    queries = await _run_auth(auth_service.get_user_queries, current_user['id'], limit)
     
     # Debug log the count
     logger.info(f"📊 Found {len(queries)} queries for user {current_user['id']}")
     
     return [
-        QueryResponse(
-            query_id=query['query_id'],
-            question=query['question'],
-            agent_used=query['agent_used'],
-            response_preview=query.get('response_preview', query['response_text'][:200]),
-            edges_traversed=query.get('edges_traversed', []),
-            processing_time=float(query['processing_time']) if query['processing_time'] else None,
-            created_at=query['created_at'].isoformat() if query['created_at'] else None
-        )
+        {
+            "query_id": query['query_id'],
+            "question": query['question'],
+            "agent_used": query['agent_used'],
+            "response_preview": query['response_preview'],
+            "edges_traversed": query.get('edges_traversed', []),
+            "processing_time": float(query['processing_time']) if query['processing_time'] else None,
+            "created_at": query['created_at']
+        }
         for query in queries
     ]
 
 @router.get("/stats")
-async def get_user_stats(current_user: Dict = Depends(get_current_user)):
+async def get_user_stats(request: Request, response: Response, current_user: Dict = Depends(get_current_user)):
     """Get user statistics"""
     if not auth_service:
         raise HTTPException(status_code=503, detail="Authentication service unavailable")
     
+    # Unchanged history means unchanged stats; skip the aggregation on repeat polls
+    version = await _run_auth(auth_service.get_user_history_version, current_user['id'])
+    if version is not None:
+        etag = _etag("stats", current_user['id'], current_user['username'],
+                     current_user['created_at'], current_user['last_login'], version)
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        response.headers["ETag"] = etag
+    
     # Add debug logging to ensure user isolation
     logger.info(f"📊 Loading stats for user {current_user['id']} ({current_user['username']})")
     
-    # Get recent activity and queries
-    activities = auth_service.get_user_activity(current_user['id'], 1000)
-    queries = auth_service.get_user_queries(current_user['id'], 1000)
-    
-    # Debug log the counts
-    logger.info(f"📊 User {current_user['id']} stats: {len(queries)} queries, {len(activities)} activities")
+    # Per-agent and per-activity-type counts, aggregated in the database; the two queries are independent
+    agent_usage, activity_types = await asyncio.gather(
+        _run_auth(auth_service.get_user_agent_histogram, current_user['id']),
+        _run_auth(auth_service.get_user_activity_histogram, current_user['id'])
+    )
     
     # Calculate statistics
-    total_queries = len(queries)
-    total_activities = len(activities)
-    
-    # Count queries by agent
-    agent_usage = {}
-    for query in queries:
-        agent = query.get('agent_used', 'Unknown')
-        agent_usage[agent] = agent_usage.get(agent, 0) + 1
+    total_queries = sum(agent_usage.values())
+    total_activities = sum(activity_types.values())
     
-    # Activity types
-    activity_types = {}
-    for activity in activities:
-        activity_type = activity.get('activity_type', 'unknown')
-        activity_types[activity_type] = activity_types.get(activity_type, 0) + 1
+    # Debug log the counts
+    logger.info(f"📊 User {current_user['id']} stats: {total_queries} queries, {total_activities} activities")
     
     return {
         "user_id": current_user['id'],
@@ -289,20 +335,28 @@ async def get_user_stats(current_user: Dict = Depends(get_current_user)):
     }
 
 @router.get("/session")
-async def get_session(current_user: Dict = Depends(get_current_user)):
+async def get_session(request: Request, response: Response, current_user: Dict = Depends(get_current_user)):
     """Get user session data with recent interactions and active agents"""
     if not auth_service:
         raise HTTPException(status_code=503, detail="Authentication service unavailable")
     
+    version = await _run_auth(auth_service.get_user_history_version, current_user['id'])
+    if version is not None:
+        etag = _etag("session", current_user['id'], version)
+        not_modified = _not_modified(request, etag)
+        if not_modified:
+            return not_modified
+        response.headers["ETag"] = etag
+    
     # Get recent queries
-    queries = auth_service.get_user_queries(current_user['id'], 10)
+    queries = await _run_auth(auth_service.get_user_queries, current_user['id'], 10)
     
     # Transform queries to interactions format
     recent_interactions = [
         {
             "agent_name": query['agent_used'],
             "query": query['question'],
-            "timestamp": query['created_at'].isoformat() if query['created_at'] else None
+            "timestamp": query['created_at']
         }
         for query in queries
     ]
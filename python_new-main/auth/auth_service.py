@@ -7,14 +7,59 @@ import bcrypt
 import jwt
 import secrets
 import mysql.connector
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Optional, Dict, Any, List
+import hashlib
 import logging
 import json
 import os
+import threading
+import time
+
+# Optional imports with fallbacks
+try:
+    from cachetools import TTLCache
+except ImportError:
+    TTLCache = None
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    from argon2 import PasswordHasher
+    from argon2.exceptions import InvalidHashError, VerificationError
+except ImportError:
+    PasswordHasher = None
+
+# mysql.connector hands JSON columns back as text; orjson parses them several times faster
+_json_loads = orjson.loads if orjson else json.loads
 
 logger = logging.getLogger(__name__)
 
+# Resolved users per token, so repeat requests skip the users-table read
+CURRENT_USER_CACHE_SIZE = 10_000
+CURRENT_USER_CACHE_TTL_SECONDS = 30
+
+# Verified JWT payloads per token, each kept until the token's own exp
+JWT_CACHE_SIZE = 10_000
+
+# How long a call waits for a pooled connection before giving up
+POOL_ACQUIRE_TIMEOUT_SECONDS = 5.0
+POOL_ACQUIRE_RETRY_SECONDS = 0.01
+
+# argon2id cost for new password hashes; bcrypt hashes still verify and are upgraded on login
+ARGON2_TIME_COST = 2
+ARGON2_MEMORY_COST_KIB = 65536
+ARGON2_PARALLELISM = 1
+
+# MySQL DATE_FORMAT pattern matching datetime.isoformat() for whole-second timestamps
+ISO_DATETIME_FORMAT = "%Y-%m-%dT%H:%i:%s"
+
 class AuthService:
     def __init__(self, 
                  mysql_host="localhost", 
@@ -22,34 +67,84 @@ class AuthService:
                  mysql_password="root",
                  mysql_database="langgraph_ai_system",
                  jwt_secret=None,
-                 session_expire_hours=24):
+                 session_expire_hours=24,
+                 pool_size=10):
         
         self.jwt_secret = jwt_secret or secrets.token_urlsafe(32)
         self.session_expire_hours = session_expire_hours
+        self._password_hasher = PasswordHasher(
+            time_cost=ARGON2_TIME_COST,
+            memory_cost=ARGON2_MEMORY_COST_KIB,
+            parallelism=ARGON2_PARALLELISM
+        ) if PasswordHasher else None
+        # Calls that can safely run at once: one per pooled connection
+        self.max_concurrency = pool_size
+        self._user_cache = (
+            TTLCache(maxsize=CURRENT_USER_CACHE_SIZE, ttl=CURRENT_USER_CACHE_TTL_SECONDS) if TTLCache else None
+        )
+        self._user_cache_lock = threading.Lock()
+        self._jwt_cache: "OrderedDict[bytes, tuple]" = OrderedDict()
+        self._jwt_cache_lock = threading.Lock()
         
-        # Database connection
+        # Database connection pool; each call borrows a connection and returns it when done
         try:
-            self.db = mysql.connector.connect(
+            self.pool = pooling.MySQLConnectionPool(
+                pool_name="auth",
+                pool_size=pool_size,
                 host=mysql_host,
                 user=mysql_user,
                 password=mysql_password,
                 database=mysql_database,
                 autocommit=True
             )
-            logger.info("✅ Authentication service connected to database")
+            logger.info(f"✅ Authentication service connected to database (pool of {pool_size})")
         except Exception as e:
             logger.error(f"❌ Database connection failed: {e}")
             raise
     
+    def _conn(self):
+        """
+        Borrow a pooled connection; close() returns it to the pool
+        
+        mysql.connector raises PoolError at once when the pool is empty, so retry
+        briefly instead of failing calls during a burst.
+        """
+        deadline = time.monotonic() + POOL_ACQUIRE_TIMEOUT_SECONDS
+        while True:
+            try:
+                return self.pool.get_connection()
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(POOL_ACQUIRE_RETRY_SECONDS)
+    
     def _hash_password(self, password: str) -> str:
-        """Hash password using bcrypt"""
+        """Hash password using argon2id, or bcrypt when argon2-cffi is not installed"""
+        if self._password_hasher:
+            return self._password_hasher.hash(password)
         salt = bcrypt.gensalt()
         return bcrypt.hashpw(password.encode('utf-8'), salt).decode('utf-8')
     
     def _verify_password(self, password: str, hashed: str) -> bool:
-        """Verify password against hash"""
+        """Verify password against an argon2id or bcrypt hash"""
+        if hashed.startswith('$argon2'):
+            if not self._password_hasher:
+                logger.error("❌ argon2 password hash found but argon2-cffi is not installed")
+                return False
+            try:
+                return self._password_hasher.verify(hashed, password)
+            except (VerificationError, InvalidHashError):
+                return False
         return bcrypt.checkpw(password.encode('utf-8'), hashed.encode('utf-8'))
     
+    def _password_needs_rehash(self, hashed: str) -> bool:
+        """True when hashed predates the current argon2id parameters"""
+        if not self._password_hasher:
+            return False
+        if not hashed.startswith('$argon2'):
+            return True
+        return self._password_hasher.check_needs_rehash(hashed)
+    
     def _generate_session_token(self, user_id: int, username: str) -> str:
         """Generate JWT session token"""
         payload = {
@@ -67,9 +162,25 @@ class AuthService:
             return ""
     
     def _verify_session_token(self, token: str) -> Optional[Dict[str, Any]]:
-        """Verify and decode JWT session token"""
+        """Verify and decode JWT session token; signatures are checked once per token lifetime"""
+        key = self._token_cache_key(token)
+        now = time.time()
+        with self._jwt_cache_lock:
+            cached = self._jwt_cache.get(key)
+            if cached is not None:
+                if cached[0] > now:
+                    self._jwt_cache.move_to_end(key)
+                    return cached[1]
+                del self._jwt_cache[key]
+        
         try:
             payload = jwt.decode(token, self.jwt_secret, algorithms=['HS256'])
+            exp = payload.get('exp')
+            if exp is not None:
+                with self._jwt_cache_lock:
+                    self._jwt_cache[key] = (exp, payload)
+                    if len(self._jwt_cache) > JWT_CACHE_SIZE:
+                        self._jwt_cache.popitem(last=False)
             return payload
         except jwt.ExpiredSignatureError:
             return None
@@ -78,7 +189,10 @@ class AuthService:
     
     def register_user(self, username: str, email: str, password: str, ip_address: str = None) -> Dict[str, Any]:
         """Register a new user"""
-        cursor = self.db.cursor(dictionary=True)
+        # Hash before taking a pooled connection so the slow KDF doesn't hold one
+        password_hash = self._hash_password(password)
+        conn = self._conn()
+        cursor = conn.cursor(dictionary=True)
         
         try:
             # Check if username or email already exists
@@ -94,8 +208,7 @@ class AuthService:
                 else:
                     return {'success': False, 'error': 'Email already exists'}
             
-            # Hash password and create user
-            password_hash = self._hash_password(password)
+            # Create user
             cursor.execute(
                 """INSERT INTO users (username, email, hashed_password, is_active, created_at) 
                    VALUES (%s, %s, %s, TRUE, NOW())""",
@@ -140,18 +253,28 @@ class AuthService:
             return {'success': False, 'error': 'Registration failed'}
         finally:
             cursor.close()
+            conn.close()
     
-    def login_user(self, username: str, password: str, ip_address: str = None) -> Dict[str, Any]:
-        """Login user and create session"""
-        cursor = self.db.cursor(dictionary=True)
+    def _get_login_user(self, username: str) -> Optional[Dict[str, Any]]:
+        """Fetch the row login_user checks credentials against, or None if unknown"""
+        conn = self._conn()
+        cursor = conn.cursor(dictionary=True)
         
         try:
-            # Get user by username
             cursor.execute(
                 "SELECT id, username, email, hashed_password, is_active FROM users WHERE username = %s",
                 (username,)
             )
-            user = cursor.fetchone()
+            return cursor.fetchone()
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def login_user(self, username: str, password: str, ip_address: str = None) -> Dict[str, Any]:
+        """Login user and create session"""
+        try:
+            # Get user by username
+            user = self._get_login_user(username)
             
             if not user:
                 return {'success': False, 'error': 'Invalid username or password'}
@@ -159,15 +282,30 @@ class AuthService:
             if not user['is_active']:
                 return {'success': False, 'error': 'Account is disabled'}
             
-            # Verify password
+            # Verify password (and compute any upgraded hash) without holding a pooled connection
             if not self._verify_password(password, user['hashed_password']):
                 return {'success': False, 'error': 'Invalid username or password'}
             
-            # Update last login
-            cursor.execute(
-                "UPDATE users SET last_login = NOW() WHERE id = %s",
-                (user['id'],)
-            )
+            new_hash = self._hash_password(password) if self._password_needs_rehash(user['hashed_password']) else None
+        except Exception as e:
+            logger.error(f"❌ Login error: {e}")
+            return {'success': False, 'error': 'Login failed'}
+        
+        conn = self._conn()
+        cursor = conn.cursor(dictionary=True)
+        
+        try:
+            # Update last login, upgrading a legacy or outdated hash in the same statement
+            if new_hash:
+                cursor.execute(
+                    "UPDATE users SET last_login = NOW(), hashed_password = %s WHERE id = %s",
+                    (new_hash, user['id'])
+                )
+            else:
+                cursor.execute(
+                    "UPDATE users SET last_login = NOW() WHERE id = %s",
+                    (user['id'],)
+                )
             
             # Log login activity
             cursor.execute(
@@ -204,10 +342,12 @@ class AuthService:
             return {'success': False, 'error': 'Login failed'}
         finally:
             cursor.close()
+            conn.close()
     
     def logout_user(self, session_id: str, ip_address: str = None) -> bool:
         """Logout user and invalidate session"""
-        cursor = self.db.cursor()
+        conn = self._conn()
+        cursor = conn.cursor()
         
         try:
             # Get user_id from session
@@ -243,6 +383,21 @@ class AuthService:
             return False
         finally:
             cursor.close()
+            conn.close()
+    
+    @staticmethod
+    def _token_cache_key(token: str) -> bytes:
+        return hashlib.blake2b(token.encode(), digest_size=16).digest()
+    
+    def invalidate_token(self, token: str):
+        """Drop a token's cached payload and user so the next lookup starts from scratch"""
+        key = self._token_cache_key(token)
+        with self._jwt_cache_lock:
+            self._jwt_cache.pop(key, None)
+        if self._user_cache is None:
+            return
+        with self._user_cache_lock:
+            self._user_cache.pop(key, None)
     
     def get_current_user(self, token: str) -> Optional[Dict[str, Any]]:
         """Get current user from token"""
@@ -251,7 +406,15 @@ class AuthService:
         if not payload:
             return None
         
-        cursor = self.db.cursor(dictionary=True)
+        if self._user_cache is not None:
+            key = self._token_cache_key(token)
+            with self._user_cache_lock:
+                user = self._user_cache.get(key)
+            if user is not None:
+                return user
+        
+        conn = self._conn()
+        cursor = conn.cursor(dictionary=True)
         
         try:
             # Get user details
@@ -262,6 +425,9 @@ class AuthService:
             user = cursor.fetchone()
             
             if user and user['is_active']:
+                if self._user_cache is not None:
+                    with self._user_cache_lock:
+                        self._user_cache[key] = user
                 return user
             
             return None
@@ -271,19 +437,22 @@ class AuthService:
             return None
         finally:
             cursor.close()
+            conn.close()
     
     def get_user_activity(self, user_id: int, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get user activity history"""
-        cursor = self.db.cursor(dictionary=True)
+        """Get user activity history, with created_at as an ISO 8601 string"""
+        conn = self._conn()
+        cursor = conn.cursor(dictionary=True)
         
         try:
             cursor.execute(
-                """SELECT activity_type, activity_data, created_at, ip_address 
+                """SELECT activity_type, activity_data,
+                          DATE_FORMAT(created_at, %s) AS created_at, ip_address 
                    FROM user_activity 
                    WHERE user_id = %s 
-                   ORDER BY created_at DESC 
+                   ORDER BY user_activity.created_at DESC 
                    LIMIT %s""",
-                (user_id, limit)
+                (ISO_DATETIME_FORMAT, user_id, limit)
             )
             
             activities = cursor.fetchall()
@@ -292,8 +461,8 @@ class AuthService:
             for activity in activities:
                 if activity['activity_data']:
                     try:
-                        activity['activity_data'] = json.loads(activity['activity_data'])
-                    except:
+                        activity['activity_data'] = _json_loads(activity['activity_data'])
+                    except ValueError:
                         activity['activity_data'] = {}
             
             return activities
@@ -303,20 +472,22 @@ class AuthService:
             return []
         finally:
             cursor.close()
+            conn.close()
     
     def get_user_queries(self, user_id: int, limit: int = 50) -> List[Dict[str, Any]]:
-        """Get user query history"""
-        cursor = self.db.cursor(dictionary=True)
+        """Get user query history, with created_at as an ISO 8601 string and a truncated response_preview"""
+        conn = self._conn()
+        cursor = conn.cursor(dictionary=True)
         
         try:
             cursor.execute(
-                """SELECT query_id, question, agent_used, response_text, edges_traversed, 
-                          processing_time, created_at 
+                """SELECT query_id, question, agent_used, response_preview, edges_traversed, 
+                          processing_time, DATE_FORMAT(created_at, %s) AS created_at 
                    FROM user_queries 
                    WHERE user_id = %s 
-                   ORDER BY created_at DESC 
+                   ORDER BY user_queries.created_at DESC 
                    LIMIT %s""",
-                (user_id, limit)
+                (ISO_DATETIME_FORMAT, user_id, limit)
             )
             
             queries = cursor.fetchall()
@@ -325,15 +496,9 @@ class AuthService:
             for query in queries:
                 if query['edges_traversed']:
                     try:
-                        query['edges_traversed'] = json.loads(query['edges_traversed'])
-                    except:
+                        query['edges_traversed'] = _json_loads(query['edges_traversed'])
+                    except ValueError:
                         query['edges_traversed'] = []
-                
-                # Truncate long responses for list view
-                if len(query['response_text']) > 200:
-                    query['response_preview'] = query['response_text'][:200] + "..."
-                else:
-                    query['response_preview'] = query['response_text']
             
             return queries
             
@@ -342,51 +507,117 @@ class AuthService:
             return []
         finally:
             cursor.close()
+            conn.close()
     
-    def log_user_query(self, user_id: int, session_id: str, question: str, 
-                      agent_used: str, response_text: str, edges_traversed: List[str], 
-                      processing_time: float = None) -> bool:
-        """Log a user query for activity tracking"""
-        cursor = self.db.cursor()
+    def get_user_agent_histogram(self, user_id: int) -> Dict[str, int]:
+        """Count a user's queries per agent"""
+        conn = self._conn()
+        cursor = conn.cursor()
         
         try:
-            # First check if user exists
-            cursor.execute("SELECT id FROM users WHERE id = %s", (user_id,))
-            user_exists = cursor.fetchone()
-            
-            if not user_exists:
-                # For non-existent users (like test users), create a temporary/anonymous user record
-                # or simply skip logging to avoid foreign key constraint
-                logger.debug(f"Skipping query log for non-existent user {user_id}")
-                return True  # Return True to not break the flow
+            cursor.execute(
+                """SELECT COALESCE(agent_used, 'Unknown'), COUNT(*) 
+                   FROM user_queries 
+                   WHERE user_id = %s 
+                   GROUP BY agent_used""",
+                (user_id,)
+            )
+            return {agent: count for agent, count in cursor.fetchall()}
             
-            # Check if session exists, if not create a temporary one or use None
+        except Exception as e:
+            logger.error(f"❌ Get user agent histogram error: {e}")
+            return {}
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def get_user_activity_histogram(self, user_id: int) -> Dict[str, int]:
+        """Count a user's activity entries per activity type"""
+        conn = self._conn()
+        cursor = conn.cursor()
+        
+        try:
             cursor.execute(
-                "SELECT session_id FROM user_sessions WHERE session_id = %s AND user_id = %s",
-                (session_id, user_id)
+                """SELECT COALESCE(activity_type, 'unknown'), COUNT(*) 
+                   FROM user_activity 
+                   WHERE user_id = %s 
+                   GROUP BY activity_type""",
+                (user_id,)
             )
-            session_exists = cursor.fetchone()
+            return {activity_type: count for activity_type, count in cursor.fetchall()}
             
-            # If session doesn't exist, set session_id to None to avoid foreign key constraint
-            actual_session_id = session_id if session_exists else None
+        except Exception as e:
+            logger.error(f"❌ Get user activity histogram error: {e}")
+            return {}
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def get_user_history_version(self, user_id: int) -> Optional[str]:
+        """
+        Fingerprint a user's query and activity history
+        
+        Both tables are append-only with auto-increment keys, so the newest ids
+        change whenever a row is added; each MAX is a single index lookup.
+        
+        Returns:
+            "<max query_id>:<max activity_id>", or None on error
+        """
+        conn = self._conn()
+        cursor = conn.cursor()
+        
+        try:
+            cursor.execute(
+                """SELECT (SELECT MAX(query_id) FROM user_queries WHERE user_id = %s),
+                          (SELECT MAX(activity_id) FROM user_activity WHERE user_id = %s)""",
+                (user_id, user_id)
+            )
+            last_query_id, last_activity_id = cursor.fetchone()
+            return f"{last_query_id}:{last_activity_id}"
             
+        except Exception as e:
+            logger.error(f"❌ Get user history version error: {e}")
+            return None
+        finally:
+            cursor.close()
+            conn.close()
+    
+    def log_user_query(self, user_id: int, session_id: str, question: str, 
+                      agent_used: str, response_text: str, edges_traversed: List[str], 
+                      processing_time: float = None) -> bool:
+        """Log a user query for activity tracking"""
+        conn = self._conn()
+        cursor = conn.cursor()
+        
+        try:
+            # Insert only if the user exists, resolving the session in the same statement;
+            # an unknown session becomes NULL to avoid the foreign key constraint
             cursor.execute(
                 """INSERT INTO user_queries (user_id, session_id, question, agent_used, 
                                            response_text, edges_traversed, processing_time) 
-                   VALUES (%s, %s, %s, %s, %s, %s, %s)""",
-                (user_id, actual_session_id, question, agent_used, response_text,
-                 json.dumps(edges_traversed), processing_time)
+                   SELECT u.id,
+                          (SELECT s.session_id FROM user_sessions s
+                           WHERE s.session_id = %s AND s.user_id = u.id),
+                          %s, %s, %s, %s, %s
+                   FROM users u WHERE u.id = %s""",
+                (session_id, question, agent_used, response_text,
+                 json.dumps(edges_traversed), processing_time, user_id)
             )
             
-            # Also log as activity
+            if cursor.rowcount == 0:
+                # For non-existent users (like test users), skip logging to avoid foreign key constraint
+                logger.debug(f"Skipping query log for non-existent user {user_id}")
+                return True  # Return True to not break the flow
+            
+            # Also log as activity, reusing the session resolved above
             cursor.execute(
                 """INSERT INTO user_activity (user_id, session_id, activity_type, activity_data) 
-                   VALUES (%s, %s, 'query', %s)""",
-                (user_id, actual_session_id, json.dumps({
+                   SELECT user_id, session_id, 'query', %s FROM user_queries WHERE query_id = %s""",
+                (json.dumps({
                     'question': question[:100] + "..." if len(question) > 100 else question,
                     'agent_used': agent_used,
                     'processing_time': processing_time
-                }))
+                }), cursor.lastrowid)
             )
             
             logger.info(f"✅ Query logged for user {user_id}")
@@ -397,29 +628,27 @@ class AuthService:
             return False
         finally:
             cursor.close()
+            conn.close()
     
     def create_anonymous_user(self, user_id: int, username: str = None) -> bool:
         """Create an anonymous user for testing purposes"""
-        cursor = self.db.cursor()
+        conn = self._conn()
+        cursor = conn.cursor()
         
         try:
-            # Check if user already exists
-            cursor.execute("SELECT id FROM users WHERE id = %s", (user_id,))
-            if cursor.fetchone():
-                return True  # User already exists
-            
-            # Create anonymous user
+            # Create anonymous user; an existing row is left untouched (rowcount 0)
             username = username or f"anonymous_user_{user_id}"
             email = f"anonymous_{user_id}@test.local"
             
             cursor.execute(
                 """INSERT INTO users (id, username, email, hashed_password, is_active, created_at) 
                    VALUES (%s, %s, %s, %s, TRUE, NOW())
-                   ON DUPLICATE KEY UPDATE username = VALUES(username)""",
+                   ON DUPLICATE KEY UPDATE id = id""",
                 (user_id, username, email, "anonymous_hash")
             )
             
-            logger.info(f"✅ Created anonymous user: {username} (ID: {user_id})")
+            if cursor.rowcount == 1:
+                logger.info(f"✅ Created anonymous user: {username} (ID: {user_id})")
             return True
             
         except Exception as e:
@@ -427,29 +656,17 @@ class AuthService:
             return False
         finally:
             cursor.close()
+            conn.close()
     
     def ensure_user_exists(self, user_id: int, username: str = None) -> bool:
         """Ensure a user exists, create anonymous if needed"""
-        cursor = self.db.cursor()
-        
-        try:
-            # Check if user exists
-            cursor.execute("SELECT id FROM users WHERE id = %s", (user_id,))
-            if cursor.fetchone():
-                return True
-            
-            # Create anonymous user
-            return self.create_anonymous_user(user_id, username)
-            
-        except Exception as e:
-            logger.error(f"❌ Ensure user exists error: {e}")
-            return False
-        finally:
-            cursor.close()
+        # The upsert is a no-op for existing users, so no separate existence check
+        return self.create_anonymous_user(user_id, username)
     
     def cleanup_expired_sessions(self) -> int:
         """Clean up expired sessions"""
-        cursor = self.db.cursor()
+        conn = self._conn()
+        cursor = conn.cursor()
         
         try:
             cursor.execute(
@@ -465,6 +682,7 @@ class AuthService:
             return 0
         finally:
             cursor.close()
+            conn.close()
 
 # Global auth service instance
 from config import config as app_config
@@ -474,5 +692,6 @@ auth_service = AuthService(
     mysql_password=app_config.MYSQL_PASSWORD,
     mysql_database=app_config.MYSQL_DATABASE,
     jwt_secret=app_config.SECRET_KEY,
-    session_expire_hours=int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', '480')) // 60 if os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES') else 24
+    session_expire_hours=int(os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES', '480')) // 60 if os.getenv('ACCESS_TOKEN_EXPIRE_MINUTES') else 24,
+    pool_size=app_config.MYSQL_POOL_SIZE
 )
@@ -39,6 +39,7 @@ class Config:
     MYSQL_PORT: int = int(os.getenv('MYSQL_PORT', '3306'))
     MYSQL_CONNECT_TIMEOUT: int = int(os.getenv('MYSQL_CONNECT_TIMEOUT', '10'))
     MYSQL_CHARSET: str = os.getenv('MYSQL_CHARSET', 'utf8mb4')
+    MYSQL_POOL_SIZE: int = int(os.getenv('MYSQL_POOL_SIZE', '10'))
     
     # Redis Configuration
     REDIS_HOST: str = os.getenv('REDIS_HOST', 'localhost')
@@ -58,6 +59,9 @@ class Config:
     OLLAMA_MAX_TOKENS: int = int(os.getenv('OLLAMA_MAX_TOKENS', '2000'))
     OLLAMA_TEMPERATURE: float = float(os.getenv('OLLAMA_TEMPERATURE', '0.7'))
     
+    # Embedding Configuration
+    ONNX_EMBEDDING_MODEL_DIR: Optional[str] = os.getenv('ONNX_EMBEDDING_MODEL_DIR')  # int8 MiniLM export for /search_vector
+    
     # Travel Agent Configuration
     TRAVEL_CHAT_SLA_SECONDS: int = int(os.getenv('TRAVEL_CHAT_SLA_SECONDS', '3'))
     TRAVEL_BATCH_SLA_SECONDS: int = int(os.getenv('TRAVEL_BATCH_SLA_SECONDS', '60'))
@@ -3,14 +3,119 @@ Forest ecosystem analysis agent
 Constraint: Analyzes forest-related queries with biodiversity and conservation insights
 Inherits from BaseAgent for consistent memory management and search functionality
 """
+import functools
 import logging
+import re
 from typing import Dict, Any, List
 from ..base_agent import BaseAgent, GraphState
 from ..memory import MemoryManager
 from ..location_extractor import location_extractor
 
+# Optional imports with fallbacks
+try:
+    import hyperscan
+except ImportError:
+    hyperscan = None
+
 logger = logging.getLogger(__name__)
 
+
+def _keyword_pattern(*keywords: str) -> "re.Pattern":
+    """Compile keywords into one substring alternation (same matches as `keyword in text`)"""
+    return re.compile("|".join(map(re.escape, keywords)))
+
+# Fallback response sections, in output order
+_FALLBACK_SECTIONS = (
+    (_keyword_pattern("biodiversity", "species", "wildlife"),
+     "🌿 Biodiversity Assessment: Forest ecosystems support diverse species communities. Analysis requires detailed species inventory and habitat evaluation."),
+    (_keyword_pattern("conservation", "protect", "preserve"),
+     "🛡️ Conservation Insights: Forest conservation strategies should focus on habitat preservation, sustainable management, and community engagement."),
+    (_keyword_pattern("deforestation", "logging", "clear"),
+     "⚠️ Environmental Impact: Deforestation has significant impacts on carbon storage, water cycles, and biodiversity. Sustainable alternatives should be considered."),
+    (_keyword_pattern("ecosystem", "health", "condition"),
+     "🌲 Ecosystem Health: Forest health indicators include canopy cover, soil quality, water resources, and species diversity."),
+)
+
+# (query term, label) tables for response summaries and biodiversity indicators
+_RESPONSE_ASPECT_LABELS = (
+    ("biodiversity", "Biodiversity Assessment"),
+    ("conservation", "Conservation Analysis"),
+    ("ecosystem", "Ecosystem Evaluation"),
+    ("impact", "Environmental Impact"),
+)
+
+_BIODIVERSITY_INDICATORS = (
+    ("species", "species_diversity"),
+    ("habitat", "habitat_quality"),
+    ("endemic", "endemic_species"),
+    ("endangered", "threatened_species"),
+)
+
+_ASPECT_KEYWORDS = (
+    ("biodiversity", ("biodiversity", "species", "wildlife", "flora", "fauna")),
+    ("conservation", ("conservation", "protect", "preserve", "save")),
+    ("deforestation", ("deforestation", "logging", "clear", "cut")),
+    ("ecosystem", ("ecosystem", "health", "condition", "balance")),
+    ("climate", ("climate", "carbon", "co2", "greenhouse")),
+    ("sustainability", ("sustainable", "management", "practice")),
+)
+
+_ASPECT_PATTERNS = tuple((aspect, _keyword_pattern(*keywords)) for aspect, keywords in _ASPECT_KEYWORDS)
+
+
+def _build_aspect_database():
+    """Compile every aspect keyword into one Hyperscan database; match id is the aspect index"""
+    if hyperscan is None:
+        return None
+    
+    try:
+        expressions, ids = [], []
+        for index, (_, keywords) in enumerate(_ASPECT_KEYWORDS):
+            for keyword in keywords:
+                expressions.append(re.escape(keyword).encode())
+                ids.append(index)
+        
+        database = hyperscan.Database()
+        database.compile(
+            expressions=expressions,
+            ids=ids,
+            elements=len(expressions),
+            flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(expressions)
+        )
+        return database
+    except Exception as e:
+        logger.warning(f"Hyperscan aspect database unavailable, using regex scan: {e}")
+        return None
+
+_ASPECT_DATABASE = _build_aspect_database()
+
+
+@functools.lru_cache(maxsize=1024)
+def _analysis_aspects(query: str) -> tuple:
+    """Forest analysis aspects matched in query, memoized on the raw query string"""
+    if _ASPECT_DATABASE is not None:
+        # Single DFA pass over the query; collect matched aspect indexes as a bitmask
+        matched = 0
+        
+        def on_match(index, start, end, flags, context):
+            nonlocal matched
+            matched |= 1 << index
+        
+        _ASPECT_DATABASE.scan(query.encode(), match_event_handler=on_match)
+        aspects = tuple(aspect for index, (aspect, _) in enumerate(_ASPECT_KEYWORDS) if matched >> index & 1)
+    else:
+        query_lower = query.lower()
+        aspects = tuple(aspect for aspect, pattern in _ASPECT_PATTERNS if pattern.search(query_lower))
+    
+    return aspects if aspects else ("general_forest_analysis",)
+
+_CONSERVATION_PRIORITY_PATTERNS = (
+    ("species_protection", _keyword_pattern("endangered", "threatened", "rare")),
+    ("habitat_connectivity", _keyword_pattern("habitat", "corridor", "fragmentation")),
+    ("old_growth_preservation", _keyword_pattern("old growth", "primary", "virgin")),
+    ("watershed_protection", _keyword_pattern("water", "watershed", "stream")),
+)
+
 class ForestAnalyzerAgent(BaseAgent):
     """Agent specialized in forest ecosystem analysis, biodiversity, and conservation"""
     
@@ -193,17 +298,9 @@ class ForestAnalyzerAgent(BaseAgent):
         # Analyze query for specific forest aspects
         query_lower = query.lower()
         
-        if any(word in query_lower for word in ['biodiversity', 'species', 'wildlife']):
-            response_parts.append("🌿 Biodiversity Assessment: Forest ecosystems support diverse species communities. Analysis requires detailed species inventory and habitat evaluation.")
-        
-        if any(word in query_lower for word in ['conservation', 'protect', 'preserve']):
-            response_parts.append("🛡️ Conservation Insights: Forest conservation strategies should focus on habitat preservation, sustainable management, and community engagement.")
-        
-        if any(word in query_lower for word in ['deforestation', 'logging', 'clear']):
-            response_parts.append("⚠️ Environmental Impact: Deforestation has significant impacts on carbon storage, water cycles, and biodiversity. Sustainable alternatives should be considered.")
-        
-        if any(word in query_lower for word in ['ecosystem', 'health', 'condition']):
-            response_parts.append("🌲 Ecosystem Health: Forest health indicators include canopy cover, soil quality, water resources, and species diversity.")
+        for pattern, section in _FALLBACK_SECTIONS:
+            if pattern.search(query_lower):
+                response_parts.append(section)
         
         # Add general forest analysis
         if len(response_parts) == 1:  # Only header added
@@ -234,16 +331,7 @@ class ForestAnalyzerAgent(BaseAgent):
         
         # Add forest analysis summary
         query_lower = query.lower()
-        analysis_aspects = []
-        
-        if 'biodiversity' in query_lower:
-            analysis_aspects.append("Biodiversity Assessment")
-        if 'conservation' in query_lower:
-            analysis_aspects.append("Conservation Analysis")
-        if 'ecosystem' in query_lower:
-            analysis_aspects.append("Ecosystem Evaluation")
-        if 'impact' in query_lower:
-            analysis_aspects.append("Environmental Impact")
+        analysis_aspects = [label for term, label in _RESPONSE_ASPECT_LABELS if term in query_lower]
         
         if analysis_aspects:
             enhanced_parts.append(f"**Analysis Aspects**: {', '.join(analysis_aspects)}\n")
@@ -262,23 +350,7 @@ class ForestAnalyzerAgent(BaseAgent):
         Returns:
             List of analysis aspects
         """
-        query_lower = query.lower()
-        aspects = []
-        
-        aspect_keywords = {
-            "biodiversity": ["biodiversity", "species", "wildlife", "flora", "fauna"],
-            "conservation": ["conservation", "protect", "preserve", "save"],
-            "deforestation": ["deforestation", "logging", "clear", "cut"],
-            "ecosystem": ["ecosystem", "health", "condition", "balance"],
-            "climate": ["climate", "carbon", "co2", "greenhouse"],
-            "sustainability": ["sustainable", "management", "practice"]
-        }
-        
-        for aspect, keywords in aspect_keywords.items():
-            if any(keyword in query_lower for keyword in keywords):
-                aspects.append(aspect)
-        
-        return aspects if aspects else ["general_forest_analysis"]
+        return list(_analysis_aspects(query))
     
     # Forest-specific analysis methods
     def analyze_biodiversity_factors(self, query: str, user_id: int) -> Dict[str, Any]:
@@ -297,17 +369,8 @@ class ForestAnalyzerAgent(BaseAgent):
             biodiversity_search = self.search_similar_content(f"biodiversity {query}", user_id)
             
             # Extract biodiversity indicators from query
-            indicators = []
             query_lower = query.lower()
-            
-            if 'species' in query_lower:
-                indicators.append("species_diversity")
-            if 'habitat' in query_lower:
-                indicators.append("habitat_quality")
-            if 'endemic' in query_lower:
-                indicators.append("endemic_species")
-            if 'endangered' in query_lower:
-                indicators.append("threatened_species")
+            indicators = [indicator for term, indicator in _BIODIVERSITY_INDICATORS if term in query_lower]
             
             return {
                 "biodiversity_indicators": indicators,
@@ -333,17 +396,10 @@ class ForestAnalyzerAgent(BaseAgent):
         """
         try:
             # Determine conservation priority factors
-            priority_factors = []
             query_lower = query.lower()
-            
-            if any(word in query_lower for word in ['endangered', 'threatened', 'rare']):
-                priority_factors.append("species_protection")
-            if any(word in query_lower for word in ['habitat', 'corridor', 'fragmentation']):
-                priority_factors.append("habitat_connectivity")
-            if any(word in query_lower for word in ['old growth', 'primary', 'virgin']):
-                priority_factors.append("old_growth_preservation")
-            if any(word in query_lower for word in ['water', 'watershed', 'stream']):
-                priority_factors.append("watershed_protection")
+            priority_factors = [
+                factor for factor, pattern in _CONSERVATION_PRIORITY_PATTERNS if pattern.search(query_lower)
+            ]
             
             # Search for related conservation efforts
             conservation_search = self.search_similar_content(f"conservation {query}", user_id)
@@ -5,6 +5,7 @@ Constraint: All agents inherit from this base class for consistent memory manage
 from abc import ABC, abstractmethod
 from typing import Dict, Any, List, Optional, TypedDict
 import logging
+import time
 from .memory import MemoryManager
 from .ollama_client import ollama_client, prompt_manager
 
@@ -25,6 +26,12 @@ class BaseAgent(ABC):
     Provides standardized memory management, search capabilities, and interface methods.
     """
     
+    # Circuit breaker: consecutive failures before preflight() rejects dispatch, and for how long
+    CIRCUIT_FAILURE_THRESHOLD = 3
+    CIRCUIT_RESET_SECONDS = 30.0
+    _consecutive_failures = 0
+    _circuit_open_until = 0.0
+    
     def __init__(self, memory_manager: MemoryManager, name: str = None):
         """
         Initialize base agent with memory management and search capabilities
@@ -208,6 +215,39 @@ class BaseAgent(ABC):
         except Exception as e:
             logger.warning(f"Failed to store vector embedding for {self.name}: {e}")
     
+    def store_interaction_with_embedding(self, user_id: int, query: str, response: str,
+                                         embedding_content: str, interaction_type: str = 'single',
+                                         embedding_metadata: Dict = None):
+        """
+        Store an interaction and its vector embedding in a single memory round-trip
+        
+        Args:
+            user_id: User identifier
+            query: User's query/input
+            response: Agent's response
+            embedding_content: Content to store as embedding
+            interaction_type: Type of interaction ('single', 'orchestrated', etc.)
+            embedding_metadata: Metadata stored with the embedding
+        """
+        if not hasattr(self.memory, 'store_batch'):
+            self.store_interaction(user_id, query, response, interaction_type)
+            self.store_vector_embedding(user_id, embedding_content, embedding_metadata)
+            return
+        
+        try:
+            self.memory.set_stm(user_id, self.name, query)
+            self.memory.store_batch([
+                {"kind": "ltm", "user_id": user_id, "agent_name": self.name,
+                 "query": query, "response": response},
+                {"kind": "interaction", "user_id": user_id, "agent_name": self.name,
+                 "query": query, "response": response, "interaction_type": interaction_type},
+                {"kind": "vector", "user_id": user_id, "agent_name": self.name,
+                 "content": embedding_content, "metadata": embedding_metadata or {}},
+            ])
+            logger.debug(f"{self.name} stored interaction batch for user {user_id}")
+        except Exception as e:
+            logger.warning(f"Failed to store interaction batch for {self.name}: {e}")
+    
     # ----------------------
     # SEARCH CAPABILITIES
     # ----------------------
@@ -367,6 +407,33 @@ class BaseAgent(ABC):
                 return False
         return True
     
+    def preflight(self, state: GraphState) -> bool:
+        """
+        Cheap check run before dispatching this agent
+        
+        Args:
+            state: State the agent would be called with
+            
+        Returns:
+            False if the state lacks required fields or the circuit breaker is open
+        """
+        if not state.get("question"):
+            return False
+        return time.monotonic() >= self._circuit_open_until
+    
+    def record_success(self):
+        """Close the circuit breaker after a successful run"""
+        self._consecutive_failures = 0
+        self._circuit_open_until = 0.0
+    
+    def record_failure(self):
+        """Count a failed run, opening the circuit breaker after repeated failures"""
+        self._consecutive_failures += 1
+        if self._consecutive_failures >= self.CIRCUIT_FAILURE_THRESHOLD:
+            self._circuit_open_until = time.monotonic() + self.CIRCUIT_RESET_SECONDS
+            logger.warning(f"{self.name} failed {self._consecutive_failures} times in a row, "
+                           f"skipping it for {self.CIRCUIT_RESET_SECONDS}s")
+    
     def handle_error(self, state: GraphState, error: Exception) -> GraphState:
         """
         Handle errors gracefully and return error state
@@ -380,6 +447,7 @@ class BaseAgent(ABC):
         """
         error_msg = f"{self.name} error: {str(error)}"
         logger.error(error_msg)
+        self.record_failure()
         
         return self.format_state_response(
             state,
@@ -0,0 +1,241 @@
+"""
+Embedding-based intent classifier for travel agent routing
+Maps a query to agents by nearest labeled exemplars instead of exact keyword hits
+"""
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Optional imports with fallbacks
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+logger = logging.getLogger(__name__)
+
+# Labeled exemplar queries per travel agent
+TRAVEL_INTENT_EXEMPLARS: Dict[str, Sequence[str]] = {
+    "TextTripAnalyzer": (
+        "I want to plan a trip to Japan next spring",
+        "Help me organize a two week vacation in Italy",
+        "We're thinking about a family holiday somewhere warm",
+        "Can you work out an itinerary for our honeymoon",
+    ),
+    "TripMoodDetector": (
+        "I'm so excited about this trip",
+        "I feel nervous about flying abroad alone",
+        "Honestly I'm worried this vacation will be a disaster",
+        "I'm not sure how I feel about traveling right now",
+    ),
+    "TripCommsCoach": (
+        "How do I ask the hotel for a late checkout",
+        "What should I say to the tour guide about my allergy",
+        "How can I communicate with locals if I don't speak the language",
+        "Help me write a message to the host about our arrival time",
+    ),
+    "TripBehaviorGuide": (
+        "What should I do next to book this trip",
+        "What's the next step after choosing a destination",
+        "How to decide between two itineraries",
+        "I can't make up my mind, what would you recommend",
+    ),
+    "TripCalmPractice": (
+        "I'm overwhelmed by all the travel planning",
+        "Airports make me anxious, how can I stay calm",
+        "I need to relax before the long flight",
+        "Planning this is stressing me out",
+    ),
+    "WeatherAgent": (
+        "What's the weather like in Lisbon in April",
+        "Will it rain during our week in London",
+        "Is the climate in Bali too hot in August",
+        "What temperature should I pack for in Iceland",
+    ),
+    "DiningAgent": (
+        "Where can we find good local food in Bangkok",
+        "Recommend vegetarian restaurants near our hotel",
+        "What dishes should I try in Mexico City",
+        "Any nice places to eat dinner by the harbor",
+    ),
+    "ScenicLocationFinderAgent": (
+        "Find beautiful viewpoints for sunset photos",
+        "What are the most scenic places to visit in Norway",
+        "Suggest quiet nature spots near the coast",
+        "Which destinations have stunning landscapes",
+    ),
+}
+
+
+class _PendingEmbedding:
+    """One queued text awaiting its embedding"""
+
+    __slots__ = ("text", "vector", "error", "lead", "ready")
+
+    def __init__(self, text: str):
+        self.text = text
+        self.vector = None
+        self.error = None
+        self.lead = False
+        self.ready = threading.Event()
+
+
+class EmbeddingBatcher:
+    """
+    Coalesces concurrent single-text embeddings into batched encode calls
+
+    While one batch is encoding, new texts queue up; when it finishes, the
+    oldest waiter encodes everything queued so far (up to max_batch_size) in a
+    single call. An idle batcher encodes a lone text immediately, so low-load
+    latency is unchanged.
+    """
+
+    def __init__(self, encode: Callable[[List[str]], Any], max_batch_size: int = 8):
+        """
+        Args:
+            encode: Batch encoder returning one row per input text
+            max_batch_size: Most texts encoded in one call
+        """
+        self._encode = encode
+        self.max_batch_size = max_batch_size
+        self._pending: List[_PendingEmbedding] = []
+        self._busy = False
+        self._lock = threading.Lock()
+
+    def embed(self, text: str):
+        """Embed text, sharing an encode call with concurrent callers"""
+        item = _PendingEmbedding(text)
+        with self._lock:
+            self._pending.append(item)
+            item.lead = not self._busy
+            self._busy = True
+
+        if not item.lead:
+            item.ready.wait()
+        if item.lead:
+            self._run_batch()
+
+        if item.error is not None:
+            raise item.error
+        return item.vector
+
+    def _run_batch(self):
+        """Encode the head of the queue and hand leadership to the next waiter"""
+        with self._lock:
+            batch = self._pending[:self.max_batch_size]
+            del self._pending[:self.max_batch_size]
+
+        try:
+            vectors = self._encode([item.text for item in batch])
+            for item, vector in zip(batch, vectors):
+                item.vector = vector
+        except Exception as e:
+            for item in batch:
+                item.error = e
+
+        with self._lock:
+            next_leader = self._pending[0] if self._pending else None
+            if next_leader is not None:
+                next_leader.lead = True
+            else:
+                self._busy = False
+
+        for item in batch:
+            item.lead = False
+            item.ready.set()
+        if next_leader is not None:
+            next_leader.ready.set()
+
+
+class IntentClassifier:
+    """Nearest-exemplar classifier over sentence embeddings"""
+
+    def __init__(self, embedding_model: Any, exemplars: Dict[str, Sequence[str]] = None,
+                 threshold: float = 0.45, top_k: int = 5):
+        """
+        Initialize the classifier; exemplar embeddings are computed on first use
+
+        Args:
+            embedding_model: Model exposing encode(str | list[str]) (e.g. SentenceTransformer)
+            exemplars: Mapping of agent name to example queries
+            threshold: Minimum cosine similarity for an exemplar to count
+            top_k: Number of nearest exemplars considered per query
+        """
+        self.embedding_model = embedding_model
+        self.exemplars = exemplars if exemplars is not None else TRAVEL_INTENT_EXEMPLARS
+        self.threshold = threshold
+        self.top_k = top_k
+        self._matrix = None
+        self._labels: List[str] = []
+        self._lock = threading.Lock()
+        self._batcher = EmbeddingBatcher(embedding_model.encode) if embedding_model is not None else None
+
+    @property
+    def available(self) -> bool:
+        return self.embedding_model is not None and np is not None
+
+    def _ensure_index(self) -> bool:
+        """Embed and L2-normalize all exemplars once"""
+        if self._matrix is not None:
+            return True
+        with self._lock:
+            if self._matrix is not None:
+                return True
+            try:
+                labels = [name for name, texts in self.exemplars.items() for _ in texts]
+                texts = [text for texts in self.exemplars.values() for text in texts]
+                matrix = np.asarray(self.embedding_model.encode(texts), dtype=np.float32)
+                matrix /= np.linalg.norm(matrix, axis=1, keepdims=True)
+                self._labels = labels
+                self._matrix = matrix
+                logger.info(f"Intent classifier indexed {len(labels)} exemplars")
+                return True
+            except Exception as e:
+                logger.error(f"Error building intent classifier index: {e}")
+                return False
+
+    def warm_up(self) -> bool:
+        """Build the exemplar index ahead of the first classify call; False when unavailable"""
+        return self.available and self._ensure_index()
+    
+    def embed(self, text: str):
+        """Return the L2-normalized embedding for text, or None when unavailable"""
+        if not self.available:
+            return None
+        try:
+            vector = np.asarray(self._batcher.embed(text), dtype=np.float32)
+            return vector / np.linalg.norm(vector)
+        except Exception as e:
+            logger.warning(f"Intent embedding failed: {e}")
+            return None
+
+    def classify(self, text: str, query_embedding=None) -> List[str]:
+        """
+        Return agent names for text, ordered by best exemplar similarity
+
+        Args:
+            text: Query text
+            query_embedding: Precomputed normalized embedding of text, if available
+
+        Returns:
+            Agent names whose exemplars pass the threshold; empty if none or unavailable
+        """
+        if not self.available or not self._ensure_index():
+            return []
+
+        if query_embedding is None:
+            query_embedding = self.embed(text)
+            if query_embedding is None:
+                return []
+
+        scores = self._matrix @ query_embedding
+        ranked = np.argsort(scores)[::-1][:self.top_k]
+
+        # Union of labels from the nearest exemplars, best match first
+        agents: Dict[str, None] = {}
+        for idx in ranked:
+            if scores[idx] < self.threshold:
+                break
+            agents.setdefault(self._labels[idx], None)
+        return list(agents)
@@ -6,7 +6,7 @@ Includes Weather Agent and Dining Agent for comprehensive functionality
 
 import json
 import logging
-from typing import Dict, Any, List, Optional, TypedDict, Annotated, Literal
+from typing import Dict, Any, Iterator, List, Optional, TypedDict, Annotated, Literal
 from datetime import datetime
 from pathlib import Path
 import operator
@@ -1337,71 +1337,110 @@ Provide helpful, accurate, and detailed responses based on your expertise. Be pr
             if not self.graph:
                 self.graph = self.build_langgraph()
             
-            # Get memory context
-            stm_context = self._get_stm_context(user_id)
-            ltm_context = self._get_ltm_context(user_id)
-            
-            # Initialize state
-            initial_state = MultiAgentState(
-                user=user,
-                user_id=user_id,
-                question=question,
-                current_agent="",
-                next_agent=None,
-                agent_chain=[],
-                routing_decision="",
-                response="",
-                agent_responses={},
-                final_response="",
-                context={
-                    "stm": stm_context,
-                    "ltm": ltm_context
-                },
-                memory={
-                    "interactions": [],
-                    "agent_data": {}
-                },
-                shared_data={},
-                edges_traversed=[],
-                execution_path=[],
-                timestamp=datetime.now().isoformat(),
-                weather_data=None,
-                dining_data=None,
-                location_data=None,
-                forest_data=None,
-                search_results=None
-            )
-            
             # Execute the graph
-            final_state = self.graph.invoke(initial_state)
+            final_state = self.graph.invoke(self._build_initial_state(user, user_id, question))
             
-            # Return comprehensive response
-            return {
-                "user": final_state.get("user"),
-                "user_id": final_state.get("user_id"),
-                "question": final_state.get("question"),
-                "agent": final_state.get("current_agent"),
-                "response": final_state.get("final_response", final_state.get("response", "")),
-                "agent_responses": final_state.get("agent_responses", {}),
-                "execution_path": final_state.get("execution_path", []),
-                "edges_traversed": final_state.get("edges_traversed", []),
-                "context": final_state.get("context", {}),
-                "timestamp": final_state.get("timestamp"),
-                "system_version": "2.0.0-multiagent",
-                "agents_involved": list(final_state.get("agent_responses", {}).keys())
-            }
+            return self._format_result(final_state)
             
         except Exception as e:
             logger.error(f"Multiagent system execution failed: {e}")
-            return {
-                "user": user,
-                "user_id": user_id,
-                "question": question,
-                "agent": "ErrorHandler",
-                "response": f"Multiagent system error: {str(e)}",
-                "error": True,
-                "timestamp": datetime.now().isoformat()
-            }
+            return self._format_error(user, user_id, question, e)
+    
+    def stream_request(self, user: str, user_id: int, question: str) -> Iterator[Dict[str, Any]]:
+        """
+        Run the multiagent graph, yielding each agent's response as its node completes
+        
+        Args:
+            user: Username
+            user_id: User identifier
+            question: User question
+            
+        Yields:
+            {"type": "agent", "agent", "response"} events, then one
+            {"type": "final", "result"} event carrying the process_request payload
+        """
+        try:
+            if not self.graph:
+                self.graph = self.build_langgraph()
+            
+            final_state = None
+            emitted = set()
+            for final_state in self.graph.stream(self._build_initial_state(user, user_id, question), stream_mode="values"):
+                for agent_id, response in final_state.get("agent_responses", {}).items():
+                    if agent_id not in emitted:
+                        emitted.add(agent_id)
+                        yield {"type": "agent", "agent": agent_id, "response": response}
+            
+            yield {"type": "final", "result": self._format_result(final_state or {})}
+            
+        except Exception as e:
+            logger.error(f"Multiagent system streaming failed: {e}")
+            yield {"type": "final", "result": self._format_error(user, user_id, question, e)}
+    
+    def _build_initial_state(self, user: str, user_id: int, question: str) -> MultiAgentState:
+        """Initial graph state with memory context for a request"""
+        # Get memory context
+        stm_context = self._get_stm_context(user_id)
+        ltm_context = self._get_ltm_context(user_id)
+        
+        return MultiAgentState(
+            user=user,
+            user_id=user_id,
+            question=question,
+            current_agent="",
+            next_agent=None,
+            agent_chain=[],
+            routing_decision="",
+            response="",
+            agent_responses={},
+            final_response="",
+            context={
+                "stm": stm_context,
+                "ltm": ltm_context
+            },
+            memory={
+                "interactions": [],
+                "agent_data": {}
+            },
+            shared_data={},
+            edges_traversed=[],
+            execution_path=[],
+            timestamp=datetime.now().isoformat(),
+            weather_data=None,
+            dining_data=None,
+            location_data=None,
+            forest_data=None,
+            search_results=None
+        )
+    
+    def _format_result(self, final_state: Dict[str, Any]) -> Dict[str, Any]:
+        """Return comprehensive response from the final graph state"""
+        return {
+            "user": final_state.get("user"),
+            "user_id": final_state.get("user_id"),
+            "question": final_state.get("question"),
+            "agent": final_state.get("current_agent"),
+            "response": final_state.get("final_response", final_state.get("response", "")),
+            "agent_responses": final_state.get("agent_responses", {}),
+            "execution_path": final_state.get("execution_path", []),
+            "edges_traversed": final_state.get("edges_traversed", []),
+            "context": final_state.get("context", {}),
+            "timestamp": final_state.get("timestamp"),
+            "system_version": "2.0.0-multiagent",
+            "agents_involved": list(final_state.get("agent_responses", {}).keys())
+        }
+    
+    def _format_error(self, user: str, user_id: int, question: str, error: Exception) -> Dict[str, Any]:
+        """Error payload returned when graph execution fails"""
+        return {
+            "user": user,
+            "user_id": user_id,
+            "question": question,
+            "agent": "ErrorHandler",
+            "response": f"Multiagent system error: {str(error)}",
+            "error": True,
+            "timestamp": datetime.now().isoformat()
+        }
     
     def _get_stm_context(self, user_id: int) -> Dict[str, Any]:
         """Get short-term memory context"""
@@ -1,6 +1,9 @@
 # memory.py
 import redis
 import mysql.connector
+from contextlib import contextmanager
+from mysql.connector import pooling
+from mysql.connector.errors import PoolError
 from datetime import datetime, timedelta
 import json
 import time
@@ -21,6 +24,10 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# How long a call waits for a pooled connection before giving up
+POOL_ACQUIRE_TIMEOUT_SECONDS = 5.0
+POOL_ACQUIRE_RETRY_SECONDS = 0.01
+
 class MemoryManager:
     def __init__(self):
         # Get connection parameters from config
@@ -35,13 +42,17 @@ class MemoryManager:
         except Exception as e:
             logger.error(f"❌ Redis connection failed: {e}")
 
-        # MySQL setup
+        # MySQL setup: agents share this manager across threads, so each call borrows its own connection
         try:
-            self.mysql_conn = mysql.connector.connect(**mysql_params)
-            logger.info("✅ MySQL connected successfully")
+            self.mysql_pool = pooling.MySQLConnectionPool(
+                pool_name="memory",
+                pool_size=Config.MYSQL_POOL_SIZE,
+                **mysql_params
+            )
+            logger.info(f"✅ MySQL connected successfully (pool of {Config.MYSQL_POOL_SIZE})")
         except Exception as e:
             logger.error(f"❌ MySQL connection failed: {e}")
-            self.mysql_conn = None
+            self.mysql_pool = None
         
         # Initialize sentence transformer for embeddings
         self.embedding_model = None
@@ -54,6 +65,34 @@ class MemoryManager:
         else:
             logger.info("📝 SentenceTransformer not available, vector search disabled")
 
+    @contextmanager
+    def _mysql_cursor(self, dictionary: bool = False):
+        """
+        Borrow a pooled connection for one call and yield a cursor on it
+        
+        mysql.connector raises PoolError at once when the pool is empty, so retry
+        briefly instead of failing calls during a burst.
+        """
+        if self.mysql_pool is None:
+            raise RuntimeError("MySQL is not connected")
+        
+        deadline = time.monotonic() + POOL_ACQUIRE_TIMEOUT_SECONDS
+        while True:
+            try:
+                conn = self.mysql_pool.get_connection()
+                break
+            except PoolError:
+                if time.monotonic() >= deadline:
+                    raise
+                time.sleep(POOL_ACQUIRE_RETRY_SECONDS)
+        
+        cursor = conn.cursor(dictionary=dictionary)
+        try:
+            yield cursor
+        finally:
+            cursor.close()
+            conn.close()
+
     # ----------------------
     # SHORT-TERM MEMORY (Redis)
     # ----------------------
@@ -86,42 +125,36 @@ class MemoryManager:
     # LONG-TERM MEMORY (MySQL)
     # ----------------------
     def store_ltm(self, user_id, agent_id, input_text, output_text):
-        cursor = self.mysql_conn.cursor()
-        cursor.execute(
-            """
-            INSERT INTO agent_history (user_id, agent_id, input_text, output_text)
-            VALUES (%s, %s, %s, %s)
-            """,
-            (user_id, agent_id, input_text, output_text)
-        )
-        self.mysql_conn.commit()
-        cursor.close()
+        with self._mysql_cursor() as cursor:
+            cursor.execute(
+                """
+                INSERT INTO agent_history (user_id, agent_id, input_text, output_text)
+                VALUES (%s, %s, %s, %s)
+                """,
+                (user_id, agent_id, input_text, output_text)
+            )
 
     def get_ltm_by_user(self, user_id):
-        cursor = self.mysql_conn.cursor(dictionary=True)
-        cursor.execute(
-            "SELECT * FROM ltm WHERE user_id = %s ORDER BY created_at DESC",
-            (user_id,)
-        )
-        results = cursor.fetchall()
-        cursor.close()
-        return results
+        with self._mysql_cursor(dictionary=True) as cursor:
+            cursor.execute(
+                "SELECT * FROM ltm WHERE user_id = %s ORDER BY created_at DESC",
+                (user_id,)
+            )
+            return cursor.fetchall()
 
 
 
     def get_ltm_by_agent(self, user_id, agent_id):
-        cursor = self.mysql_conn.cursor(dictionary=True)
-        cursor.execute(
-            """
-            SELECT * FROM agent_history
-            WHERE user_id = %s AND agent_id = %s
-            ORDER BY timestamp DESC
-            """,
-            (user_id, agent_id)
-        )
-        results = cursor.fetchall()
-        cursor.close()
-        return results
+        with self._mysql_cursor(dictionary=True) as cursor:
+            cursor.execute(
+                """
+                SELECT * FROM agent_history
+                WHERE user_id = %s AND agent_id = %s
+                ORDER BY timestamp DESC
+                """,
+                (user_id, agent_id)
+            )
+            return cursor.fetchall()
     
     # def get_all_stm_for_user(self, user_id):
     #     pattern = f"stm:{user_id}:*"
@@ -134,12 +167,11 @@ class MemoryManager:
     #     return result
     
     def set_ltm(self, user_id: str, agent_id: str, value: str):
-        cursor = self.mysql_conn.cursor()
-        cursor.execute(
-            "REPLACE INTO ltm (user_id, agent_id, value) VALUES (%s, %s, %s)",
-            (user_id, agent_id, value)
-        )
-        self.mysql_conn.commit()
+        with self._mysql_cursor() as cursor:
+            cursor.execute(
+                "REPLACE INTO ltm (user_id, agent_id, value) VALUES (%s, %s, %s)",
+                (user_id, agent_id, value)
+            )
     
     def get_recent_stm(self, user_id, agent_id=None, hours=1):
         """Get recent STM data for any user ID (supports dynamic users)"""
@@ -161,29 +193,27 @@ class MemoryManager:
 
     
     def get_recent_ltm(self, user_id, agent_id=None, days=1):
-        cursor = self.mysql_conn.cursor(dictionary=True)
         cutoff_query = """
             SELECT * FROM ltm
             WHERE user_id = %s AND created_at >= NOW() - INTERVAL %s DAY
         """
-        cursor.execute(cutoff_query, (user_id, days))
-        return cursor.fetchall()
+        with self._mysql_cursor(dictionary=True) as cursor:
+            cursor.execute(cutoff_query, (user_id, days))
+            return cursor.fetchall()
 
 
     
     def get_ltm_by_agent(self, user_id, agent_id):
-        cursor = self.mysql_conn.cursor(dictionary=True)
-        cursor.execute(
-            """
-            SELECT * FROM ltm
-            WHERE user_id = %s AND agent_id = %s
-            ORDER BY created_at DESC
-            """,
-            (user_id, agent_id)
-        )
-        results = cursor.fetchall()
-        cursor.close()
-        return results
+        with self._mysql_cursor(dictionary=True) as cursor:
+            cursor.execute(
+                """
+                SELECT * FROM ltm
+                WHERE user_id = %s AND agent_id = %s
+                ORDER BY created_at DESC
+                """,
+                (user_id, agent_id)
+            )
+            return cursor.fetchall()
 
     
     # ----------------------
@@ -192,19 +222,18 @@ class MemoryManager:
     def store_agent_memory(self, agent_name: str, user_id: int, memory_key: str, memory_value: str, metadata: Dict = None):
         """Store LTM grouped by agent name rather than user_id"""
         try:
-            cursor = self.mysql_conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO ltm_by_agent (agent_name, user_id, memory_key, memory_value, context_metadata)
-                VALUES (%s, %s, %s, %s, %s)
-                ON DUPLICATE KEY UPDATE 
-                memory_value = VALUES(memory_value),
-                context_metadata = VALUES(context_metadata),
-                updated_at = CURRENT_TIMESTAMP
-                """,
-                (agent_name, user_id, memory_key, memory_value, json.dumps(metadata or {}))
-            )
-            cursor.close()
+            with self._mysql_cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO ltm_by_agent (agent_name, user_id, memory_key, memory_value, context_metadata)
+                    VALUES (%s, %s, %s, %s, %s)
+                    ON DUPLICATE KEY UPDATE 
+                    memory_value = VALUES(memory_value),
+                    context_metadata = VALUES(context_metadata),
+                    updated_at = CURRENT_TIMESTAMP
+                    """,
+                    (agent_name, user_id, memory_key, memory_value, json.dumps(metadata or {}))
+                )
             logger.info(f"Stored memory for agent {agent_name}: {memory_key}")
         except Exception as e:
             logger.error(f"Error storing agent memory: {e}")
@@ -212,28 +241,26 @@ class MemoryManager:
     def get_agent_memories(self, agent_name: str, user_id: Optional[int] = None, limit: int = 50) -> List[Dict]:
         """Get memories for a specific agent, optionally filtered by user"""
         try:
-            cursor = self.mysql_conn.cursor(dictionary=True)
-            if user_id:
-                cursor.execute(
-                    """
-                    SELECT * FROM ltm_by_agent 
-                    WHERE agent_name = %s AND user_id = %s 
-                    ORDER BY updated_at DESC LIMIT %s
-                    """,
-                    (agent_name, user_id, limit)
-                )
-            else:
-                cursor.execute(
-                    """
-                    SELECT * FROM ltm_by_agent 
-                    WHERE agent_name = %s 
-                    ORDER BY updated_at DESC LIMIT %s
-                    """,
-                    (agent_name, limit)
-                )
-            results = cursor.fetchall()
-            cursor.close()
-            return results
+            with self._mysql_cursor(dictionary=True) as cursor:
+                if user_id:
+                    cursor.execute(
+                        """
+                        SELECT * FROM ltm_by_agent 
+                        WHERE agent_name = %s AND user_id = %s 
+                        ORDER BY updated_at DESC LIMIT %s
+                        """,
+                        (agent_name, user_id, limit)
+                    )
+                else:
+                    cursor.execute(
+                        """
+                        SELECT * FROM ltm_by_agent 
+                        WHERE agent_name = %s 
+                        ORDER BY updated_at DESC LIMIT %s
+                        """,
+                        (agent_name, limit)
+                    )
+                return cursor.fetchall()
         except Exception as e:
             logger.error(f"Error getting agent memories: {e}")
             return []
@@ -241,15 +268,14 @@ class MemoryManager:
     def store_interaction(self, user_id: int, agent_name: str, query: str, response: str, interaction_type: str = 'single'):
         """Store agent interaction with user"""
         try:
-            cursor = self.mysql_conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO agent_interactions (user_id, agent_name, query, response, interaction_type)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                (user_id, agent_name, query, response, interaction_type)
-            )
-            cursor.close()
+            with self._mysql_cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO agent_interactions (user_id, agent_name, query, response, interaction_type)
+                    VALUES (%s, %s, %s, %s, %s)
+                    """,
+                    (user_id, agent_name, query, response, interaction_type)
+                )
         except Exception as e:
             logger.error(f"Error storing interaction: {e}")
     
@@ -282,52 +308,120 @@ class MemoryManager:
             embedding = self.embedding_model.encode(content)
             embedding_json = json.dumps(embedding.tolist())
             
-            cursor = self.mysql_conn.cursor()
-            cursor.execute(
-                """
-                INSERT INTO vector_embeddings (user_id, agent_name, content, embedding, metadata)
-                VALUES (%s, %s, %s, %s, %s)
-                """,
-                (user_id, agent_name, content, embedding_json, json.dumps(metadata or {}))
-            )
-            cursor.close()
+            with self._mysql_cursor() as cursor:
+                cursor.execute(
+                    """
+                    INSERT INTO vector_embeddings (user_id, agent_name, content, embedding, metadata)
+                    VALUES (%s, %s, %s, %s, %s)
+                    """,
+                    (user_id, agent_name, content, embedding_json, json.dumps(metadata or {}))
+                )
             logger.info(f"Stored vector embedding for {agent_name}")
         except Exception as e:
             logger.error(f"Error storing vector embedding: {e}")
     
-    def similarity_search(self, query: str, user_id: int, agent_name: Optional[str] = None, limit: int = 5) -> List[Dict]:
-        """Perform similarity search on stored content"""
+    def store_batch(self, entries: List[Dict]) -> int:
+        """
+        Store several memory records on one pooled connection with one multi-row INSERT per table
+        
+        Args:
+            entries: Records tagged by "kind":
+                "ltm" (user_id, agent_name, query, response),
+                "interaction" (user_id, agent_name, query, response, interaction_type),
+                "vector" (user_id, agent_name, content, metadata)
+            
+        Returns:
+            Number of records written
+        """
+        ltm_rows, interaction_rows, vector_entries = [], [], []
+        for entry in entries:
+            kind = entry.get("kind")
+            if kind == "ltm":
+                ltm_rows.append((entry["user_id"], entry["agent_name"], entry["query"], entry["response"]))
+            elif kind == "interaction":
+                interaction_rows.append((
+                    entry["user_id"], entry["agent_name"], entry["query"], entry["response"],
+                    entry.get("interaction_type", "single")
+                ))
+            elif kind == "vector":
+                vector_entries.append(entry)
+            else:
+                logger.warning(f"Skipping memory entry with unknown kind: {kind}")
+        
+        vector_rows = []
+        if vector_entries and self.embedding_model:
+            # One encoder call for all embeddings in the batch
+            embeddings = self.embedding_model.encode([entry["content"] for entry in vector_entries])
+            vector_rows = [
+                (entry["user_id"], entry["agent_name"], entry["content"],
+                 json.dumps(embedding.tolist()), json.dumps(entry.get("metadata") or {}))
+                for entry, embedding in zip(vector_entries, embeddings)
+            ]
+        
+        try:
+            with self._mysql_cursor() as cursor:
+                if ltm_rows:
+                    cursor.executemany(
+                        """
+                        INSERT INTO agent_history (user_id, agent_id, input_text, output_text)
+                        VALUES (%s, %s, %s, %s)
+                        """,
+                        ltm_rows
+                    )
+                if interaction_rows:
+                    cursor.executemany(
+                        """
+                        INSERT INTO agent_interactions (user_id, agent_name, query, response, interaction_type)
+                        VALUES (%s, %s, %s, %s, %s)
+                        """,
+                        interaction_rows
+                    )
+                if vector_rows:
+                    cursor.executemany(
+                        """
+                        INSERT INTO vector_embeddings (user_id, agent_name, content, embedding, metadata)
+                        VALUES (%s, %s, %s, %s, %s)
+                        """,
+                        vector_rows
+                    )
+            return len(ltm_rows) + len(interaction_rows) + len(vector_rows)
+        except Exception as e:
+            logger.error(f"Error storing memory batch: {e}")
+            return 0
+    
+    def similarity_search(self, query: str, user_id: int, agent_name: Optional[str] = None, limit: int = 5,
+                          query_embedding=None) -> List[Dict]:
+        """Perform similarity search on stored content (pass query_embedding to skip re-encoding)"""
         if not self.embedding_model:
             logger.error("Embedding model not available")
             return []
         
         try:
             # Generate query embedding
-            query_embedding = self.embedding_model.encode(query)
+            if query_embedding is None:
+                query_embedding = self.embedding_model.encode(query)
             
             # Get stored embeddings
-            cursor = self.mysql_conn.cursor(dictionary=True)
-            if agent_name:
-                cursor.execute(
-                    """
-                    SELECT id, content, embedding, metadata, agent_name, created_at
-                    FROM vector_embeddings 
-                    WHERE user_id = %s AND agent_name = %s
-                    """,
-                    (user_id, agent_name)
-                )
-            else:
-                cursor.execute(
-                    """
-                    SELECT id, content, embedding, metadata, agent_name, created_at
-                    FROM vector_embeddings 
-                    WHERE user_id = %s
-                    """,
-                    (user_id,)
-                )
-            
-            stored_embeddings = cursor.fetchall()
-            cursor.close()
+            with self._mysql_cursor(dictionary=True) as cursor:
+                if agent_name:
+                    cursor.execute(
+                        """
+                        SELECT id, content, embedding, metadata, agent_name, created_at
+                        FROM vector_embeddings 
+                        WHERE user_id = %s AND agent_name = %s
+                        """,
+                        (user_id, agent_name)
+                    )
+                else:
+                    cursor.execute(
+                        """
+                        SELECT id, content, embedding, metadata, agent_name, created_at
+                        FROM vector_embeddings 
+                        WHERE user_id = %s
+                        """,
+                        (user_id,)
+                    )
+                stored_embeddings = cursor.fetchall()
             
             # Calculate similarities
             results = []
@@ -362,30 +456,28 @@ class MemoryManager:
         similar_content = self.similarity_search(query, user_id, agent_name)
         
         # Also get recent interactions for context
-        cursor = self.mysql_conn.cursor(dictionary=True)
-        if agent_name:
-            cursor.execute(
-                """
-                SELECT agent_name, query, response, timestamp 
-                FROM agent_interactions 
-                WHERE user_id = %s AND agent_name = %s 
-                ORDER BY timestamp DESC LIMIT 10
-                """,
-                (user_id, agent_name)
-            )
-        else:
-            cursor.execute(
-                """
-                SELECT agent_name, query, response, timestamp 
-                FROM agent_interactions 
-                WHERE user_id = %s 
-                ORDER BY timestamp DESC LIMIT 10
-                """,
-                (user_id,)
-            )
-        
-        recent_interactions = cursor.fetchall()
-        cursor.close()
+        with self._mysql_cursor(dictionary=True) as cursor:
+            if agent_name:
+                cursor.execute(
+                    """
+                    SELECT agent_name, query, response, timestamp 
+                    FROM agent_interactions 
+                    WHERE user_id = %s AND agent_name = %s 
+                    ORDER BY timestamp DESC LIMIT 10
+                    """,
+                    (user_id, agent_name)
+                )
+            else:
+                cursor.execute(
+                    """
+                    SELECT agent_name, query, response, timestamp 
+                    FROM agent_interactions 
+                    WHERE user_id = %s 
+                    ORDER BY timestamp DESC LIMIT 10
+                    """,
+                    (user_id,)
+                )
+            recent_interactions = cursor.fetchall()
         
         return {
             "query": query,
@@ -2,6 +2,7 @@
 Improved Ollama integration for local LLM responses
 Enhanced with better timeout handling, retry logic, and connection pooling
 """
+import asyncio
 import requests
 import json
 import logging
@@ -23,6 +24,18 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Optional async HTTP client; HTTP/2 needs the h2 extra
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+try:
+    import h2  # noqa: F401
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
 # Optional mock fallback
 try:
     from core.mock_ollama_client import mock_ollama_client as MOCK_OLLAMA_CLIENT
@@ -47,9 +60,17 @@ class ImprovedOllamaClient:
         self.max_retries = config('OLLAMA_MAX_RETRIES', default=3, cast=int)
         self.retry_delay = config('OLLAMA_RETRY_DELAY', default=2.0, cast=float)
         
+        # Availability probe results are reused for this long instead of pinging per request
+        self.availability_ttl = config('OLLAMA_AVAILABILITY_TTL', default=30.0, cast=float)
+        self._available = None
+        self._available_checked_at = 0.0
+        
         # Initialize session with connection pooling and retry strategy
         self.session = self._create_session()
         
+        # Shared async client, created on first use inside the running event loop
+        self._async_client = None
+        
         logger.info(f"Initialized OllamaClient with timeout={self.timeout}s, retries={self.max_retries}")
     
     def _create_session(self) -> requests.Session:
@@ -119,8 +140,20 @@ class ImprovedOllamaClient:
         
         raise last_exception
     
-    def is_available(self) -> bool:
-        """Check if Ollama server is available"""
+    def is_available(self, force: bool = False) -> bool:
+        """
+        Check if Ollama server is available
+        
+        Args:
+            force: Bypass the cached result and probe the server
+            
+        Returns:
+            True if the server answered the last probe
+        """
+        now = time.monotonic()
+        if not force and self._available is not None and now - self._available_checked_at < self.availability_ttl:
+            return self._available
+        
         try:
             response = self.session.get(
                 f"{self.base_url}/api/tags", 
@@ -129,10 +162,19 @@ class ImprovedOllamaClient:
             is_available = response.status_code == 200
             if is_available:
                 logger.debug("Ollama server is available")
-            return is_available
         except Exception as e:
             logger.warning(f"Ollama server not available: {e}")
-            return False
+            is_available = False
+        
+        self._available = is_available
+        self._available_checked_at = now
+        return is_available
+    
+    def warmup(self) -> bool:
+        """Open a pooled keep-alive connection to the server ahead of the first request"""
+        available = self.is_available(force=True)
+        logger.info(f"Ollama warmup {'succeeded' if available else 'failed'} for {self.base_url}")
+        return available
     
     def list_models(self) -> List[Dict[str, Any]]:
         """List available models"""
@@ -328,6 +370,66 @@ class ImprovedOllamaClient:
             self.session.close()
             logger.debug("Ollama session closed")
 
+    def _get_async_client(self):
+        """Return the shared pooled httpx.AsyncClient, creating it on first use"""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=httpx.Timeout(self.read_timeout, connect=self.connection_timeout),
+                limits=httpx.Limits(max_keepalive_connections=32, max_connections=64),
+                http2=HTTP2_AVAILABLE,
+                headers={'User-Agent': 'ImprovedOllamaClient/2.0'}
+            )
+        return self._async_client
+    
+    async def ais_available(self, force: bool = False) -> bool:
+        """
+        Async variant of is_available over the shared async client
+        
+        Args:
+            force: Bypass the cached result and probe the server
+            
+        Returns:
+            True if the server answered the last probe
+        """
+        if httpx is None:
+            return await asyncio.to_thread(self.is_available, force)
+        
+        now = time.monotonic()
+        if not force and self._available is not None and now - self._available_checked_at < self.availability_ttl:
+            return self._available
+        
+        try:
+            response = await self._get_async_client().get("/api/tags", timeout=httpx.Timeout(10, connect=5))
+            is_available = response.status_code == 200
+        except Exception as e:
+            logger.warning(f"Ollama server not available: {e}")
+            is_available = False
+        
+        self._available = is_available
+        self._available_checked_at = now
+        return is_available
+    
+    async def alist_models(self) -> List[Dict[str, Any]]:
+        """Async variant of list_models"""
+        if httpx is None:
+            return await asyncio.to_thread(self.list_models)
+        
+        try:
+            response = await self._get_async_client().get("/api/tags")
+            response.raise_for_status()
+            return response.json().get('models', [])
+        except Exception as e:
+            logger.error(f"Error listing models: {e}")
+            return []
+    
+    async def aclose(self):
+        """Close the shared async client"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
+            logger.debug("Ollama async client closed")
+    
     def __del__(self):
         """Cleanup on destruction"""
         try:
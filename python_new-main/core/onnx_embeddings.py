@@ -0,0 +1,120 @@
+"""
+ONNX Runtime sentence embeddings
+Int8-quantized MiniLM served through ONNX Runtime as a drop-in for HuggingFaceEmbeddings
+
+Build the model once with:
+    python -m core.onnx_embeddings <output_dir>
+"""
+
+import logging
+import os
+import sys
+from typing import List
+
+# Optional imports with fallbacks
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+try:
+    import onnxruntime as ort
+except ImportError:
+    ort = None
+
+try:
+    from transformers import AutoTokenizer
+except ImportError:
+    AutoTokenizer = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MODEL_NAME = "sentence-transformers/all-MiniLM-L6-v2"
+QUANTIZED_MODEL_FILE = "model.int8.onnx"
+
+
+def onnx_embeddings_available() -> bool:
+    """True when ONNX Runtime, the tokenizer and NumPy are all installed"""
+    return ort is not None and AutoTokenizer is not None and np is not None
+
+
+class OnnxSentenceEmbeddings:
+    """Mean-pooled, L2-normalized sentence embeddings from a quantized ONNX model"""
+
+    def __init__(self, model_dir: str, model_file: str = QUANTIZED_MODEL_FILE, batch_size: int = 32):
+        """
+        Load the tokenizer and ONNX session
+
+        Args:
+            model_dir: Directory produced by export_quantized_model
+            model_file: ONNX file inside model_dir to run
+            batch_size: Texts per inference call
+        """
+        self.tokenizer = AutoTokenizer.from_pretrained(model_dir)
+        self.session = ort.InferenceSession(
+            os.path.join(model_dir, model_file),
+            providers=["CPUExecutionProvider"]
+        )
+        self.batch_size = batch_size
+        self._input_names = {i.name for i in self.session.get_inputs()}
+        logger.info(f"Loaded ONNX embedding model from {model_dir}")
+
+    def encode(self, texts: List[str]):
+        """Embed texts in batches, returning a float32 (len(texts), dim) matrix"""
+        batches = []
+        for start in range(0, len(texts), self.batch_size):
+            tokens = self.tokenizer(
+                texts[start:start + self.batch_size],
+                padding=True,
+                truncation=True,
+                return_tensors="np"
+            )
+            feed = {name: tokens[name].astype(np.int64) for name in self._input_names if name in tokens}
+            hidden = self.session.run(None, feed)[0]
+
+            # Mean pooling over real tokens, then L2 normalization
+            mask = tokens["attention_mask"][..., None].astype(np.float32)
+            pooled = (hidden * mask).sum(axis=1) / np.clip(mask.sum(axis=1), 1e-9, None)
+            pooled /= np.clip(np.linalg.norm(pooled, axis=1, keepdims=True), 1e-12, None)
+            batches.append(pooled.astype(np.float32))
+        return np.concatenate(batches) if batches else np.zeros((0, 0), dtype=np.float32)
+
+    def embed_documents(self, texts: List[str]) -> List[List[float]]:
+        """Embed a list of documents"""
+        return self.encode(list(texts)).tolist()
+
+    def embed_query(self, text: str) -> List[float]:
+        """Embed a single query"""
+        return self.encode([text])[0].tolist()
+
+
+def export_quantized_model(output_dir: str, model_name: str = DEFAULT_MODEL_NAME) -> str:
+    """
+    Export a sentence-transformers model to ONNX and quantize its weights to int8
+
+    Args:
+        output_dir: Directory for the tokenizer and ONNX files
+        model_name: Hugging Face model to export
+
+    Returns:
+        Path of the quantized ONNX model
+    """
+    from optimum.onnxruntime import ORTModelForFeatureExtraction
+    from onnxruntime.quantization import QuantType, quantize_dynamic
+
+    model = ORTModelForFeatureExtraction.from_pretrained(model_name, export=True)
+    model.save_pretrained(output_dir)
+    AutoTokenizer.from_pretrained(model_name).save_pretrained(output_dir)
+
+    quantized_path = os.path.join(output_dir, QUANTIZED_MODEL_FILE)
+    quantize_dynamic(os.path.join(output_dir, "model.onnx"), quantized_path, weight_type=QuantType.QInt8)
+    logger.info(f"Quantized embedding model written to {quantized_path}")
+    return quantized_path
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    if len(sys.argv) != 2:
+        print("Usage: python -m core.onnx_embeddings <output_dir>")
+        sys.exit(1)
+    print(export_quantized_model(sys.argv[1]))
@@ -4,6 +4,8 @@ Implements session-based STM structure for Travel Assistant
 """
 
 import redis
+import base64
+import hashlib
 import json
 import time
 import uuid
@@ -12,8 +14,41 @@ from typing import Dict, List, Optional, Any
 import logging
 from core.memory import MemoryManager
 
+# Optional imports with fallbacks
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 logger = logging.getLogger(__name__)
 
+# Chat semantic response cache: newest entries per (user, context) kept briefly in Redis
+CHAT_CACHE_MIN_SIMILARITY = 0.85  # cosine distance < 0.15
+CHAT_CACHE_TTL = 3600
+CHAT_CACHE_MAX_ENTRIES = 20
+
+# Short-lived cache of the resolved /travel/profile payload
+PROFILE_RESPONSE_TTL = 180
+PROFILE_LOCK_TTL = 5
+
+# How long finished batch jobs stay pollable
+BATCH_JOB_TTL = 24 * 3600
+
+# Marks a user's stm:sessions index as backfilled from sessions written before it existed
+SESSION_INDEX_BACKFILL_TTL = 30 * 24 * 3600
+
+# Turns live for 30 days as one JSON string each, so a session's turns come back in a single MGET
+TURN_TTL = 30 * 24 * 3600
+
+
+def _turn_key(user_id: int, turn_id: str) -> str:
+    return f"stm:turn:v2:{user_id}:{turn_id}"
+
+
+def _legacy_turn_key(user_id: int, turn_id: str) -> str:
+    # Hash-per-turn layout written before turns became JSON blobs
+    return f"stm:turn:{user_id}:{turn_id}"
+
 
 class TravelMemoryManager(MemoryManager):
     """Extended memory manager with travel-specific session management"""
@@ -64,6 +99,10 @@ class TravelMemoryManager(MemoryManager):
             # Initialize turn list
             self.redis_conn.expire(f"stm:sess:{user_id}:{session_id}:turns", 30 * 24 * 3600)
             
+            # Index the session for listing (score = last activity)
+            self.redis_conn.zadd(f"stm:sessions:{user_id}", {session_id: now.timestamp()})
+            self.redis_conn.expire(f"stm:sessions:{user_id}", 30 * 24 * 3600)
+            
             logger.info(f"Started new {mode} session {session_id} for user {user_id}")
             return session_id
             
@@ -85,23 +124,31 @@ class TravelMemoryManager(MemoryManager):
                 "role": role,  # "user", "assistant", or "agent:AgentName"
                 "text": text,
                 "ts": datetime.now().isoformat(),
-                "metadata": json.dumps(metadata or {})
+                "metadata": metadata or {}
             }
             
+            # All writes for the turn go out in one round-trip
+            pipe = self.redis_conn.pipeline(transaction=False)
+            
             # Store turn data
-            self.redis_conn.hmset(f"stm:turn:{user_id}:{turn_id}", turn_data)
-            self.redis_conn.expire(f"stm:turn:{user_id}:{turn_id}", 30 * 24 * 3600)
+            pipe.set(_turn_key(user_id, turn_id), json.dumps(turn_data), ex=TURN_TTL)
             
             # Add to session turn list
-            self.redis_conn.lpush(f"stm:sess:{user_id}:{session_id}:turns", turn_id)
+            pipe.lpush(f"stm:sess:{user_id}:{session_id}:turns", turn_id)
             
             # Update session metadata
-            self.redis_conn.hset(f"stm:sess:{user_id}:{session_id}", "last_at", datetime.now().isoformat())
-            self.redis_conn.hincrby(f"stm:sess:{user_id}:{session_id}", "turn_count", 1)
+            pipe.hset(f"stm:sess:{user_id}:{session_id}", "last_at", datetime.now().isoformat())
+            pipe.hincrby(f"stm:sess:{user_id}:{session_id}", "turn_count", 1)
             
             # Add to recent index
-            self.redis_conn.zadd(f"stm:recent:{user_id}", {turn_id: time.time()})
-            self.redis_conn.zremrangebyrank(f"stm:recent:{user_id}", 0, -201)  # Keep last 200
+            now_ts = time.time()
+            pipe.zadd(f"stm:recent:{user_id}", {turn_id: now_ts})
+            pipe.zremrangebyrank(f"stm:recent:{user_id}", 0, -201)  # Keep last 200
+            
+            # Session index
+            pipe.zadd(f"stm:sessions:{user_id}", {session_id: now_ts})
+            
+            pipe.execute()
             
             logger.debug(f"Added turn {turn_id} to session {session_id}")
             return turn_id
@@ -120,15 +167,14 @@ class TravelMemoryManager(MemoryManager):
             # Get recent turns
             turn_ids = self.redis_conn.lrange(f"stm:sess:{user_id}:{session_id}:turns", 0, turn_limit - 1)
             
-            turns = []
-            for turn_id in turn_ids:
-                turn_data = self.redis_conn.hgetall(f"stm:turn:{user_id}:{turn_id}")
-                if turn_data:
-                    turn_data["metadata"] = json.loads(turn_data.get("metadata", "{}"))
-                    turns.append(turn_data)
-            
-            # Get session metadata
-            session_data = self.get_session_metadata(user_id, session_id)
+            # Turn bodies and session metadata in one round-trip
+            pipe = self.redis_conn.pipeline(transaction=False)
+            if turn_ids:
+                pipe.mget([_turn_key(user_id, turn_id) for turn_id in turn_ids])
+            pipe.hgetall(f"stm:sess:{user_id}:{session_id}")
+            results = pipe.execute()
+            session_data = results[-1]
+            turns = self._decode_turns(user_id, turn_ids, results[0]) if turn_ids else []
             
             return {
                 "session_id": session_id,
@@ -141,6 +187,39 @@ class TravelMemoryManager(MemoryManager):
             logger.error(f"Error getting session context: {e}")
             return {"turns": [], "session_id": None}
     
+    def _get_turns(self, user_id: int, turn_ids: List[str]) -> List[Dict[str, Any]]:
+        """Fetch turns in list order with one MGET"""
+        if not turn_ids:
+            return []
+        blobs = self.redis_conn.mget([_turn_key(user_id, turn_id) for turn_id in turn_ids])
+        return self._decode_turns(user_id, turn_ids, blobs)
+    
+    def _decode_turns(self, user_id: int, turn_ids: List[str], blobs: List[Optional[str]]) -> List[Dict[str, Any]]:
+        """
+        Decode MGET results into turn dicts, skipping expired turns
+        
+        Turns missing from the blob layout are looked up once, pipelined, in the
+        legacy hash layout so sessions written before the switch still read back.
+        """
+        turns: List[Optional[Dict[str, Any]]] = [None] * len(turn_ids)
+        legacy = []
+        for i, blob in enumerate(blobs):
+            if blob is not None:
+                turns[i] = json.loads(blob)
+            else:
+                legacy.append(i)
+        
+        if legacy:
+            pipe = self.redis_conn.pipeline(transaction=False)
+            for i in legacy:
+                pipe.hgetall(_legacy_turn_key(user_id, turn_ids[i]))
+            for i, turn_data in zip(legacy, pipe.execute()):
+                if turn_data:
+                    turn_data["metadata"] = json.loads(turn_data.get("metadata", "{}"))
+                    turns[i] = turn_data
+        
+        return [turn for turn in turns if turn is not None]
+    
     def get_session_metadata(self, user_id: int, session_id: str) -> Optional[Dict[str, Any]]:
         """Get session metadata"""
         try:
@@ -149,6 +228,95 @@ class TravelMemoryManager(MemoryManager):
             logger.error(f"Error getting session metadata: {e}")
             return None
     
+    def list_sessions(self, user_id: int, limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        List the user's most recently active sessions
+        
+        Args:
+            user_id: User identifier
+            limit: Maximum number of sessions
+            
+        Returns:
+            Session summaries, most recent activity first
+        """
+        try:
+            self._backfill_session_index(user_id)
+            index_key = f"stm:sessions:{user_id}"
+            
+            # Page through the index until enough live sessions are found; entries whose
+            # session hash has expired are dropped so they stop taking up slots
+            sessions, expired = [], []
+            start = 0
+            while len(sessions) < limit:
+                session_ids = self.redis_conn.zrevrange(index_key, start, start + limit - 1)
+                if not session_ids:
+                    break
+                start += len(session_ids)
+                
+                pipe = self.redis_conn.pipeline(transaction=False)
+                for session_id in session_ids:
+                    pipe.hgetall(f"stm:sess:{user_id}:{session_id}")
+                
+                for session_id, session_data in zip(session_ids, pipe.execute()):
+                    if not session_data:
+                        expired.append(session_id)
+                    elif len(sessions) < limit:
+                        sessions.append({
+                            "session_id": session_id,
+                            "title": session_data.get("title", "Travel Planning"),
+                            "mode": session_data.get("mode", "chat"),
+                            "started_at": session_data.get("started_at"),
+                            "turn_count": int(session_data.get("turn_count", 0))
+                        })
+            
+            if expired:
+                self.redis_conn.zrem(index_key, *expired)
+            return sessions
+            
+        except Exception as e:
+            logger.error(f"Error listing sessions: {e}")
+            return []
+    
+    def _backfill_session_index(self, user_id: int):
+        """
+        Index sessions created before the stm:sessions index existed
+        
+        Scans the user's session hashes once per SESSION_INDEX_BACKFILL_TTL; later
+        sessions are indexed as they are created and updated.
+        
+        Args:
+            user_id: User identifier
+        """
+        if not self.redis_conn.set(f"stm:sessions:backfilled:{user_id}", 1,
+                                   nx=True, ex=SESSION_INDEX_BACKFILL_TTL):
+            return
+        
+        prefix = f"stm:sess:{user_id}:"
+        session_ids = [
+            key[len(prefix):]
+            for key in self.redis_conn.scan_iter(match=f"{prefix}*", count=500)
+            if not key.endswith(":turns")
+        ]
+        if not session_ids:
+            return
+        
+        pipe = self.redis_conn.pipeline(transaction=False)
+        for session_id in session_ids:
+            pipe.hmget(f"stm:sess:{user_id}:{session_id}", "last_at", "started_at")
+        
+        # Score like the live index: last activity, falling back to the start time
+        scores = {}
+        for session_id, (last_at, started_at) in zip(session_ids, pipe.execute()):
+            try:
+                scores[session_id] = datetime.fromisoformat(last_at or started_at).timestamp()
+            except (TypeError, ValueError):
+                scores[session_id] = 0
+        
+        # NX keeps newer scores already written by add_turn
+        self.redis_conn.zadd(f"stm:sessions:{user_id}", scores, nx=True)
+        self.redis_conn.expire(f"stm:sessions:{user_id}", 30 * 24 * 3600)
+        logger.info(f"Backfilled session index for user {user_id} with {len(scores)} sessions")
+    
     def _is_session_active(self, session_data: Dict[str, Any]) -> bool:
         """Check if session is still active (not timed out)"""
         try:
@@ -176,6 +344,59 @@ class TravelMemoryManager(MemoryManager):
             logger.debug(f"Cached UTP for user {user_id}")
         except Exception as e:
             logger.error(f"Error caching UTP: {e}")
+        self.invalidate_profile_response(user_id)
+    
+    # Profile response cache (cache-aside for /travel/profile)
+    def get_cached_profile_response(self, user_id: int) -> Optional[Dict[str, Any]]:
+        """Return the cached /travel/profile payload, or None on a miss"""
+        try:
+            profile_json = self.redis_conn.get(f"utp:v1:{user_id}")
+            return json.loads(profile_json) if profile_json else None
+        except Exception as e:
+            logger.warning(f"Error reading profile response cache: {e}")
+            return None
+    
+    def cache_profile_response(self, user_id: int, utp: Dict[str, Any], only_if_missing: bool = False):
+        """
+        Cache the resolved /travel/profile payload for PROFILE_RESPONSE_TTL seconds
+        
+        Args:
+            user_id: User whose profile is cached
+            utp: Resolved User Travel Profile
+            only_if_missing: Keep an existing entry (loaders must not overwrite a newer update)
+        """
+        try:
+            self.redis_conn.set(f"utp:v1:{user_id}", json.dumps(utp), ex=PROFILE_RESPONSE_TTL, nx=only_if_missing)
+        except Exception as e:
+            logger.warning(f"Error caching profile response: {e}")
+    
+    def invalidate_profile_response(self, user_id: int):
+        """Drop the cached /travel/profile payload after the profile changes"""
+        try:
+            self.redis_conn.delete(f"utp:v1:{user_id}")
+        except Exception as e:
+            logger.warning(f"Error invalidating profile response cache: {e}")
+    
+    def acquire_profile_lock(self, user_id: int) -> bool:
+        """
+        Take the short-lived rebuild lock for a user's profile response
+        
+        Returns:
+            True if this caller should rebuild the cache entry; also True when
+            Redis is unavailable so the caller is never blocked
+        """
+        try:
+            return bool(self.redis_conn.set(f"utp:v1:lock:{user_id}", "1", nx=True, ex=PROFILE_LOCK_TTL))
+        except Exception as e:
+            logger.warning(f"Error acquiring profile lock: {e}")
+            return True
+    
+    def release_profile_lock(self, user_id: int):
+        """Release the rebuild lock taken by acquire_profile_lock"""
+        try:
+            self.redis_conn.delete(f"utp:v1:lock:{user_id}")
+        except Exception as e:
+            logger.warning(f"Error releasing profile lock: {e}")
     
     def get_weekly_digest(self, user_id: int) -> Dict[str, Any]:
         """Get weekly digest from cache"""
@@ -197,6 +418,137 @@ class TravelMemoryManager(MemoryManager):
         except Exception as e:
             logger.error(f"Error caching weekly digest: {e}")
     
+    # Batch job table
+    def create_batch_job(self, user_id: int) -> str:
+        """Register a queued batch job owned by user_id and return its id"""
+        job_id = str(uuid.uuid4())
+        key = f"batch:job:{job_id}"
+        pipe = self.redis_conn.pipeline(transaction=False)
+        pipe.hset(key, mapping={
+            "status": "queued",
+            "user_id": str(user_id),
+            "created_at": datetime.now().isoformat()
+        })
+        pipe.expire(key, BATCH_JOB_TTL)
+        pipe.execute()
+        return job_id
+    
+    def update_batch_job(self, job_id: str, status: str, result: Dict[str, Any] = None, error: str = None):
+        """
+        Record a batch job's status, and its result or error once finished
+        
+        Args:
+            job_id: Job id from create_batch_job
+            status: One of queued, running, done, failed
+            result: Response payload for a finished job
+            error: Failure message for a failed job
+        """
+        try:
+            fields = {"status": status, "updated_at": datetime.now().isoformat()}
+            if result is not None:
+                fields["result"] = json.dumps(result)
+            if error is not None:
+                fields["error"] = error
+            self.redis_conn.hset(f"batch:job:{job_id}", mapping=fields)
+        except Exception as e:
+            logger.error(f"Error updating batch job {job_id}: {e}")
+    
+    def get_batch_job(self, job_id: str) -> Optional[Dict[str, Any]]:
+        """Return a batch job's fields with its result decoded, or None if unknown or expired"""
+        try:
+            job = self.redis_conn.hgetall(f"batch:job:{job_id}")
+            if not job:
+                return None
+            if "result" in job:
+                job["result"] = json.loads(job["result"])
+            return job
+        except Exception as e:
+            logger.error(f"Error getting batch job {job_id}: {e}")
+            return None
+    
+    # Semantic response cache (chat mode)
+    @staticmethod
+    def chat_context_fingerprint(session_context: Dict[str, Any], utp: Dict[str, Any],
+                                 weekly_digest: Dict[str, Any]) -> str:
+        """
+        Hash the inputs besides the query that shape a chat response
+        
+        Only turn roles and texts count, so fresh sessions for the same
+        profile share cache entries while follow-ups in a session do not.
+        """
+        turns = [(turn.get("role"), turn.get("text")) for turn in (session_context or {}).get("turns", [])]
+        payload = json.dumps([turns, utp or {}, weekly_digest or {}], sort_keys=True, default=str)
+        return hashlib.blake2b(payload.encode("utf-8"), digest_size=16).hexdigest()
+    
+    def _chat_query_vector(self, text: str, query_embedding=None):
+        """L2-normalized float32 query embedding, or None when embeddings are unavailable"""
+        if query_embedding is None:
+            if not self.embedding_model:
+                return None
+            query_embedding = self.embedding_model.encode(text)
+        vector = np.asarray(query_embedding, dtype=np.float32)
+        return vector / np.linalg.norm(vector)
+    
+    def get_cached_chat_response(self, user_id: int, text: str, context_key: str,
+                                 query_embedding=None) -> Optional[Dict[str, Any]]:
+        """
+        Return a previous chat response for a near-duplicate query in the same context, if any
+        
+        Args:
+            user_id: User identifier
+            text: Query text
+            context_key: chat_context_fingerprint of the request
+            query_embedding: Precomputed embedding of text, if available
+        """
+        if np is None:
+            return None
+        try:
+            entries = self.redis_conn.lrange(f"chat:cache:v1:{user_id}:{context_key}", 0, -1)
+            if not entries:
+                return None
+            vector = self._chat_query_vector(text, query_embedding)
+            if vector is None:
+                return None
+            
+            best, best_similarity = None, CHAT_CACHE_MIN_SIMILARITY
+            for raw in entries:
+                entry = json.loads(raw)
+                cached_vector = np.frombuffer(base64.b64decode(entry["embedding"]), dtype=np.float32)
+                similarity = float(cached_vector @ vector)
+                if similarity >= best_similarity:
+                    best, best_similarity = entry, similarity
+            if best is None:
+                return None
+            
+            logger.debug(f"Chat cache hit for user {user_id} (similarity {best_similarity:.3f})")
+            return {"response": best["response"], "agents_involved": best["agents_involved"]}
+        except Exception as e:
+            logger.error(f"Error reading chat response cache: {e}")
+            return None
+    
+    def cache_chat_response(self, user_id: int, text: str, response: str, agents_involved: List[str],
+                            context_key: str, query_embedding=None):
+        """Store a final chat response for its query embedding and context, keeping the newest entries"""
+        if np is None:
+            return
+        try:
+            vector = self._chat_query_vector(text, query_embedding)
+            if vector is None:
+                return
+            entry = json.dumps({
+                "embedding": base64.b64encode(vector.astype(np.float32).tobytes()).decode("ascii"),
+                "response": response,
+                "agents_involved": agents_involved
+            })
+            key = f"chat:cache:v1:{user_id}:{context_key}"
+            pipe = self.redis_conn.pipeline(transaction=False)
+            pipe.lpush(key, entry)
+            pipe.ltrim(key, 0, CHAT_CACHE_MAX_ENTRIES - 1)
+            pipe.expire(key, CHAT_CACHE_TTL)
+            pipe.execute()
+        except Exception as e:
+            logger.error(f"Error caching chat response: {e}")
+    
     def end_session(self, user_id: int, session_id: str = None):
         """End current session"""
         try:
@@ -225,11 +577,7 @@ class TravelMemoryManager(MemoryManager):
             # Get all turns
             turn_ids = self.redis_conn.lrange(f"stm:sess:{user_id}:{session_id}:turns", 0, -1)
             
-            turns = []
-            for turn_id in turn_ids:
-                turn_data = self.redis_conn.hgetall(f"stm:turn:{user_id}:{turn_id}")
-                if turn_data:
-                    turns.append(turn_data)
+            turns = self._get_turns(user_id, turn_ids)
             
             return {
                 "session_data": session_data,
@@ -3,70 +3,166 @@ Travel-specific Orchestrator
 Handles routing and coordination for travel agents with UTP integration
 """
 
+import asyncio
+import functools
+import importlib
+import io
 import logging
+import re
+import threading
 import time
-from typing import Dict, Any, List
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from typing import Dict, Any, AsyncIterator, Callable, FrozenSet, List, Optional
 from datetime import datetime
 
+from core.intent_classifier import IntentClassifier
 from core.travel_memory_manager import travel_memory_manager
 
 logger = logging.getLogger(__name__)
 
+# Chat-mode routing table in priority order: (agent, single-word triggers, multi-word phrases)
+CHAT_AGENT_ROUTES = (
+    # Text analyzer for any planning text
+    ("TextTripAnalyzer", frozenset({"plan", "plans", "planning", "trip", "trips", "travel", "traveling", "vacation"}), ()),
+    # Mood detector for emotional indicators
+    ("TripMoodDetector", frozenset({"feel", "feeling", "feelings", "excited", "nervous", "stressed", "worried"}), ()),
+    # Communication coach for interaction needs
+    ("TripCommsCoach", frozenset({"ask", "tell", "communicate", "hotel", "hotels", "guide", "guides"}), ()),
+    # Behavior guide for action/decision needs
+    ("TripBehaviorGuide", frozenset({"help"}), ("what should", "next step", "how to")),
+    # Calm practice for stress indicators
+    ("TripCalmPractice", frozenset({"calm", "relax", "overwhelmed", "anxious"}), ()),
+    # Weather for weather-related queries
+    ("WeatherAgent", frozenset({"weather", "climate", "temperature", "rain"}), ()),
+    # Dining for food-related queries
+    ("DiningAgent", frozenset({"restaurant", "restaurants", "food", "dining", "eat"}), ()),
+    # Scenic for location queries
+    ("ScenicLocationFinderAgent", frozenset({"scenic", "beautiful", "location", "destination", "destinations"}), ()),
+)
+
+_TOKEN_PATTERN = re.compile(r"[a-z']+")
+
+
+def _clean_agent_name(agent_name: str) -> str:
+    return agent_name.replace("Agent", "").replace("Trip", "")
+
+# Response header (emoji, display name) per known travel agent
+_AGENT_META = {
+    name: (emoji, _clean_agent_name(name))
+    for name, emoji in (
+        ("TextTripAnalyzer", "🔍"),
+        ("TripMoodDetector", "😊"),
+        ("TripCommsCoach", "💬"),
+        ("TripBehaviorGuide", "🧭"),
+        ("TripCalmPractice", "🧘"),
+        ("TripSummarySynth", "🎯"),
+        ("WeatherAgent", "🌤️"),
+        ("DiningAgent", "🍽️"),
+        ("ScenicLocationFinderAgent", "🏞️"),
+    )
+}
+
+
+def _agent_meta(agent_name: str):
+    meta = _AGENT_META.get(agent_name)
+    return meta if meta is not None else ("🤖", _clean_agent_name(agent_name))
+
+
+# Travel agents in registration order: (name, module, class, required)
+TRAVEL_AGENT_CLASSES = (
+    ("TextTripAnalyzer", "agents.text_trip_analyzer", "TextTripAnalyzerAgent", True),
+    ("TripMoodDetector", "agents.trip_mood_detector", "TripMoodDetectorAgent", True),
+    ("TripCommsCoach", "agents.trip_comms_coach", "TripCommsCoachAgent", True),
+    ("TripBehaviorGuide", "agents.trip_behavior_guide", "TripBehaviorGuideAgent", True),
+    ("TripCalmPractice", "agents.trip_calm_practice", "TripCalmPracticeAgent", True),
+    ("TripSummarySynth", "agents.trip_summary_synth", "TripSummarySynthAgent", True),
+    # Extended existing agents for travel
+    ("WeatherAgent", "agents.weather_agent", "WeatherAgent", False),
+    ("DiningAgent", "agents.dining_agent", "DiningAgent", False),
+    ("ScenicLocationFinderAgent", "agents.scenic_location_finder", "ScenicLocationFinderAgent", False),
+)
+
+
+@dataclass
+class RequestContext:
+    """
+    Per-request derived data shared by every agent invoked for the same input.
+    
+    Each property is computed at most once per request and handed to agents via
+    state["request_ctx"], so concurrent agents don't re-derive the same parse.
+    """
+    text: str
+    user_id: int = 0
+    embedder: Optional[Callable[[str], Any]] = field(default=None, repr=False)
+    
+    @functools.cached_property
+    def text_lower(self) -> str:
+        return self.text.lower()
+    
+    @functools.cached_property
+    def tokens(self) -> FrozenSet[str]:
+        return frozenset(_TOKEN_PATTERN.findall(self.text_lower))
+    
+    @functools.cached_property
+    def trip_analysis(self) -> Dict[str, Any]:
+        from agents.text_trip_analyzer import analyze_trip_text
+        return analyze_trip_text(self.text)
+    
+    @functools.cached_property
+    def query_embedding(self):
+        # Shared by intent routing and the semantic response cache
+        return self.embedder(self.text) if self.embedder is not None else None
+
+# Time budget for chat-mode agent fan-out (leaves headroom in the 3s chat SLA for synthesis)
+CHAT_AGENT_TIMEOUT_S = 2.5
+
+# Per-agent time budget in batch mode (leaves headroom in the 60s batch SLA for synthesis)
+BATCH_AGENT_TIMEOUT_S = 45.0
+
+# Longest transcript passed verbatim to non-analyzer batch agents; longer ones are condensed
+BATCH_TRANSCRIPT_EXCERPT_CHARS = 2000
+
+# Worker threads shared by all requests for blocking agent.process calls
+AGENT_POOL_MAX_WORKERS = 16
+
 
 class TravelOrchestrator:
     """Orchestrator specifically designed for travel assistant agents"""
     
     def __init__(self):
-        self.travel_agents = {
-            "TextTripAnalyzer": None,
-            "TripMoodDetector": None, 
-            "TripCommsCoach": None,
-            "TripBehaviorGuide": None,
-            "TripCalmPractice": None,
-            "TripSummarySynth": None,
-            # Extended existing agents for travel
-            "WeatherAgent": None,
-            "DiningAgent": None,
-            "ScenicLocationFinderAgent": None
-        }
+        self.travel_agents = dict.fromkeys(name for name, _, _, _ in TRAVEL_AGENT_CLASSES)
+        self._pool = ThreadPoolExecutor(max_workers=AGENT_POOL_MAX_WORKERS, thread_name_prefix="travel-agent")
+        self._intent_classifier = IntentClassifier(getattr(travel_memory_manager, "embedding_model", None))
         self._initialize_agents()
     
     def _initialize_agents(self):
         """Initialize travel agents"""
         try:
-            # Import and initialize new travel agents
-            from agents.text_trip_analyzer import TextTripAnalyzerAgent
-            from agents.trip_mood_detector import TripMoodDetectorAgent
-            from agents.trip_comms_coach import TripCommsCoachAgent
-            from agents.trip_behavior_guide import TripBehaviorGuideAgent
-            from agents.trip_calm_practice import TripCalmPracticeAgent
-            from agents.trip_summary_synth import TripSummarySynthAgent
-            
-            self.travel_agents["TextTripAnalyzer"] = TextTripAnalyzerAgent(travel_memory_manager)
-            self.travel_agents["TripMoodDetector"] = TripMoodDetectorAgent(travel_memory_manager)
-            self.travel_agents["TripCommsCoach"] = TripCommsCoachAgent(travel_memory_manager)
-            self.travel_agents["TripBehaviorGuide"] = TripBehaviorGuideAgent(travel_memory_manager)
-            self.travel_agents["TripCalmPractice"] = TripCalmPracticeAgent(travel_memory_manager)
-            self.travel_agents["TripSummarySynth"] = TripSummarySynthAgent(travel_memory_manager)
-            
-            # Try to import existing agents for travel extension
-            try:
-                from agents.weather_agent import WeatherAgent
-                self.travel_agents["WeatherAgent"] = WeatherAgent(travel_memory_manager)
-            except ImportError:
-                logger.warning("WeatherAgent not available")
-            
-            try:
-                from agents.dining_agent import DiningAgent
-                self.travel_agents["DiningAgent"] = DiningAgent(travel_memory_manager)
-            except ImportError:
-                logger.warning("DiningAgent not available")
-            
-            try:
-                from agents.scenic_location_finder import ScenicLocationFinderAgent
-                self.travel_agents["ScenicLocationFinderAgent"] = ScenicLocationFinderAgent(travel_memory_manager)
-            except ImportError:
-                logger.warning("ScenicLocationFinderAgent not available")
+            # Import all agent modules concurrently so slow module-level setup overlaps
+            with ThreadPoolExecutor(max_workers=8, thread_name_prefix="agent-import") as pool:
+                futures = {
+                    pool.submit(importlib.import_module, module_path): module_path
+                    for _, module_path, _, _ in TRAVEL_AGENT_CLASSES
+                }
+                modules = {}
+                for future in as_completed(futures):
+                    try:
+                        modules[futures[future]] = future.result()
+                    except ImportError as e:
+                        modules[futures[future]] = e
+            
+            for _, module_path, _, required in TRAVEL_AGENT_CLASSES:
+                if required and isinstance(modules[module_path], ImportError):
+                    raise modules[module_path]
+            
+            for agent_name, module_path, class_name, _ in TRAVEL_AGENT_CLASSES:
+                module = modules[module_path]
+                if isinstance(module, ImportError):
+                    # Existing agents extended for travel are optional
+                    logger.warning(f"{class_name} not available")
+                    continue
+                self.travel_agents[agent_name] = getattr(module, class_name)(travel_memory_manager)
             
             # Remove None agents
             self.travel_agents = {k: v for k, v in self.travel_agents.items() if v is not None}
@@ -76,8 +172,24 @@ class TravelOrchestrator:
         except Exception as e:
             logger.error(f"Error initializing travel agents: {e}")
     
+    def warm_up(self):
+        """Embed the intent exemplars now so the first chat request doesn't pay for it"""
+        if self._intent_classifier.warm_up():
+            logger.info("Intent classifier index ready")
+    
+    async def _run_in_pool(self, func, *args):
+        """Run a blocking agent call on the orchestrator's bounded thread pool"""
+        return await asyncio.get_running_loop().run_in_executor(self._pool, func, *args)
+    
     def process_chat_request(self, user_id: int, text: str, session_context: Dict, 
                            user_travel_profile: Dict, weekly_digest: Dict) -> Dict[str, Any]:
+        """Synchronous wrapper around aprocess_chat_request for callers without an event loop"""
+        return asyncio.run(self.aprocess_chat_request(
+            user_id, text, session_context, user_travel_profile, weekly_digest
+        ))
+    
+    async def aprocess_chat_request(self, user_id: int, text: str, session_context: Dict, 
+                                    user_travel_profile: Dict, weekly_digest: Dict) -> Dict[str, Any]:
         """
         Process chat mode request with shallow guidance from relevant agents
         Target: < 3s response time
@@ -85,65 +197,81 @@ class TravelOrchestrator:
         start_time = time.time()
         
         try:
-            # Determine relevant agents for this query
-            relevant_agents = self._select_chat_agents(text)
+            request_ctx = RequestContext(text, user_id, embedder=self._intent_classifier.embed)
+            context_key = travel_memory_manager.chat_context_fingerprint(
+                session_context, user_travel_profile, weekly_digest
+            )
             
-            logger.info(f"Chat mode: Selected {len(relevant_agents)} agents for query")
+            # Near-duplicate of an earlier query from this user in the same context: skip the agent fan-out entirely
+            cached = await asyncio.to_thread(self._lookup_chat_cache, request_ctx, context_key)
+            if cached:
+                return {
+                    "response": cached["response"],
+                    "agents_involved": cached["agents_involved"],
+                    "processing_time": time.time() - start_time,
+                    "mode": "chat",
+                    "cache_hit": True
+                }
+            
+            tasks = await self._start_chat_agents(request_ctx, session_context, user_travel_profile, weekly_digest)
+            
+            # Keep whatever finished inside the chat SLA window, cancel the rest
+            timed_out_agents = []
+            if tasks:
+                await asyncio.wait(tasks.values(), timeout=CHAT_AGENT_TIMEOUT_S)
+                for agent_name, task in tasks.items():
+                    if not task.done():
+                        task.cancel()
+                        timed_out_agents.append(agent_name)
+                if timed_out_agents:
+                    logger.warning(f"Chat SLA limit reached, dropping unfinished agents: {timed_out_agents}")
             
-            # Execute relevant agents with shallow processing
             agent_responses = {}
             agents_involved = []
+            # A response missing any agent's contribution is served but never cached
+            degraded = bool(timed_out_agents)
             
-            for agent_name in relevant_agents:
-                if agent_name in self.travel_agents:
-                    try:
-                        agent = self.travel_agents[agent_name]
-                        
-                        # Create state for agent
-                        state = {
-                            "question": text,
-                            "user_id": user_id,
-                            "user": str(user_id),
-                            "mode": "chat",
-                            "context": {
-                                "session": session_context,
-                                "utp": user_travel_profile,
-                                "digest": weekly_digest
-                            }
-                        }
-                        
-                        # Process with timeout for chat SLA
-                        result = agent.process(state)
-                        agent_responses[agent_name] = result.get("response", "")
-                        agents_involved.append(agent_name)
-                        
-                        # Break early if approaching SLA limit
-                        if time.time() - start_time > 2.5:  # 2.5s limit for agent processing
-                            logger.warning("Approaching chat SLA limit, stopping agent execution")
-                            break
-                            
-                    except Exception as e:
-                        logger.warning(f"Agent {agent_name} failed in chat mode: {e}")
-                        continue
+            for agent_name, task in tasks.items():
+                if agent_name in timed_out_agents or task.cancelled():
+                    continue
+                if task.exception() is not None:
+                    logger.warning(f"Agent {agent_name} failed in chat mode: {task.exception()}")
+                    degraded = True
+                    continue
+                result = task.result()
+                if result.get("error"):
+                    degraded = True
+                agent_responses[agent_name] = result.get("response", "")
+                agents_involved.append(agent_name)
             
             # Always finish with synthesis
             if "TripSummarySynth" in self.travel_agents and "TripSummarySynth" not in agents_involved:
                 try:
                     synth_agent = self.travel_agents["TripSummarySynth"]
-                    synth_response = synth_agent.synthesize_multi_agent_response(agent_responses, user_id)
+                    synth_response = await self._run_in_pool(
+                        synth_agent.synthesize_multi_agent_response, agent_responses, user_id
+                    )
                     agent_responses["TripSummarySynth"] = synth_response
                     agents_involved.append("TripSummarySynth")
                 except Exception as e:
                     logger.warning(f"Synthesis failed in chat mode: {e}")
+                    degraded = True
             
             # Format final response
             final_response = self._format_chat_response(agent_responses)
             
+            if agent_responses and not degraded:
+                await asyncio.to_thread(
+                    travel_memory_manager.cache_chat_response, user_id, text, final_response, agents_involved,
+                    context_key, request_ctx.query_embedding
+                )
+            
             processing_time = time.time() - start_time
             
             return {
                 "response": final_response,
                 "agents_involved": agents_involved,
+                "agents_involved_timeout": timed_out_agents,
                 "processing_time": processing_time,
                 "mode": "chat"
             }
@@ -157,7 +285,148 @@ class TravelOrchestrator:
                 "mode": "chat"
             }
     
+    async def _start_chat_agents(self, request_ctx: RequestContext, session_context: Dict,
+                                 user_travel_profile: Dict, weekly_digest: Dict) -> Dict[str, "asyncio.Task"]:
+        """Select chat agents and start them concurrently on the agent pool"""
+        text = request_ctx.text
+        user_id = request_ctx.user_id
+        
+        # Determine relevant agents for this query; intent routing embeds the query, so keep it off the loop
+        selected_agents = await asyncio.to_thread(self._select_chat_agents, text, request_ctx)
+        relevant_agents = [name for name in selected_agents if name in self.travel_agents]
+        
+        logger.info(f"Chat mode: Selected {len(relevant_agents)} agents for query")
+        
+        # Agents are independent until synthesis, so fan out concurrently
+        tasks = {}
+        for agent_name in relevant_agents:
+            state = {
+                "question": text,
+                "user_id": user_id,
+                "user": str(user_id),
+                "mode": "chat",
+                "request_ctx": request_ctx,
+                "context": {
+                    "session": session_context,
+                    "utp": user_travel_profile,
+                    "digest": weekly_digest,
+                    "text_lower": request_ctx.text_lower,
+                    "tokens": request_ctx.tokens
+                }
+            }
+            agent = self.travel_agents[agent_name]
+            if not agent.preflight(state):
+                logger.info(f"Chat mode: Skipping {agent_name} (preflight failed)")
+                continue
+            tasks[agent_name] = asyncio.create_task(self._run_in_pool(self._run_chat_agent, agent, state))
+        return tasks
+    
+    @staticmethod
+    def _run_chat_agent(agent, state: Dict) -> Dict[str, Any]:
+        """
+        Run one chat agent and update its circuit breaker from the outcome
+        
+        Runs on the pool thread, so an agent dropped at the chat SLA still records
+        how its run actually ended. Missing the 2.5s chat window is not a failure:
+        tripping the shared breaker for it would also skip the agent in batch mode.
+        """
+        try:
+            result = agent.process(state)
+        except Exception:
+            agent.record_failure()
+            raise
+        # Error results were already counted by the agent's handle_error
+        if not result.get("error"):
+            agent.record_success()
+        return result
+    
+    async def astream_chat_request(self, user_id: int, text: str, session_context: Dict,
+                                   user_travel_profile: Dict, weekly_digest: Dict) -> AsyncIterator[str]:
+        """
+        Stream chat mode guidance, yielding each agent's block as soon as it completes
+        
+        Same agents, SLA window and synthesis as aprocess_chat_request, but the first
+        block reaches the caller after the fastest agent instead of the slowest.
+        
+        Yields:
+            Markdown chunks; the synthesis block (if any) comes last
+        """
+        try:
+            request_ctx = RequestContext(text, user_id, embedder=self._intent_classifier.embed)
+            context_key = travel_memory_manager.chat_context_fingerprint(
+                session_context, user_travel_profile, weekly_digest
+            )
+            
+            cached = await asyncio.to_thread(self._lookup_chat_cache, request_ctx, context_key)
+            if cached:
+                yield cached["response"]
+                return
+            
+            tasks = await self._start_chat_agents(request_ctx, session_context, user_travel_profile, weekly_digest)
+            agent_names = {task: agent_name for agent_name, task in tasks.items()}
+            agent_responses = {}
+            degraded = False
+            
+            yield "🎯 **Quick Travel Guidance**\n"
+            
+            loop = asyncio.get_running_loop()
+            deadline = loop.time() + CHAT_AGENT_TIMEOUT_S
+            pending = set(tasks.values())
+            while pending:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    agent_name = agent_names[task]
+                    if task.exception() is not None:
+                        logger.warning(f"Agent {agent_name} failed in chat mode: {task.exception()}")
+                        degraded = True
+                        continue
+                    result = task.result()
+                    if result.get("error"):
+                        degraded = True
+                    response = result.get("response", "")
+                    agent_responses[agent_name] = response
+                    yield "\n\n" + self._format_chat_block(agent_name, response)
+            
+            if pending:
+                degraded = True
+                logger.warning(f"Chat SLA limit reached, dropping unfinished agents: {[agent_names[t] for t in pending]}")
+                for task in pending:
+                    task.cancel()
+            
+            # Order matches the non-streaming path for the cached response
+            agent_responses = {name: agent_responses[name] for name in tasks if name in agent_responses}
+            
+            if "TripSummarySynth" in self.travel_agents and "TripSummarySynth" not in agent_responses:
+                try:
+                    synth_response = await self._run_in_pool(
+                        self.travel_agents["TripSummarySynth"].synthesize_multi_agent_response,
+                        agent_responses, user_id
+                    )
+                    agent_responses["TripSummarySynth"] = synth_response
+                    yield "\n\n" + self._format_chat_block("TripSummarySynth", synth_response)
+                except Exception as e:
+                    logger.warning(f"Synthesis failed in chat mode: {e}")
+                    degraded = True
+            
+            if agent_responses and not degraded:
+                final_response = self._format_chat_response(agent_responses)
+                await asyncio.to_thread(
+                    travel_memory_manager.cache_chat_response, user_id, text, final_response, list(agent_responses),
+                    context_key, request_ctx.query_embedding
+                )
+            
+        except Exception as e:
+            logger.error(f"Chat streaming error: {e}")
+            yield f"Error processing chat request: {str(e)}"
+    
     def process_batch_request(self, user_id: int, transcript: str, current_utp: Dict) -> Dict[str, Any]:
+        """Synchronous wrapper around aprocess_batch_request for callers without an event loop"""
+        return asyncio.run(self.aprocess_batch_request(user_id, transcript, current_utp))
+    
+    async def aprocess_batch_request(self, user_id: int, transcript: str, current_utp: Dict) -> Dict[str, Any]:
         """
         Process batch mode request with comprehensive analysis
         Target: < 60s response time
@@ -167,38 +436,65 @@ class TravelOrchestrator:
         try:
             logger.info(f"Batch mode: Processing {len(transcript)} character transcript")
             
-            # Run ALL travel agents for comprehensive analysis
+            # Stamp the analysis once so the formatted response is deterministic for this request
+            analysis_date = datetime.fromtimestamp(start_time).strftime('%Y-%m-%d %H:%M')
+            
+            request_ctx = RequestContext(transcript, user_id)
+            
+            # Run the relevant travel agents concurrently; synthesis is saved for last
+            agent_names = self._select_batch_agents(request_ctx)
+            logger.info(f"Batch mode: Selected {len(agent_names)} of {len(self.travel_agents)} agents")
+            
+            # Only the analyzer reads the raw transcript; other agents get the structured
+            # analysis and a condensed question so long transcripts aren't re-sent to every LLM call
+            condensed_question = self._condense_transcript(transcript, request_ctx.trip_analysis)
+            
+            states = {
+                name: {
+                    "question": transcript if name == "TextTripAnalyzer" else condensed_question,
+                    "user_id": user_id,
+                    "user": str(user_id),
+                    "mode": "recording",
+                    "request_ctx": request_ctx,
+                    "context": {
+                        "utp": current_utp,
+                        "transcript_length": len(transcript),
+                        "trip_analysis": request_ctx.trip_analysis,
+                        "text_lower": request_ctx.text_lower,
+                        "tokens": request_ctx.tokens
+                    }
+                }
+                for name in agent_names
+            }
+            
+            # Skip agents that can't take this state or whose circuit breaker is open
+            agent_names = [name for name in agent_names if self.travel_agents[name].preflight(states[name])]
+            
+            results = await asyncio.gather(
+                *(asyncio.wait_for(self._run_in_pool(self.travel_agents[name].process, states[name]), BATCH_AGENT_TIMEOUT_S)
+                  for name in agent_names),
+                return_exceptions=True
+            )
+            
             agent_responses = {}
             agents_involved = []
             
-            # Process with all relevant agents
-            for agent_name, agent in self.travel_agents.items():
-                if agent_name == "TripSummarySynth":
-                    continue  # Save synthesis for last
-                
-                try:
-                    # Create state for agent
-                    state = {
-                        "question": transcript,
-                        "user_id": user_id,
-                        "user": str(user_id),
-                        "mode": "recording",
-                        "context": {
-                            "utp": current_utp,
-                            "transcript_length": len(transcript)
-                        }
-                    }
-                    
-                    # Process with agent
-                    result = agent.process(state)
-                    agent_responses[agent_name] = result.get("response", "")
-                    agents_involved.append(agent_name)
-                    
-                    logger.debug(f"Batch: {agent_name} completed")
-                    
-                except Exception as e:
-                    logger.warning(f"Agent {agent_name} failed in batch mode: {e}")
+            for agent_name, result in zip(agent_names, results):
+                if isinstance(result, asyncio.TimeoutError):
+                    logger.warning(f"Agent {agent_name} exceeded {BATCH_AGENT_TIMEOUT_S}s in batch mode")
+                    self.travel_agents[agent_name].record_failure()
+                    continue
+                if isinstance(result, BaseException):
+                    logger.warning(f"Agent {agent_name} failed in batch mode: {result}")
+                    self.travel_agents[agent_name].record_failure()
                     continue
+                
+                if not result.get("error"):
+                    self.travel_agents[agent_name].record_success()
+                agent_responses[agent_name] = result.get("response", "")
+                agents_involved.append(agent_name)
+                
+                logger.debug(f"Batch: {agent_name} completed")
             
             # Always finish with synthesis and UTP update
             if "TripSummarySynth" in self.travel_agents:
@@ -212,13 +508,14 @@ class TravelOrchestrator:
                         "user": str(user_id),
                         "mode": "recording",
                         "agent_responses": agent_responses,
+                        "request_ctx": request_ctx,
                         "context": {
                             "utp": current_utp,
                             "transcript": transcript
                         }
                     }
                     
-                    synth_result = synth_agent.process(synth_state)
+                    synth_result = await self._run_in_pool(synth_agent.process, synth_state)
                     agent_responses["TripSummarySynth"] = synth_result.get("response", "")
                     agents_involved.append("TripSummarySynth")
                     
@@ -226,7 +523,7 @@ class TravelOrchestrator:
                     logger.error(f"Synthesis failed in batch mode: {e}")
             
             # Format comprehensive response
-            final_response = self._format_batch_response(agent_responses, transcript)
+            final_response = self._format_batch_response(agent_responses, transcript, analysis_date)
             
             processing_time = time.time() - start_time
             
@@ -252,45 +549,97 @@ class TravelOrchestrator:
                 "utp_updated": False
             }
     
-    def _select_chat_agents(self, text: str) -> List[str]:
-        """Select relevant agents for chat mode (shallow processing)"""
-        text_lower = text.lower()
-        selected_agents = []
+    @staticmethod
+    def _condense_transcript(transcript: str, trip_analysis: Dict[str, Any]) -> str:
+        """
+        Build the question downstream batch agents see instead of the full transcript
         
-        # Always include text analyzer for any planning text
-        if any(word in text_lower for word in ["plan", "trip", "travel", "vacation"]):
-            selected_agents.append("TextTripAnalyzer")
+        Args:
+            transcript: Raw recording transcript
+            trip_analysis: Structured analysis of the transcript
+            
+        Returns:
+            The transcript itself if short, otherwise an analysis summary plus its opening excerpt
+        """
+        if len(transcript) <= BATCH_TRANSCRIPT_EXCERPT_CHARS:
+            return transcript
         
-        # Mood detector for emotional indicators
-        if any(word in text_lower for word in ["feel", "excited", "nervous", "stressed", "worried"]):
-            selected_agents.append("TripMoodDetector")
+        summary_parts = []
+        for label, key in (("Destinations", "destinations"), ("Goals", "goals"), ("Constraints", "constraints")):
+            if trip_analysis.get(key):
+                summary_parts.append(f"{label}: {', '.join(trip_analysis[key])}")
+        if trip_analysis.get("group_info", {}).get("type"):
+            summary_parts.append(f"Group: {trip_analysis['group_info']['type']}")
+        if trip_analysis.get("timing", {}).get("duration_type"):
+            summary_parts.append(f"Duration: {trip_analysis['timing']['duration_type']}")
+        if trip_analysis.get("budget_info", {}).get("mentioned_amounts"):
+            summary_parts.append(f"Budget amounts: {', '.join(trip_analysis['budget_info']['mentioned_amounts'])}")
         
-        # Communication coach for interaction needs
-        if any(word in text_lower for word in ["ask", "tell", "communicate", "hotel", "guide"]):
-            selected_agents.append("TripCommsCoach")
+        summary = "; ".join(summary_parts) or "No structured trip details found"
+        excerpt = transcript[:BATCH_TRANSCRIPT_EXCERPT_CHARS]
+        return f"Trip planning transcript summary ({len(transcript)} characters). {summary}\n\nTranscript excerpt:\n{excerpt}..."
+    
+    @staticmethod
+    def _lookup_chat_cache(request_ctx: RequestContext, context_key: str) -> Optional[Dict[str, Any]]:
+        """Semantic cache lookup; also computes the request's query embedding off the event loop"""
+        return travel_memory_manager.get_cached_chat_response(
+            request_ctx.user_id, request_ctx.text, context_key, request_ctx.query_embedding
+        )
+    
+    @staticmethod
+    def _keyword_routes(request_ctx: RequestContext) -> List[str]:
+        """Agents whose routing keywords appear in the request text, in priority order"""
+        text_lower = request_ctx.text_lower
+        tokens = request_ctx.tokens
         
-        # Behavior guide for action/decision needs
-        if any(word in text_lower for word in ["what should", "next step", "help", "how to"]):
-            selected_agents.append("TripBehaviorGuide")
+        return [
+            agent_name
+            for agent_name, words, phrases in CHAT_AGENT_ROUTES
+            if not words.isdisjoint(tokens) or any(phrase in text_lower for phrase in phrases)
+        ]
+    
+    def _select_chat_agents(self, text: str, request_ctx: RequestContext = None) -> List[str]:
+        """Select relevant agents for chat mode (shallow processing)"""
+        if request_ctx is None:
+            request_ctx = RequestContext(text, embedder=self._intent_classifier.embed)
         
-        # Calm practice for stress indicators
-        if any(word in text_lower for word in ["calm", "relax", "overwhelmed", "anxious"]):
-            selected_agents.append("TripCalmPractice")
+        # Nearest-exemplar intent routing, falling back to keywords when no exemplar is close enough
+        selected_agents = self._intent_classifier.classify(text, request_ctx.query_embedding)
+        if not selected_agents:
+            selected_agents = self._keyword_routes(request_ctx)
+        
+        # Limit to 3 agents for chat mode SLA
+        return selected_agents[:3]
+    
+    def _select_batch_agents(self, request_ctx: RequestContext) -> List[str]:
+        """
+        Select agents for batch mode, skipping those with no signal in the transcript
         
-        # Weather for weather-related queries
-        if any(word in text_lower for word in ["weather", "climate", "temperature", "rain"]):
-            selected_agents.append("WeatherAgent")
+        Args:
+            request_ctx: Request context for the transcript
+            
+        Returns:
+            Agent names in registration order, excluding TripSummarySynth
+        """
+        analysis = request_ctx.trip_analysis
+        goals = set(analysis.get("goals", ()))
+        constraints = set(analysis.get("constraints", ()))
         
-        # Dining for food-related queries
-        if any(word in text_lower for word in ["restaurant", "food", "dining", "eat"]):
-            selected_agents.append("DiningAgent")
+        # Any keyword hit keeps an agent; the analyzer always runs
+        selected = set(self._keyword_routes(request_ctx))
+        selected.add("TextTripAnalyzer")
         
-        # Scenic for location queries
-        if any(word in text_lower for word in ["scenic", "beautiful", "location", "destination"]):
-            selected_agents.append("ScenicLocationFinderAgent")
+        # Structured signals from the cheap text analysis
+        if constraints:
+            selected.add("TripCalmPractice")
+        if analysis.get("destinations"):
+            selected.update(("WeatherAgent", "ScenicLocationFinderAgent"))
+        if "food" in goals or "dietary" in constraints:
+            selected.add("DiningAgent")
+        if goals & {"nature", "photography"}:
+            selected.add("ScenicLocationFinderAgent")
         
-        # Limit to 3 agents for chat mode SLA
-        return selected_agents[:3]
+        return [name for name in self.travel_agents if name in selected and name != "TripSummarySynth"]
     
     def _format_chat_response(self, agent_responses: Dict[str, str]) -> str:
         """Format chat mode response (quick format)"""
@@ -301,61 +650,49 @@ class TravelOrchestrator:
             return list(agent_responses.values())[0]
         
         # Multi-agent chat response
-        formatted_parts = ["🎯 **Quick Travel Guidance**\n"]
-        
-        agent_emojis = {
-            "TextTripAnalyzer": "🔍",
-            "TripMoodDetector": "😊", 
-            "TripCommsCoach": "💬",
-            "TripBehaviorGuide": "🧭",
-            "TripCalmPractice": "🧘",
-            "WeatherAgent": "🌤️",
-            "DiningAgent": "🍽️",
-            "ScenicLocationFinderAgent": "🏞️"
-        }
+        buf = io.StringIO()
+        buf.write("🎯 **Quick Travel Guidance**\n")
         
         for agent_name, response in agent_responses.items():
             if agent_name == "TripSummarySynth":
                 continue  # Skip synthesis in chat mode
             
-            emoji = agent_emojis.get(agent_name, "🤖")
-            clean_name = agent_name.replace("Agent", "").replace("Trip", "")
-            
-            # Truncate for chat mode
-            truncated_response = response[:200] + "..." if len(response) > 200 else response
-            formatted_parts.append(f"**{emoji} {clean_name}:** {truncated_response}")
+            buf.write("\n\n")
+            buf.write(self._format_chat_block(agent_name, response))
         
-        return "\n\n".join(formatted_parts)
+        return buf.getvalue()
     
-    def _format_batch_response(self, agent_responses: Dict[str, str], transcript: str) -> str:
-        """Format batch mode response (comprehensive format)"""
-        formatted_parts = ["🎯 **Comprehensive Travel Analysis**\n"]
-        formatted_parts.append(f"**Transcript Length:** {len(transcript)} characters")
-        formatted_parts.append(f"**Analysis Date:** {datetime.now().strftime('%Y-%m-%d %H:%M')}\n")
+    @staticmethod
+    def _format_chat_block(agent_name: str, response: str) -> str:
+        """Format one agent's chat mode block"""
+        emoji, clean_name = _agent_meta(agent_name)
         
-        # Agent emoji mapping
-        agent_emojis = {
-            "TextTripAnalyzer": "🔍",
-            "TripMoodDetector": "😊",
-            "TripCommsCoach": "💬", 
-            "TripBehaviorGuide": "🧭",
-            "TripCalmPractice": "🧘",
-            "TripSummarySynth": "🎯",
-            "WeatherAgent": "🌤️",
-            "DiningAgent": "🍽️",
-            "ScenicLocationFinderAgent": "🏞️"
-        }
+        # Truncate for chat mode
+        if len(response) > 200:
+            return f"**{emoji} {clean_name}:** {response[:200]}..."
+        return f"**{emoji} {clean_name}:** {response}"
+    
+    def _format_batch_response(self, agent_responses: Dict[str, str], transcript: str,
+                               analysis_date: str) -> str:
+        """Format batch mode response (comprehensive format)"""
+        buf = io.StringIO()
+        buf.write("🎯 **Comprehensive Travel Analysis**\n\n")
+        buf.write(f"**Transcript Length:** {len(transcript)} characters\n")
+        buf.write(f"**Analysis Date:** {analysis_date}\n")
         
         # Add each agent's full analysis
         for agent_name, response in agent_responses.items():
-            emoji = agent_emojis.get(agent_name, "🤖")
-            clean_name = agent_name.replace("Agent", "").replace("Trip", "")
+            emoji, clean_name = _agent_meta(agent_name)
             
-            formatted_parts.append(f"## {emoji} {clean_name}")
-            formatted_parts.append(response)
-            formatted_parts.append("")
+            buf.write("\n## ")
+            buf.write(emoji)
+            buf.write(" ")
+            buf.write(clean_name)
+            buf.write("\n")
+            buf.write(response)
+            buf.write("\n")
         
-        return "\n".join(formatted_parts)
+        return buf.getvalue()
     
     def get_execution_log(self, user_id: int, session_id: str) -> Dict[str, Any]:
         """Get detailed execution log for a session"""
@@ -392,5 +729,24 @@ class TravelOrchestrator:
             return {"error": str(e)}
 
 
-# Global travel orchestrator instance
-travel_orchestrator = TravelOrchestrator()
\ No newline at end of file
+# Global travel orchestrator instance, built on first use so importing this module
+# doesn't pay the agent construction cost (see api.main startup warmup)
+_travel_orchestrator = None
+_travel_orchestrator_lock = threading.Lock()
+
+
+def get_travel_orchestrator() -> TravelOrchestrator:
+    """Return the shared TravelOrchestrator, constructing it on first call"""
+    global _travel_orchestrator
+    if _travel_orchestrator is None:
+        with _travel_orchestrator_lock:
+            if _travel_orchestrator is None:
+                _travel_orchestrator = TravelOrchestrator()
+    return _travel_orchestrator
+
+
+def __getattr__(name: str):
+    # Keeps `from core.travel_orchestrator import travel_orchestrator` working
+    if name == "travel_orchestrator":
+        return get_travel_orchestrator()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
\ No newline at end of file
@@ -0,0 +1,10 @@
+-- =============================================
+-- Add the response_preview generated column to user_queries
+-- For databases created before the column was part of the schema
+-- =============================================
+USE langgraph_ai_system;
+
+ALTER TABLE user_queries
+    ADD COLUMN response_preview VARCHAR(203) GENERATED ALWAYS AS (
+        IF(CHAR_LENGTH(response_text) > 200, CONCAT(LEFT(response_text, 200), '...'), response_text)
+    ) STORED AFTER response_text;
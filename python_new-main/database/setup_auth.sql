@@ -52,6 +52,10 @@ CREATE TABLE IF NOT EXISTS user_queries (
     question TEXT NOT NULL,
     agent_used VARCHAR(100) NOT NULL,
     response_text LONGTEXT NOT NULL,
+    -- List views read this instead of shipping the full response_text
+    response_preview VARCHAR(203) GENERATED ALWAYS AS (
+        IF(CHAR_LENGTH(response_text) > 200, CONCAT(LEFT(response_text, 200), '...'), response_text)
+    ) STORED,
     edges_traversed JSON DEFAULT NULL,
     processing_time DECIMAL(10,3) NULL,
     created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
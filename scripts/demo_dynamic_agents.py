@@ -331,7 +331,7 @@ def show_execution_log(loader: DynamicAgentLoader):
     print("\n📜 EXECUTION LOG")
     print("-" * 20)
     
-    log = loader.get_execution_log()
+    log = loader.get_execution_log(snapshot=True)
     
     if not log:
         print("No executions recorded yet")
@@ -6,6 +6,8 @@ Demonstrates dynamic loading and execution of .py agent files using JSON configu
 
 import sys
 import os
+import json
+import tempfile
 from pathlib import Path
 from datetime import datetime
 
@@ -217,6 +219,31 @@ def test_dynamic_agent_addition():
         loader.remove_agent("TestDynamicAgent")
         print(f"   🗑️ Test agent removed")
 
+def test_journal_replay():
+    """Test that replaying a journal left behind by a failed truncate is idempotent"""
+    print(f"\n📜 Testing Journal Replay After Crash")
+    print("=" * 40)
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        journal_file = os.path.join(tmp, "agents.jsonl")
+        agent = {"name": "JournaledAgent", "file_path": "agents/text_trip_analyzer.py"}
+        with open(journal_file, "w", encoding="utf-8") as f:
+            f.write(json.dumps({"op": "add", "agent": agent}) + "\n")
+            f.write("{not json\n")
+            f.write(json.dumps({"op": "add"}) + "\n")
+        
+        # Config already saved by flush(), but the journal unlink failed
+        loader = DynamicAgentLoader.__new__(DynamicAgentLoader)
+        loader.journal_file = journal_file
+        loader._dirty = False
+        config = {"agents": [dict(agent)]}
+        loader._replay_journal(config)
+        loader._replay_journal(config)
+        
+        names = [a["name"] for a in config["agents"]]
+        assert names == ["JournaledAgent"], names
+        print(f"   ✅ Replayed journal twice without duplicating agents: {names}")
+
 def show_statistics(loader: DynamicAgentLoader):
     """Show loader statistics"""
     print(f"\n📊 Dynamic Agent Loader Statistics")
@@ -242,6 +269,9 @@ def main():
     print(f"Timestamp: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
     print()
     
+    # Journal replay needs no agents or memory backends
+    test_journal_replay()
+    
     # Test dynamic loading
     loader = test_dynamic_loading()
     if not loader: